@@ -10,34 +10,138 @@ Returns:
 
 """
 
-import csv
-import io
+import hashlib
+import itertools
 import json
+import sqlite3
 import urllib.parse
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 
 import httpx
 from fastapi import FastAPI, Form, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import (
     JSONResponse,
     PlainTextResponse,
     RedirectResponse,
+    Response,
+    StreamingResponse,
 )
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import ValidationError
 
+from src.packvote.backend import (
+    AUTOCOMPLETE_CACHE_PATH,
+    AUTOCOMPLETE_CACHE_SIZE,
+    AUTOCOMPLETE_CACHE_TTL_S,
+    BUDGET_CARDS,
+    GAZETTEER_PATH,
+    PHOTON_MAX_CONCURRENCY,
+    PHOTON_TIMEOUT_S,
+    PREFERENCES,
+    SQLITE_DB_PATH,
+    STORAGE_BACKEND,
+    SUBMISSION_CACHE_MAX_MB,
+    SUBMISSION_CACHE_MAX_PROJECTS,
+    WRITE_BEHIND_BATCH_SIZE,
+    WRITE_BEHIND_DURABLE,
+    WRITE_BEHIND_ENABLED,
+    WRITE_BEHIND_MAX_DELAY_MS,
+)
+from src.packvote.backend.geo import (
+    AutocompleteCache,
+    Gazetteer,
+    PhotonClient,
+    rank_suggestions,
+)
+from src.packvote.backend.storage import (
+    METADATA_KEYS,
+    STORAGE_ERRORS,
+    ProjectRegistry,
+    SubmissionCache,
+    ValidatedSubmissions,
+    WriteBehindBuffer,
+    create_storage,
+    new_participant_id,
+)
+from src.packvote.backend.storage.export import (
+    iter_csv,
+    iter_json_array,
+    iter_ndjson,
+    iter_zip,
+)
+from src.packvote.backend.storage.pagination import paginate
 from src.packvote.backend.utils.langgraph_elements import UserSurvey
 
-app = FastAPI(title="PackVote")
-
 # JSON file for persistent storage - path will be determined by project_name from form
 ARTIFACTS_DIR = Path("src/packvote/backend/artifacts/model_inputs/user_surveys")
 ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
 PROJECTS_FILE = Path("src/packvote/backend/artifacts/model_inputs/projects.json")
 
+# Pluggable storage backend for projects and submissions (see PACKVOTE_STORAGE_BACKEND)
+STORAGE = create_storage(
+    STORAGE_BACKEND,
+    projects_file=PROJECTS_FILE,
+    submissions_dir=ARTIFACTS_DIR,
+    sqlite_path=Path(SQLITE_DB_PATH),
+)
+# In-memory project index, reloaded only when the stored project list changes
+PROJECTS = ProjectRegistry(STORAGE)
+# Validated submissions, re-parsed only when a project's storage changes
+SUBMISSION_CACHE = SubmissionCache(
+    STORAGE,
+    max_projects=SUBMISSION_CACHE_MAX_PROJECTS,
+    max_bytes=int(SUBMISSION_CACHE_MAX_MB * 1024 * 1024),
+)
+# Optional group-commit buffer for /submit bursts (see PACKVOTE_WRITE_BEHIND)
+WRITE_BUFFER = (
+    WriteBehindBuffer(
+        STORAGE,
+        batch_size=WRITE_BEHIND_BATCH_SIZE,
+        max_delay_ms=WRITE_BEHIND_MAX_DELAY_MS,
+        durable=WRITE_BEHIND_DURABLE,
+    )
+    if WRITE_BEHIND_ENABLED
+    else None
+)
+# Location suggestions by normalized query (see PACKVOTE_AUTOCOMPLETE_CACHE_*)
+AUTOCOMPLETE_CACHE = AutocompleteCache(
+    max_entries=AUTOCOMPLETE_CACHE_SIZE,
+    ttl_seconds=AUTOCOMPLETE_CACHE_TTL_S,
+    db_path=Path(AUTOCOMPLETE_CACHE_PATH) if AUTOCOMPLETE_CACHE_PATH else None,
+)
+# Local autocomplete engine; Photon is only consulted when it has no match
+GAZETTEER = Gazetteer.from_tsv(Path(GAZETTEER_PATH)) if GAZETTEER_PATH else None
+# Pooled Photon client shared by all autocomplete requests
+PHOTON = PhotonClient(
+    cache=AUTOCOMPLETE_CACHE,
+    max_concurrency=PHOTON_MAX_CONCURRENCY,
+    timeout=PHOTON_TIMEOUT_S,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await PHOTON.start()
+    if WRITE_BUFFER is not None:
+        await WRITE_BUFFER.start()
+    try:
+        yield
+    finally:
+        try:
+            # Drain queued submissions before the process exits
+            if WRITE_BUFFER is not None:
+                await WRITE_BUFFER.stop()
+        finally:
+            await PHOTON.aclose()
+
+
+app = FastAPI(title="PackVote", lifespan=lifespan)
+
 # Mount frontend assets
 app.mount(
     "/static",
@@ -46,61 +150,33 @@ app.mount(
 )
 templates = Jinja2Templates(directory="src/packvote/frontend/templates")
 
-# In-memory “DB”
-SUBMISSIONS: List[UserSurvey] = []
-
-PREFERENCES = [
-    "Beaches",
-    "City sightseeing",
-    "Outdoor adventures",
-    "Festivals/events",
-    "Food exploration",
-    "Nightlife",
-    "Shopping",
-    "Spa wellness",
-]
-BUDGET_CARDS = {
-    "low": {"label": "Low", "range": [0, 1000]},
-    "medium": {"label": "Medium", "range": [1000, 2500]},
-    "high": {"label": "High", "range": [2500, 5000]},
-}
-
 
 # ---------- Storage Functions ----------
 def get_projects() -> List[dict]:
-    """Load all projects from the projects file."""
-    if PROJECTS_FILE.exists():
-        try:
-            with open(PROJECTS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return []
-    return []
+    """Load all projects from the project registry."""
+    return PROJECTS.all()
 
 
 def save_projects(projects: List[dict]) -> None:
-    """Save projects list to file."""
-    with open(PROJECTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(projects, f, indent=2, ensure_ascii=False)
+    """Replace the stored projects list."""
+    PROJECTS.replace(projects)
 
 
 def add_project(
     project_name: str, travel_date: str = None, travel_duration: int = None
 ) -> dict:
     """Add a new project if it doesn't exist."""
-    projects = get_projects()
     safe_name = sanitize_project_name(project_name)
+    travel_info = {}
+    if travel_date is not None:
+        travel_info["travel_date"] = travel_date
+    if travel_duration is not None:
+        travel_info["travel_duration"] = travel_duration
 
-    # Check if project already exists
-    for p in projects:
-        if p.get("safe_name") == safe_name:
-            # Update travel info if provided
-            if travel_date is not None:
-                p["travel_date"] = travel_date
-            if travel_duration is not None:
-                p["travel_duration"] = travel_duration
-            save_projects(projects)
-            return p
+    # Check if project already exists; update travel info if provided
+    project = PROJECTS.update(safe_name, travel_info)
+    if project is not None:
+        return project
 
     # Create new project
     new_project = {
@@ -108,13 +184,8 @@ def add_project(
         "safe_name": safe_name,
         "created_at": None,  # Could add timestamp if needed
     }
-    if travel_date is not None:
-        new_project["travel_date"] = travel_date
-    if travel_duration is not None:
-        new_project["travel_duration"] = travel_duration
-    projects.append(new_project)
-    save_projects(projects)
-    return new_project
+    new_project.update(travel_info)
+    return PROJECTS.add(new_project)
 
 
 def sanitize_project_name(project_name: str) -> str:
@@ -133,124 +204,39 @@ def get_submissions_file_path(project_name: str) -> Path:
     return ARTIFACTS_DIR / f"{safe_name}_submissions.json"
 
 
+def load_validated_submissions(project_name: str) -> ValidatedSubmissions:
+    """Load a project's validated submissions through the shared cache."""
+    try:
+        return SUBMISSION_CACHE.get(sanitize_project_name(project_name))
+    except (json.JSONDecodeError, ValidationError, KeyError) as e:
+        print(f"Error loading submissions file: {e}")
+        return ValidatedSubmissions()
+
+
 def load_submissions_from_file(project_name: str) -> List[UserSurvey]:
-    """Load submissions from JSON file for a given project if it exists."""
-    submissions_file = get_submissions_file_path(project_name)
-    if submissions_file.exists():
-        try:
-            with open(submissions_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                # Handle backward compatibility: old format (object with travel_date, travel_duration, submissions)
-                if isinstance(data, dict) and "submissions" in data:
-                    submissions_list = data.get("submissions", [])
-                else:
-                    # Current format (array of submissions)
-                    submissions_list = data if isinstance(data, list) else []
-
-                submissions = []
-                for item in submissions_list:
-                    # Remove added_at before creating UserSurvey object
-                    item_copy = {
-                        k: v for k, v in item.items() if k not in ("added_at",)
-                    }
-                    # Handle backward compatibility: convert phone to int if string
-                    if "phone" in item_copy and isinstance(item_copy["phone"], str):
-                        phone_clean = "".join(filter(str.isdigit, item_copy["phone"]))
-                        if len(phone_clean) == 10:
-                            item_copy["phone"] = int(phone_clean)
-                        else:
-                            continue  # Skip invalid phone numbers
-                    # Add default country_code if missing (backward compatibility)
-                    if "country_code" not in item_copy:
-                        item_copy["country_code"] = "+1"  # Default to US
-                    submissions.append(UserSurvey(**item_copy))
-                return submissions
-        except (json.JSONDecodeError, ValidationError, KeyError) as e:
-            print(f"Error loading submissions file: {e}")
-            return []
-    return []
+    """Load submissions for a given project if they exist."""
+    return load_validated_submissions(project_name).surveys
 
 
 def load_submissions_with_metadata(project_name: str) -> dict:
-    """Load submissions with metadata (like added_at) from JSON file.
+    """Load submissions with metadata (like added_at) for a given project.
     Returns dict with submissions array."""
-    submissions_file = get_submissions_file_path(project_name)
-    if submissions_file.exists():
-        try:
-            with open(submissions_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-                # Handle backward compatibility: old format (object with travel_date, travel_duration, submissions)
-                if isinstance(data, dict) and "submissions" in data:
-                    submissions_list = data.get("submissions", [])
-                else:
-                    # Current format (array of submissions)
-                    submissions_list = data if isinstance(data, list) else []
-
-                # Validate each item as UserSurvey, but return full data including added_at
-                validated_data = []
-                for item in submissions_list:
-                    # Validate the submission (excluding added_at)
-                    item_copy = {
-                        k: v for k, v in item.items() if k not in ("added_at",)
-                    }
-                    # Handle backward compatibility: convert phone to int if string
-                    if "phone" in item_copy and isinstance(item_copy["phone"], str):
-                        phone_clean = "".join(filter(str.isdigit, item_copy["phone"]))
-                        if len(phone_clean) == 10:
-                            item_copy["phone"] = int(phone_clean)
-                        else:
-                            continue  # Skip invalid phone numbers
-                    # Add default country_code if missing (backward compatibility)
-                    if "country_code" not in item_copy:
-                        item_copy["country_code"] = "+1"  # Default to US
-                    survey = UserSurvey(**item_copy)
-                    # Return validated data merged with metadata
-                    result = survey.model_dump()
-                    if "added_at" in item:
-                        result["added_at"] = item["added_at"]
-                    validated_data.append(result)
-
-                # Return submissions array
-                return {"submissions": validated_data}
-        except (json.JSONDecodeError, ValidationError, KeyError) as e:
-            print(f"Error loading submissions file: {e}")
-            return {"submissions": []}
-    return {"submissions": []}
-
-
-def append_submission_to_file(survey: UserSurvey, project_name: str) -> None:
-    """Append a single submission to the JSON file for the given project."""
-    submissions_file = get_submissions_file_path(project_name)
+    return {"submissions": load_validated_submissions(project_name).records}
 
-    # Read existing data
-    existing_submissions = []
 
-    if submissions_file.exists():
-        try:
-            with open(submissions_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                # Handle backward compatibility: old format (object with travel_date, travel_duration, submissions)
-                if isinstance(data, dict) and "submissions" in data:
-                    existing_submissions = data.get("submissions", [])
-                else:
-                    # Current format (array of submissions)
-                    existing_submissions = data if isinstance(data, list) else []
-        except json.JSONDecodeError:
-            existing_submissions = []
-
-    # Append new submission with timestamp
+def build_submission_record(survey: UserSurvey) -> dict:
+    """Serialize a survey for storage, stamped with a participant id and added_at."""
     submission_data = survey.model_dump()
+    submission_data["id"] = new_participant_id()
     submission_data["added_at"] = datetime.now().isoformat()
-    existing_submissions.append(submission_data)
+    return submission_data
 
-    # Write back to file as array
-    with open(submissions_file, "w", encoding="utf-8") as f:
-        json.dump(existing_submissions, f, indent=2, ensure_ascii=False)
 
-
-# In-memory storage (will be project-specific in future)
-SUBMISSIONS: List[UserSurvey] = []
+def append_submission_to_file(survey: UserSurvey, project_name: str) -> None:
+    """Append a single submission to the storage for the given project."""
+    STORAGE.append_submission(
+        sanitize_project_name(project_name), build_submission_record(survey)
+    )
 
 
 # ---------- Routes ----------
@@ -303,43 +289,98 @@ async def create_project(request: Request):
 
     project = add_project(project_name, travel_date, travel_duration_int)
 
-    # Initialize submissions file as empty array
-    submissions_file = get_submissions_file_path(project_name)
-    if not submissions_file.exists():
-        with open(submissions_file, "w", encoding="utf-8") as f:
-            json.dump([], f, indent=2, ensure_ascii=False)
+    # Initialize empty submissions storage
+    STORAGE.init_submissions(project["safe_name"])
 
     return JSONResponse(project)
 
 
+def submissions_etag(safe_name: str, *variant) -> Optional[str]:
+    """Strong ETag for a view of a project's submissions, or None if absent."""
+    version = SUBMISSION_CACHE.version(safe_name)
+    if version is None:
+        return None
+    tag = hashlib.sha1(repr((safe_name, version, variant)).encode("utf-8"))
+    return f'"{tag.hexdigest()[:24]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Evaluate an If-None-Match header against the current ETag."""
+    if not if_none_match or not etag:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
 @app.get("/api/projects/{project_name}/submissions")
-def get_project_submissions(project_name: str):
-    """Get all submissions for a specific project."""
-    submissions = load_submissions_with_metadata(project_name)
-    return JSONResponse(submissions)
+def get_project_submissions(
+    project_name: str,
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+):
+    """Get submissions for a specific project.
+
+    Without ``limit`` all submissions are returned. With ``limit`` the response
+    carries ``next_cursor`` to pass back as ``cursor`` for the next page.
+    Responses are tagged with a strong ETag; a matching If-None-Match returns
+    304 without reading the submissions.
+    """
+    safe_name = sanitize_project_name(project_name)
+    etag = submissions_etag(safe_name, limit, cursor)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    try:
+        page, next_cursor = paginate(
+            load_validated_submissions(safe_name), limit, cursor
+        )
+    except ValueError as e:
+        return PlainTextResponse(str(e), status_code=400)
+
+    body = {"submissions": page}
+    if limit is not None:
+        body["next_cursor"] = next_cursor
+    headers = {"Cache-Control": "no-cache"}
+    if etag:
+        headers["ETag"] = etag
+    return JSONResponse(body, headers=headers)
+
+
+@app.get("/api/projects/{project_name}/submissions/{participant_id}")
+def get_participant(project_name: str, participant_id: str):
+    """Get a single submission by its participant id."""
+    safe_name = sanitize_project_name(project_name)
+    try:
+        record = STORAGE.get_submission(safe_name, participant_id)
+    except json.JSONDecodeError:
+        return PlainTextResponse("Invalid submissions file", status_code=500)
+    if record is None:
+        return PlainTextResponse("Participant not found", status_code=404)
+    return JSONResponse(record)
 
 
 @app.delete("/api/projects/{project_name}")
 def delete_project(project_name: str):
-    """Delete a project and its submissions file."""
-    projects = get_projects()
+    """Delete a project and its submissions."""
     safe_name = sanitize_project_name(project_name)
 
     # Remove project from projects list
-    projects = [p for p in projects if p.get("safe_name") != safe_name]
-    save_projects(projects)
+    PROJECTS.remove(safe_name)
 
-    # Delete submissions file if it exists
-    submissions_file = get_submissions_file_path(project_name)
-    if submissions_file.exists():
-        try:
-            submissions_file.unlink()
-        except Exception as e:
-            print(f"Error deleting submissions file: {e}")
-            return PlainTextResponse(
-                f"Project deleted but failed to delete submissions file: {e}",
-                status_code=500,
-            )
+    # Delete submissions if they exist
+    try:
+        STORAGE.drop_submissions(safe_name)
+    except Exception as e:
+        print(f"Error deleting submissions file: {e}")
+        return PlainTextResponse(
+            f"Project deleted but failed to delete submissions file: {e}",
+            status_code=500,
+        )
 
     return JSONResponse({"message": "Project deleted successfully"})
 
@@ -354,49 +395,32 @@ async def delete_participant(project_name: str, request: Request):
         if not participant_id:
             return PlainTextResponse("participant_id is required", status_code=400)
 
-        # Decode the participant identifier
-        participant_data = json.loads(urllib.parse.unquote(participant_id))
+        # Participant ids are plain strings; older clients send the
+        # URL-encoded JSON of {name, phone, added_at} instead
+        participant_data = None
+        decoded = urllib.parse.unquote(participant_id)
+        if decoded.lstrip().startswith("{"):
+            participant_data = json.loads(decoded)
 
-        # Load submissions
-        submissions_file = get_submissions_file_path(project_name)
-        if not submissions_file.exists():
+        safe_name = sanitize_project_name(project_name)
+        if not STORAGE.has_submissions(safe_name):
             return PlainTextResponse(
                 "Project submissions file not found", status_code=404
             )
 
+        # Find and remove the matching participant
         try:
-            with open(submissions_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            if participant_data is None:
+                deleted = STORAGE.delete_submission_by_id(safe_name, participant_id)
+            else:
+                # Match by name, phone, and added_at
+                deleted = STORAGE.delete_submission(safe_name, participant_data)
         except json.JSONDecodeError:
             return PlainTextResponse("Invalid submissions file", status_code=500)
 
-        # Handle backward compatibility: old format (object with travel_date, travel_duration, submissions)
-        if isinstance(data, dict) and "submissions" in data:
-            submissions_list = data.get("submissions", [])
-        else:
-            # Current format (array of submissions)
-            submissions_list = data if isinstance(data, list) else []
-
-        # Find and remove the matching participant
-        # Match by name, phone, and added_at
-        original_count = len(submissions_list)
-        submissions_list = [
-            s
-            for s in submissions_list
-            if not (
-                s.get("name") == participant_data.get("name")
-                and str(s.get("phone")) == str(participant_data.get("phone"))
-                and s.get("added_at") == participant_data.get("added_at")
-            )
-        ]
-
-        if len(submissions_list) == original_count:
+        if not deleted:
             return PlainTextResponse("Participant not found", status_code=404)
 
-        # Save updated submissions as array
-        with open(submissions_file, "w", encoding="utf-8") as f:
-            json.dump(submissions_list, f, indent=2, ensure_ascii=False)
-
         return JSONResponse({"message": "Participant deleted successfully"})
 
     except json.JSONDecodeError as e:
@@ -460,186 +484,165 @@ async def submit(
 
     # Save to project-specific file
     project_name_clean = sanitize_project_name(project_name)
-    # Ensure project exists
-    add_project(project_name)
-    SUBMISSIONS.append(survey)
-    append_submission_to_file(survey, project_name_clean)
+    # Ensure project exists; storage takes file locks and fsyncs, so it runs
+    # in the threadpool rather than on the event loop
+    await run_in_threadpool(add_project, project_name)
+    if WRITE_BUFFER is not None:
+        try:
+            await WRITE_BUFFER.submit(
+                project_name_clean, build_submission_record(survey)
+            )
+        except STORAGE_ERRORS as e:
+            return PlainTextResponse(f"Error saving submission: {e}", status_code=500)
+    else:
+        await run_in_threadpool(append_submission_to_file, survey, project_name_clean)
     return RedirectResponse(f"/?project={project_name_clean}", status_code=303)
 
 
+@app.get("/api/cache/stats")
+def cache_stats():
+    """Hit/miss counters for the in-process caches."""
+    stats = {
+        "submissions": SUBMISSION_CACHE.stats(),
+        "autocomplete": AUTOCOMPLETE_CACHE.stats(),
+        "photon": PHOTON.stats(),
+    }
+    if WRITE_BUFFER is not None:
+        stats["write_behind"] = WRITE_BUFFER.stats()
+    return JSONResponse(stats)
+
+
 @app.get("/api/location/autocomplete")
 async def location_autocomplete(query: str = Query(..., min_length=2)):
-    """Get location suggestions from Photon API (designed for autocomplete)."""
+    """Get location suggestions, from the offline gazetteer when configured
+    and otherwise from Photon API (designed for autocomplete).
+
+    Photon results are cached per normalized query; a longer query whose cached
+    prefix already holds every Photon match is answered without a request.
+    """
     try:
-        # Use Photon API - designed specifically for autocomplete
-        url = "https://photon.komoot.io/api"
-        params = {
-            "q": query,
-            "limit": 8,  # Get more results to filter better
-            "lang": "en",
-        }
-        headers = {"User-Agent": "PackVote/1.0"}
+        if GAZETTEER is not None:
+            candidates = GAZETTEER.candidates(query)
+            if candidates:
+                return JSONResponse(rank_suggestions(candidates, query))
+
+        cached = AUTOCOMPLETE_CACHE.get(query)
+        if cached is not None:
+            return JSONResponse(rank_suggestions(cached[0], query))
+
+        # Use Photon API - designed specifically for autocomplete; concurrent
+        # identical queries share one request
+        candidates = await PHOTON.lookup(query)
+
+        # Prefix matches first, limited to the top suggestions
+        return JSONResponse(rank_suggestions(candidates, query))
+    except (httpx.HTTPError, sqlite3.Error, KeyError, TypeError, ValueError) as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url, params=params, headers=headers, timeout=5.0
-            )
-            response.raise_for_status()
-            data = response.json()
-
-        # Format results to show city, state/country
-        suggestions = []
-        seen_locations = set()  # Avoid duplicates
-
-        features = data.get("features", [])
-
-        for feature in features:
-            properties = feature.get("properties", {})
-
-            # Get location type - prioritize cities, towns, villages
-            location_type = properties.get("type", "").lower()
-            osm_value = properties.get("osm_value", "").lower()
-
-            # Filter to only include populated places
-            valid_types = ("city", "town", "village", "municipality", "administrative")
-            if location_type not in valid_types and osm_value not in valid_types:
-                # Check if it's a place with a name (might be a city)
-                if not properties.get("name"):
-                    continue
-                # Allow if it has city/town-like properties
-                if location_type not in (
-                    "place",
-                    "administrative",
-                ) and osm_value not in ("place", "administrative"):
-                    continue
-
-            # Get city/town name
-            city = (
-                properties.get("city")
-                or properties.get("name")
-                or properties.get("town")
-                or properties.get("village")
-            )
 
-            if not city:
-                continue
+def iter_project_records(project_name: str) -> Iterator[dict]:
+    """Yield a project's validated records lazily (cached when current)."""
+    try:
+        yield from SUBMISSION_CACHE.iter_records(sanitize_project_name(project_name))
+    except (json.JSONDecodeError, ValidationError, KeyError) as e:
+        print(f"Error loading submissions file: {e}")
 
-            # Get state and country
-            state = (
-                properties.get("state")
-                or properties.get("state_code")
-                or properties.get("region")
-            )
-            country = properties.get("country", "")
-            country_code = properties.get("countrycode", "").upper()
-
-            # Format display name - prioritize US format (City, State)
-            if state and (country == "United States" or country_code == "US"):
-                # For US, prefer state code if available
-                state_code = properties.get("state_code", "")
-                if state_code and len(state_code) == 2:
-                    display_name = f"{city}, {state_code}"
-                elif state and len(state) <= 2:
-                    display_name = f"{city}, {state.upper()}"
-                else:
-                    display_name = f"{city}, {state}"
-            elif state:
-                display_name = f"{city}, {state}"
-            elif country:
-                display_name = f"{city}, {country}"
-            else:
-                display_name = city
-
-            # Create a unique key to avoid duplicates
-            location_key = display_name.lower()
-            if location_key in seen_locations:
-                continue
-            seen_locations.add(location_key)
-
-            # Check if the query matches the city name (case-insensitive)
-            query_lower = query.lower().strip()
-            city_lower = city.lower().strip()
-
-            # Only include results where the city name starts with the query
-            # This ensures "austi" matches "Austin" but not "Haparanda kommun"
-            if not city_lower.startswith(query_lower):
-                # Allow if query is at least 3 chars and city contains it (for partial matches)
-                if len(query_lower) >= 3 and query_lower in city_lower:
-                    pass  # Allow it but with lower priority
-                else:
-                    continue  # Skip if it doesn't match at all
-
-            # Prioritize results where the query matches the beginning of the city name
-            priority = 0
-            if city_lower.startswith(query_lower):
-                priority = 2  # Highest priority for prefix matches
-            elif query_lower in city_lower:
-                priority = 1  # Lower priority for contains matches
-
-            suggestions.append(
-                {
-                    "display_name": display_name,
-                    "full_name": properties.get("name", ""),
-                    "priority": priority,
-                }
-            )
 
-        # Sort by priority (prefix matches first), then limit to 5
-        suggestions.sort(key=lambda x: -x["priority"])
-        suggestions = suggestions[:5]
+def iter_all_records() -> Iterator[dict]:
+    """Yield the records of every project, one project at a time."""
+    for project in get_projects():
+        yield from iter_project_records(project["safe_name"])
 
-        # Remove priority from response
-        for suggestion in suggestions:
-            suggestion.pop("priority", None)
 
-        return JSONResponse(suggestions)
-    except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+def _without_metadata(records: Iterable[dict]) -> Iterator[dict]:
+    for record in records:
+        yield {k: v for k, v in record.items() if k not in METADATA_KEYS}
 
 
 @app.get("/submissions")
-def list_submissions(project: str = None):
+def list_submissions(
+    request: Request,
+    project: str = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+):
+    if not project:
+        records = _without_metadata(iter_all_records())
+        return StreamingResponse(
+            iter_json_array(records), media_type="application/json"
+        )
+
+    safe_name = sanitize_project_name(project)
+    etag = submissions_etag(safe_name, "list", limit, cursor)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    headers = {"Cache-Control": "no-cache"}
+    if etag:
+        headers["ETag"] = etag
+    if limit is None and cursor is None:
+        records = _without_metadata(iter_project_records(safe_name))
+    else:
+        try:
+            page, next_cursor = paginate(
+                load_validated_submissions(safe_name), limit, cursor
+            )
+        except ValueError as e:
+            return PlainTextResponse(str(e), status_code=400)
+        records = _without_metadata(page)
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+    return StreamingResponse(
+        iter_json_array(records), media_type="application/json", headers=headers
+    )
+
+
+@app.get("/submissions.ndjson")
+def download_ndjson(project: str = None):
+    """Stream submissions (with added_at when available) as NDJSON."""
     if project:
-        submissions = load_submissions_from_file(project)
-        return JSONResponse([s.model_dump() for s in submissions])
-    return JSONResponse([s.model_dump() for s in SUBMISSIONS])
+        records = iter_project_records(project)
+    else:
+        records = iter_all_records()
+    return StreamingResponse(iter_ndjson(records), media_type="application/x-ndjson")
 
 
 @app.get("/submissions.csv")
 def download_csv(project: str = None):
-    submissions = load_submissions_from_file(project) if project else SUBMISSIONS
-    if not submissions:
+    if project:
+        records = iter_project_records(project)
+    else:
+        records = iter_all_records()
+    first = next(records, None)
+    if first is None:
         return PlainTextResponse("No submissions yet.", status_code=200)
-    buf = io.StringIO()
-    w = csv.writer(buf)
-    w.writerow(
-        [
-            "name",
-            "phone",
-            "country_code",
-            "budget_category",
-            "budget_range",
-            "current_location",
-            "preferences",
+    return StreamingResponse(
+        iter_csv(itertools.chain([first], records)), media_type="text/csv"
+    )
+
+
+@app.get("/api/export.zip")
+def export_zip(projects: str = None, format: str = "csv"):
+    """Stream a zip archive with one export file per project.
+
+    ``projects`` is a comma-separated list of project names; all projects are
+    exported when it is omitted. ``format`` is "csv" or "ndjson".
+    """
+    if format not in ("csv", "ndjson"):
+        return PlainTextResponse("format must be 'csv' or 'ndjson'", status_code=400)
+    if projects:
+        safe_names = [
+            sanitize_project_name(name) for name in projects.split(",") if name.strip()
         ]
+    else:
+        safe_names = [p["safe_name"] for p in get_projects()]
+    render = iter_csv if format == "csv" else iter_ndjson
+    entries = (
+        (f"{safe_name}_submissions.{format}", render(iter_project_records(safe_name)))
+        for safe_name in dict.fromkeys(safe_names)
+    )
+    return StreamingResponse(
+        iter_zip(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="packvote_export.zip"'},
     )
-    for s in submissions:
-        # Format phone with country code if available
-        s_dict = s.model_dump()
-        phone_display = str(s_dict.get("phone", ""))
-        country_code = s_dict.get("country_code", "")
-        if country_code:
-            phone_display = f"{country_code} {phone_display}"
-        w.writerow(
-            [
-                s_dict.get("name", "").capitalize(),
-                phone_display,
-                country_code,
-                s_dict.get("budget_category", ""),
-                json.dumps(s_dict.get("budget_range", [])),
-                s_dict.get("current_location", "").capitalize(),
-                "; ".join(s_dict.get("preferences", [])).capitalize(),
-            ]
-        )
-    buf.seek(0)
-    return PlainTextResponse(buf.read(), media_type="text/csv")
@@ -0,0 +1,263 @@
+"""Plan itineraries for many projects concurrently on one event loop.
+
+Each project's graph runs with ``ainvoke`` on a checkpoint thread of its own
+for this batch run (``--run-id``, by default the start time), seeded with the
+project's surveys from the configured storage backend. A semaphore bounds how
+many projects run at once; chat model calls across all of them share one rate
+limiter (PACKVOTE_LLM_REQUESTS_PER_SECOND). Results and timings are written
+to one JSON file per project plus ``summary.json``.
+
+    python run_batch.py trip_a trip_b --concurrency 8 --output-dir batch_out
+    python run_batch.py --all
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from run_graph import build_workflow, default_recursion_limit
+from src.packvote.backend import (
+    BATCH_CONCURRENCY,
+    CHECKPOINT_DB_PATH,
+    LOGGER,
+    RESEARCH_MAX_CONCURRENCY,
+    SQLITE_DB_PATH,
+    STORAGE_BACKEND,
+)
+from src.packvote.backend.storage import (
+    StorageBackend,
+    create_storage,
+    validate_submission,
+)
+from src.packvote.backend.storage.checkpoints import (
+    open_async_checkpointer,
+    project_thread_id,
+)
+
+PROJECTS_FILE = Path("src/packvote/backend/artifacts/model_inputs/projects.json")
+SUBMISSIONS_DIR = Path("src/packvote/backend/artifacts/model_inputs/user_surveys")
+DEFAULT_MESSAGE = (
+    "Create an itinerary for our group trip that balances every traveler's "
+    "preferences and budget."
+)
+
+
+def valid_submissions(
+    storage: StorageBackend, safe_name: str
+) -> Tuple[List[dict], int]:
+    """A project's submissions normalised the way the API validates them
+    (legacy string phones, missing country codes), and how many rows were
+    skipped as invalid. Extra keys such as per-traveler dates are kept."""
+    records, skipped = [], 0
+    for row in storage.read_submissions(safe_name):
+        try:
+            validated = validate_submission(row)
+        except ValidationError as e:
+            LOGGER.warning("Skipping invalid submission in %s: %s", safe_name, e)
+            validated = None
+        if validated is None:
+            skipped += 1
+            continue
+        records.append({**row, **validated[1]})
+    return records, skipped
+
+
+def research_summary(messages: list) -> Optional[str]:
+    """The research the run ended with: the latest ``search_activity``
+    message (merged branch findings or the single agent's answer)."""
+    for message in reversed(messages):
+        if getattr(message, "name", None) == "search_activity":
+            return message.content
+    return None
+
+
+def project_survey_input(
+    storage: StorageBackend, safe_name: str
+) -> Tuple[Optional[dict], int]:
+    """Survey payload for a project (None if it lacks travel dates or valid
+    submissions) and the number of submissions skipped as invalid."""
+    project = storage.get_project(safe_name)
+    if project is None or not project.get("travel_date"):
+        return None, 0
+    submissions, skipped = valid_submissions(storage, safe_name)
+    if not submissions:
+        return None, skipped
+    payload = {
+        "travel_date": project["travel_date"],
+        "travel_duration": project.get("travel_duration"),
+        "submissions": submissions,
+    }
+    return payload, skipped
+
+
+async def run_project(
+    workflow,
+    safe_name: str,
+    survey_input: dict,
+    message: str,
+    semaphore: asyncio.Semaphore,
+    recursion_limit: int,
+    run_id: str,
+) -> dict:
+    """Run one project's graph once a semaphore slot is free."""
+    queued = time.perf_counter()
+    async with semaphore:
+        started = time.perf_counter()
+        config = {
+            "configurable": {
+                "thread_id": project_thread_id(safe_name, run_id),
+                "user_survey_input": survey_input,
+            },
+            "recursion_limit": recursion_limit,
+            "max_concurrency": RESEARCH_MAX_CONCURRENCY,
+        }
+        result = {"project": safe_name, "run_id": run_id, "status": "ok"}
+        try:
+            state = await workflow.ainvoke(
+                {"messages": [{"role": "user", "content": message}]}, config
+            )
+            result["research_summary"] = research_summary(state["messages"])
+            result["destination_candidates"] = state.get("destination_candidates")
+            result["research_findings"] = state.get("research_findings")
+        except Exception as e:
+            # Any failure is confined to its project; the batch goes on
+            LOGGER.exception("Planning failed for %s", safe_name)
+            result.update(status="error", error=f"{type(e).__name__}: {e}")
+        finished = time.perf_counter()
+    result["queued_s"] = round(started - queued, 3)
+    result["elapsed_s"] = round(finished - started, 3)
+    return result
+
+
+async def run_batch(
+    project_names: List[str],
+    storage: StorageBackend,
+    output_dir: Path,
+    concurrency: int = BATCH_CONCURRENCY,
+    message: str = DEFAULT_MESSAGE,
+    recursion_limit: int = default_recursion_limit(),
+    run_id: Optional[str] = None,
+) -> List[dict]:
+    """Plan every project concurrently and write per-project results.
+
+    Checkpoint threads are scoped to ``run_id`` (default: the start time), so
+    runs never build on an earlier run's state."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    started = time.perf_counter()
+    results, skipped_rows, inputs = [], {}, {}
+    for safe_name in project_names:
+        survey_input, skipped_rows[safe_name] = project_survey_input(storage, safe_name)
+        if survey_input is None:
+            results.append(
+                {
+                    "project": safe_name,
+                    "status": "skipped",
+                    "skipped_submissions": skipped_rows[safe_name],
+                }
+            )
+        else:
+            inputs[safe_name] = survey_input
+
+    async with open_async_checkpointer(Path(CHECKPOINT_DB_PATH)) as checkpointer:
+        workflow = build_workflow(checkpointer, asynchronous=True)
+        tasks = [
+            run_project(
+                workflow,
+                safe_name,
+                survey_input,
+                message,
+                semaphore,
+                recursion_limit,
+                run_id,
+            )
+            for safe_name, survey_input in inputs.items()
+        ]
+        for finished in asyncio.as_completed(tasks):
+            result = await finished
+            result["skipped_submissions"] = skipped_rows[result["project"]]
+            results.append(result)
+            with open(
+                output_dir / f"{result['project']}.json", "w", encoding="utf-8"
+            ) as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+
+    summary = {
+        "run_id": run_id,
+        "projects": len(project_names),
+        "concurrency": concurrency,
+        "wall_s": round(time.perf_counter() - started, 3),
+        "results": [
+            {
+                k: r.get(k)
+                for k in (
+                    "project",
+                    "status",
+                    "skipped_submissions",
+                    "queued_s",
+                    "elapsed_s",
+                )
+            }
+            for r in results
+        ],
+    }
+    with open(output_dir / "summary.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan itineraries for many projects")
+    parser.add_argument("projects", nargs="*", help="Project safe names")
+    parser.add_argument("--all", action="store_true", help="Plan every project")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument("--output-dir", type=Path, default=Path("batch_results"))
+    parser.add_argument("--message", default=DEFAULT_MESSAGE)
+    parser.add_argument(
+        "--recursion-limit",
+        type=int,
+        default=default_recursion_limit(),
+        help="Super-steps per project run (default: enough for the round budget)",
+    )
+    parser.add_argument(
+        "--run-id",
+        help="Checkpoint thread scope of this run (default: the start time)",
+    )
+    args = parser.parse_args()
+
+    storage = create_storage(
+        STORAGE_BACKEND,
+        projects_file=PROJECTS_FILE,
+        submissions_dir=SUBMISSIONS_DIR,
+        sqlite_path=Path(SQLITE_DB_PATH),
+    )
+    projects = args.projects
+    if args.all:
+        projects = [p["safe_name"] for p in storage.list_projects()]
+    if not projects:
+        parser.error("pass project names or --all")
+
+    results = asyncio.run(
+        run_batch(
+            projects,
+            storage,
+            args.output_dir,
+            concurrency=args.concurrency,
+            message=args.message,
+            recursion_limit=args.recursion_limit,
+            run_id=args.run_id,
+        )
+    )
+    failed = [r["project"] for r in results if r["status"] == "error"]
+    LOGGER.info("Planned %d projects, %d failed", len(results), len(failed))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,168 @@
+import argparse
+from pathlib import Path
+
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.errors import GraphRecursionError
 from langgraph.graph import START, StateGraph
 
-from src.packvote.backend import ITINERARY_PLANNER_MODEL
-from src.packvote.backend.nodes.researcher import search_activity_node
-from src.packvote.backend.nodes.retrieve import retrieve_node
+from src.packvote.backend import (
+    CHECKPOINT_DB_PATH,
+    ITINERARY_PLANNER_MODEL,
+    LOGGER,
+    RESEARCH_MAX_CONCURRENCY,
+    SUPERVISOR_MAX_RESEARCH_ROUNDS,
+)
+from src.packvote.backend.nodes.research_fanout import (
+    aresearch_branch_node,
+    merge_research_node,
+    plan_research_node,
+    research_branch_node,
+)
+from src.packvote.backend.nodes.researcher import (
+    asearch_activity_node,
+    search_activity_node,
+)
+from src.packvote.backend.nodes.retrieve import aretrieve_node, retrieve_node
 from src.packvote.backend.nodes.supervisor import make_supervisor_node
+from src.packvote.backend.storage.checkpoints import (
+    open_checkpointer,
+    project_thread_id,
+)
+from src.packvote.backend.storage.llm_cache import default_llm_cache
 from src.packvote.backend.utils.langgraph_elements import State
+from src.packvote.backend.utils.rate_limit import default_rate_limiter
 
 load_dotenv()
 
-llm = ChatOpenAI(model=ITINERARY_PLANNER_MODEL, temperature=0, max_tokens=100)
+# Super-steps per research round: supervisor, research, the research_branch
+# tasks (all Send branches share one super-step) and merge_research. The
+# single-agent fallback (search_activity) takes one fewer.
+STEPS_PER_RESEARCH_ROUND = 4
+# retrieve before the first round and the supervisor hop that finishes
+FIXED_STEPS = 2
 
-research_supervisor_node = make_supervisor_node(
-    llm,
-    ["search_activity"],
-)
 
-workflow = StateGraph(State)
-workflow.add_node("retrieve", retrieve_node)
-workflow.add_node("search_activity", search_activity_node)
-workflow.add_node("supervisor", research_supervisor_node)
-workflow.add_edge(START, "retrieve")
-workflow.add_edge("retrieve", "supervisor")
-# Note: generate_itinerary and binary_grader use Command(goto="supervisor") for routing
-# Note: supervisor uses Command(goto=...) for conditional routing, so no explicit edges needed
-
-workflow = workflow.compile()
-
-# Draw the mermaid diagram and save it to a file
-workflow.get_graph().draw_mermaid_png(output_file_path="workflow.png")
-
-response = workflow.invoke(
-    {
-        "messages": [
-            {
-                "role": "user",
-                "content": "Create an itinerary for a 3 day trip to Tokyo, Japan",
-            }
-        ]
-    },
-    {"recursion_limit": 5},
-)
-print(response)
+def default_recursion_limit(rounds: int = SUPERVISOR_MAX_RESEARCH_ROUNDS) -> int:
+    """Recursion limit that lets ``rounds`` research rounds reach the
+    supervisor's step-budget rule, with one super-step of headroom."""
+    return FIXED_STEPS + rounds * STEPS_PER_RESEARCH_ROUND + 1
+
+
+def build_workflow(
+    checkpointer: BaseCheckpointSaver | None = None, asynchronous: bool = False
+):
+    """Compile the itinerary workflow, checkpointed when ``checkpointer`` is set.
+
+    With ``asynchronous=True`` the LLM nodes are coroutines (``ainvoke`` on the
+    models and agents); run the graph with ``ainvoke``/``astream``."""
+    llm = ChatOpenAI(
+        model=ITINERARY_PLANNER_MODEL,
+        temperature=0,
+        max_tokens=100,
+        cache=default_llm_cache(),
+        rate_limiter=default_rate_limiter(),
+    )
+
+    research_supervisor_node = make_supervisor_node(
+        llm,
+        ["research"],
+        asynchronous=asynchronous,
+    )
+
+    workflow = StateGraph(State)
+    workflow.add_node("retrieve", aretrieve_node if asynchronous else retrieve_node)
+    workflow.add_node("research", plan_research_node)
+    workflow.add_node(
+        "research_branch",
+        aresearch_branch_node if asynchronous else research_branch_node,
+    )
+    workflow.add_node("merge_research", merge_research_node)
+    workflow.add_node(
+        "search_activity",
+        asearch_activity_node if asynchronous else search_activity_node,
+    )
+    workflow.add_node("supervisor", research_supervisor_node)
+    workflow.add_edge(START, "retrieve")
+    workflow.add_edge("retrieve", "supervisor")
+    # research fans out research_branch tasks with Send; merge once all are done
+    workflow.add_edge("research_branch", "merge_research")
+    # Note: generate_itinerary and binary_grader use Command(goto="supervisor") for routing
+    # Note: supervisor uses Command(goto=...) for conditional routing, so no explicit edges needed
+
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the PackVote itinerary graph")
+    parser.add_argument(
+        "--project", default="default", help="Project safe name (checkpoint thread)"
+    )
+    parser.add_argument(
+        "--message",
+        default="Create an itinerary for a 3 day trip to Tokyo, Japan",
+        help="User request that starts a new run",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the project's last run from its last completed node",
+    )
+    parser.add_argument(
+        "--history", action="store_true", help="List the project's checkpoints"
+    )
+    parser.add_argument(
+        "--recursion-limit",
+        type=int,
+        default=default_recursion_limit(),
+        help="Super-steps per run (default: enough for the research round budget)",
+    )
+    args = parser.parse_args()
+
+    checkpointer = open_checkpointer(Path(CHECKPOINT_DB_PATH))
+    workflow = build_workflow(checkpointer)
+    config = {
+        "configurable": {"thread_id": project_thread_id(args.project)},
+        "recursion_limit": args.recursion_limit,
+        # Upper bound on research branches (graph tasks) running at once
+        "max_concurrency": RESEARCH_MAX_CONCURRENCY,
+    }
+
+    if args.history:
+        for snapshot in workflow.get_state_history(config):
+            print(
+                snapshot.config["configurable"]["checkpoint_id"],
+                snapshot.metadata.get("step"),
+                snapshot.next,
+            )
+        return
+
+    # Draw the mermaid diagram and save it to a file
+    workflow.get_graph().draw_mermaid_png(output_file_path="workflow.png")
+
+    if args.resume:
+        pending = workflow.get_state(config).next
+        if not pending:
+            LOGGER.warning("Nothing to resume for project %r", args.project)
+            return
+        LOGGER.info("Resuming project %r at %s", args.project, ", ".join(pending))
+        inputs = None  # Continue from the last checkpoint
+    else:
+        inputs = {"messages": [{"role": "user", "content": args.message}]}
+
+    try:
+        response = workflow.invoke(inputs, config)
+    except GraphRecursionError:
+        LOGGER.warning(
+            "Recursion limit reached; rerun with --resume to continue project %r",
+            args.project,
+        )
+        raise
+    print(response)
+    if default_llm_cache() is not None:
+        LOGGER.info("LLM cache: %s", default_llm_cache().stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,105 @@ os.environ["LANGSMITH_TRACING"] = "true"
 # LangGraph Models
 ITINERARY_PLANNER_MODEL = "gpt-4o-mini"
 
+# Survey options shared by the form and the group-consensus engine
+PREFERENCES = [
+    "Beaches",
+    "City sightseeing",
+    "Outdoor adventures",
+    "Festivals/events",
+    "Food exploration",
+    "Nightlife",
+    "Shopping",
+    "Spa wellness",
+]
+BUDGET_CARDS = {
+    "low": {"label": "Low", "range": [0, 1000]},
+    "medium": {"label": "Medium", "range": [1000, 2500]},
+    "high": {"label": "High", "range": [2500, 5000]},
+}
+
+# Storage backend for projects and submissions:
+# "json" (JSON array per project), "jsonl" (append-only log) or "sqlite"
+STORAGE_BACKEND = os.getenv("PACKVOTE_STORAGE_BACKEND", "json").lower()
+SQLITE_DB_PATH = os.getenv(
+    "PACKVOTE_SQLITE_PATH", "src/packvote/backend/artifacts/packvote.db"
+)
+# Number of projects whose validated submissions are kept in memory
+SUBMISSION_CACHE_MAX_PROJECTS = int(os.getenv("PACKVOTE_SUBMISSION_CACHE_SIZE", "64"))
+# Approximate memory budget for those projects, in megabytes
+SUBMISSION_CACHE_MAX_MB = float(os.getenv("PACKVOTE_SUBMISSION_CACHE_MAX_MB", "64"))
+
+# Write-behind batching for /submit bursts
+WRITE_BEHIND_ENABLED = os.getenv("PACKVOTE_WRITE_BEHIND", "false").lower() == "true"
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("PACKVOTE_WRITE_BEHIND_BATCH_SIZE", "64"))
+WRITE_BEHIND_MAX_DELAY_MS = int(os.getenv("PACKVOTE_WRITE_BEHIND_MAX_DELAY_MS", "50"))
+# Respond to /submit only after the batch containing the submission is on disk
+WRITE_BEHIND_DURABLE = (
+    os.getenv("PACKVOTE_WRITE_BEHIND_DURABLE", "true").lower() == "true"
+)
+
+# Location autocomplete cache; set PACKVOTE_AUTOCOMPLETE_CACHE_PATH to persist it
+AUTOCOMPLETE_CACHE_SIZE = int(os.getenv("PACKVOTE_AUTOCOMPLETE_CACHE_SIZE", "1024"))
+AUTOCOMPLETE_CACHE_TTL_S = float(
+    os.getenv("PACKVOTE_AUTOCOMPLETE_CACHE_TTL_S", "86400")
+)
+AUTOCOMPLETE_CACHE_PATH = os.getenv("PACKVOTE_AUTOCOMPLETE_CACHE_PATH") or None
+# Shared Photon client: upstream requests in flight at once, and their timeout
+PHOTON_MAX_CONCURRENCY = int(os.getenv("PACKVOTE_PHOTON_MAX_CONCURRENCY", "4"))
+PHOTON_TIMEOUT_S = float(os.getenv("PACKVOTE_PHOTON_TIMEOUT_S", "5"))
+# Offline GeoNames-style TSV used for autocomplete before falling back to Photon
+GAZETTEER_PATH = os.getenv("PACKVOTE_GAZETTEER_PATH") or None
+# Persistent geocode cache for traveler origins and candidate destinations
+GEOCODE_CACHE_PATH = os.getenv(
+    "PACKVOTE_GEOCODE_CACHE_PATH", "src/packvote/backend/artifacts/geocode.db"
+)
+# Local catalog of candidate destinations and how many are handed to research
+DESTINATION_CATALOG_PATH = os.getenv(
+    "PACKVOTE_DESTINATION_CATALOG", "src/packvote/backend/data/destinations.json"
+)
+DESTINATION_TOP_K = int(os.getenv("PACKVOTE_DESTINATION_TOP_K", "3"))
+# Workflow checkpoints, one thread per project, for resuming interrupted runs
+CHECKPOINT_DB_PATH = os.getenv(
+    "PACKVOTE_CHECKPOINT_PATH", "src/packvote/backend/artifacts/checkpoints.db"
+)
+# Opt-in exact-match cache for chat model responses (0 TTL never expires)
+LLM_CACHE_ENABLED = os.getenv("PACKVOTE_LLM_CACHE", "false").lower() == "true"
+LLM_CACHE_PATH = os.getenv(
+    "PACKVOTE_LLM_CACHE_PATH", "src/packvote/backend/artifacts/llm_cache.db"
+)
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("PACKVOTE_LLM_CACHE_SIZE", "10000"))
+LLM_CACHE_TTL_S = float(os.getenv("PACKVOTE_LLM_CACHE_TTL_S", "604800"))
+# Tavily search cache: fresh for the TTL, then served stale while refreshing;
+# an empty path keeps it in memory only
+TAVILY_CACHE_PATH = os.getenv(
+    "PACKVOTE_TAVILY_CACHE_PATH", "src/packvote/backend/artifacts/tavily_cache.db"
+)
+TAVILY_CACHE_TTL_S = float(os.getenv("PACKVOTE_TAVILY_CACHE_TTL_S", "86400"))
+TAVILY_CACHE_STALE_S = float(os.getenv("PACKVOTE_TAVILY_CACHE_STALE_S", "604800"))
+TAVILY_MAX_CONNECTIONS = int(os.getenv("PACKVOTE_TAVILY_MAX_CONNECTIONS", "4"))
+# Search results passed to the agent: total characters kept, chunk size, and
+# the token overlap above which two chunks count as duplicates
+SEARCH_RESULT_CHAR_BUDGET = int(os.getenv("PACKVOTE_SEARCH_RESULT_CHARS", "3000"))
+SEARCH_CHUNK_CHARS = int(os.getenv("PACKVOTE_SEARCH_CHUNK_CHARS", "500"))
+SEARCH_DEDUP_THRESHOLD = float(os.getenv("PACKVOTE_SEARCH_DEDUP_THRESHOLD", "0.8"))
+# Parallel research fan-out: branches per round, interests per branch, and how
+# many branches (graph tasks) run at once
+RESEARCH_MAX_BRANCHES = int(os.getenv("PACKVOTE_RESEARCH_MAX_BRANCHES", "8"))
+RESEARCH_CLUSTER_SIZE = int(os.getenv("PACKVOTE_RESEARCH_CLUSTER_SIZE", "2"))
+RESEARCH_MAX_CONCURRENCY = int(os.getenv("PACKVOTE_RESEARCH_MAX_CONCURRENCY", "4"))
+# Worker results per user turn after which the supervisor finishes without the LLM
+SUPERVISOR_MAX_RESEARCH_ROUNDS = int(
+    os.getenv("PACKVOTE_SUPERVISOR_MAX_RESEARCH_ROUNDS", "2")
+)
+# Approximate token budgets for the supervisor prompt and each agent model call
+SUPERVISOR_TOKEN_BUDGET = int(os.getenv("PACKVOTE_SUPERVISOR_TOKEN_BUDGET", "4000"))
+AGENT_TOKEN_BUDGET = int(os.getenv("PACKVOTE_AGENT_TOKEN_BUDGET", "8000"))
+# Chat model requests per second across the process (0 = unlimited) and burst
+LLM_REQUESTS_PER_SECOND = float(os.getenv("PACKVOTE_LLM_REQUESTS_PER_SECOND", "0"))
+LLM_MAX_BURST = int(os.getenv("PACKVOTE_LLM_MAX_BURST", "4"))
+# Projects planned at once by the nightly batch runner
+BATCH_CONCURRENCY = int(os.getenv("PACKVOTE_BATCH_CONCURRENCY", "8"))
+
 __all__ = [
     "LOGGER",
     "QDRANT_API_KEY",
@@ -36,4 +135,44 @@ __all__ = [
     "TAVILY_API_KEY",
     "OPENWEATHERMAP_API_KEY",
     "ITINERARY_PLANNER_MODEL",
+    "PREFERENCES",
+    "BUDGET_CARDS",
+    "STORAGE_BACKEND",
+    "SQLITE_DB_PATH",
+    "SUBMISSION_CACHE_MAX_PROJECTS",
+    "SUBMISSION_CACHE_MAX_MB",
+    "WRITE_BEHIND_ENABLED",
+    "WRITE_BEHIND_BATCH_SIZE",
+    "WRITE_BEHIND_MAX_DELAY_MS",
+    "WRITE_BEHIND_DURABLE",
+    "AUTOCOMPLETE_CACHE_SIZE",
+    "AUTOCOMPLETE_CACHE_TTL_S",
+    "AUTOCOMPLETE_CACHE_PATH",
+    "PHOTON_MAX_CONCURRENCY",
+    "PHOTON_TIMEOUT_S",
+    "GAZETTEER_PATH",
+    "GEOCODE_CACHE_PATH",
+    "DESTINATION_CATALOG_PATH",
+    "DESTINATION_TOP_K",
+    "CHECKPOINT_DB_PATH",
+    "LLM_CACHE_ENABLED",
+    "LLM_CACHE_PATH",
+    "LLM_CACHE_MAX_ENTRIES",
+    "LLM_CACHE_TTL_S",
+    "TAVILY_CACHE_PATH",
+    "TAVILY_CACHE_TTL_S",
+    "TAVILY_CACHE_STALE_S",
+    "TAVILY_MAX_CONNECTIONS",
+    "SEARCH_RESULT_CHAR_BUDGET",
+    "SEARCH_CHUNK_CHARS",
+    "SEARCH_DEDUP_THRESHOLD",
+    "RESEARCH_MAX_BRANCHES",
+    "RESEARCH_CLUSTER_SIZE",
+    "RESEARCH_MAX_CONCURRENCY",
+    "SUPERVISOR_MAX_RESEARCH_ROUNDS",
+    "SUPERVISOR_TOKEN_BUDGET",
+    "AGENT_TOKEN_BUDGET",
+    "LLM_REQUESTS_PER_SECOND",
+    "LLM_MAX_BURST",
+    "BATCH_CONCURRENCY",
 ]
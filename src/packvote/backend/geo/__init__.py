@@ -0,0 +1,28 @@
+from .autocomplete_cache import AutocompleteCache
+from .distance import Geocoder, default_geocoder, haversine_matrix, travel_burden
+from .gazetteer import Gazetteer
+from .photon import (
+    MAX_SUGGESTIONS,
+    PHOTON_LIMIT,
+    PHOTON_URL,
+    candidates_from_features,
+    normalize_query,
+    rank_suggestions,
+)
+from .photon_client import PhotonClient
+
+__all__ = [
+    "MAX_SUGGESTIONS",
+    "PHOTON_LIMIT",
+    "PHOTON_URL",
+    "AutocompleteCache",
+    "Gazetteer",
+    "Geocoder",
+    "PhotonClient",
+    "candidates_from_features",
+    "default_geocoder",
+    "haversine_matrix",
+    "normalize_query",
+    "rank_suggestions",
+    "travel_burden",
+]
@@ -0,0 +1,177 @@
+"""Two-tier TTL cache for location autocomplete results.
+
+The memory tier is an LRU of normalized query -> place candidates; the optional
+disk tier is a small SQLite table that survives restarts. Entries also record
+how many raw features the geocoder returned: when a cached prefix came back
+with fewer than the requested limit it already holds every match, so a longer
+query is answered by filtering that entry locally.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .photon import PHOTON_LIMIT, normalize_query
+
+MIN_PREFIX_LENGTH = 2
+
+
+@dataclass(frozen=True)
+class CachedCandidates:
+    candidates: List[dict]
+    raw_count: int
+    expires_at: float
+
+    @property
+    def complete(self) -> bool:
+        """Whether the geocoder returned every match for this query."""
+        return self.raw_count < PHOTON_LIMIT
+
+
+class AutocompleteCache:
+    """LRU + TTL cache of place candidates, optionally backed by SQLite."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 86400,
+        db_path: Optional[Path] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.prefix_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedCandidates]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path is not None:
+            db_path = Path(db_path)
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS autocomplete ("
+                "query TEXT PRIMARY KEY, raw_count INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, data TEXT NOT NULL)"
+            )
+
+    # ---------- Lookup ----------
+    def get(self, query: str) -> Optional[Tuple[List[dict], str]]:
+        """Return ``(candidates, source)`` for ``query`` or None on a miss.
+
+        ``source`` is "memory", "disk" or "prefix". Prefix answers return the
+        candidates of the shorter query; callers filter them for ``query``."""
+        key = normalize_query(query)
+        prefixes = [key[:n] for n in range(len(key) - 1, MIN_PREFIX_LENGTH - 1, -1)]
+        now = time.time()
+        with self._lock:
+            entry = self._fresh(key, now)
+            if entry is not None:
+                self.hits += 1
+                return entry.candidates, "memory"
+            for prefix in prefixes:
+                entry = self._fresh(prefix, now)
+                if entry is not None and entry.complete:
+                    self.prefix_hits += 1
+                    self._put(key, entry)
+                    return entry.candidates, "prefix"
+
+        if self._db is not None:
+            found = self._load([key] + prefixes, now)
+            with self._lock:
+                for name, entry in found.items():
+                    self._put(name, entry)
+                if key in found:
+                    self.disk_hits += 1
+                    return found[key].candidates, "disk"
+                for prefix in prefixes:
+                    entry = found.get(prefix)
+                    if entry is not None and entry.complete:
+                        self.prefix_hits += 1
+                        self._put(key, entry)
+                        return entry.candidates, "prefix"
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _fresh(self, key: str, now: float) -> Optional[CachedCandidates]:
+        """Live memory entry for ``key``. Call with the lock held."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _put(self, key: str, entry: CachedCandidates) -> None:
+        """Insert into the memory tier. Call with the lock held."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, keys: List[str], now: float) -> dict:
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT query, raw_count, expires_at, data FROM autocomplete "
+                f"WHERE query IN ({placeholders}) AND expires_at > ?",
+                (*keys, now),
+            ).fetchall()
+        return {
+            query: CachedCandidates(json.loads(data), raw_count, expires_at)
+            for query, raw_count, expires_at, data in rows
+        }
+
+    # ---------- Store ----------
+    def set(self, query: str, candidates: List[dict], raw_count: int) -> None:
+        """Cache the candidates Photon returned for ``query``."""
+        key = normalize_query(query)
+        entry = CachedCandidates(candidates, raw_count, time.time() + self.ttl_seconds)
+        with self._lock:
+            self._put(key, entry)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO autocomplete "
+                        "(query, raw_count, expires_at, data) VALUES (?, ?, ?, ?)",
+                        (key, raw_count, entry.expires_at, json.dumps(candidates)),
+                    )
+
+    def purge_expired(self) -> int:
+        """Drop expired rows from the disk tier; return how many were removed."""
+        if self._db is None:
+            return 0
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "DELETE FROM autocomplete WHERE expires_at <= ?", (time.time(),)
+            )
+        return cursor.rowcount
+
+    def stats(self) -> dict:
+        """Hit/miss counters per tier and current size."""
+        with self._lock:
+            lookups = self.hits + self.prefix_hits + self.disk_hits + self.misses
+            served = lookups - self.misses
+            return {
+                "hits": self.hits,
+                "prefix_hits": self.prefix_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": served / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk": self._db is not None,
+            }
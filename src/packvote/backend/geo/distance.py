@@ -0,0 +1,236 @@
+"""Traveler-to-destination distances and travel-burden fairness metrics.
+
+Free-text locations are geocoded once through :class:`Geocoder`, which checks
+a persistent SQLite cache, then the offline gazetteer and the autocomplete
+cache (both already hold coordinates for places users picked), and only then
+asks Photon. Distances for every traveler x destination pair are one NumPy
+haversine broadcast.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+import numpy as np
+
+from src.packvote.backend import (
+    AUTOCOMPLETE_CACHE_PATH,
+    GAZETTEER_PATH,
+    GEOCODE_CACHE_PATH,
+    LOGGER,
+)
+
+from .autocomplete_cache import AutocompleteCache
+from .gazetteer import Gazetteer
+from .photon import PHOTON_URL, normalize_query
+
+EARTH_RADIUS_KM = 6371.0088
+
+LatLon = Tuple[float, float]
+
+
+def photon_geocode(location: str, timeout: float = 5.0) -> Optional[LatLon]:
+    """Resolve ``location`` with a single Photon request."""
+    response = httpx.get(
+        PHOTON_URL,
+        params={"q": location, "limit": 1, "lang": "en"},
+        headers={"User-Agent": "PackVote/1.0"},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    for feature in response.json().get("features") or []:
+        coordinates = (feature.get("geometry") or {}).get("coordinates") or []
+        if len(coordinates) >= 2:
+            lon, lat = coordinates[:2]
+            return float(lat), float(lon)
+    return None
+
+
+def _pick_candidate(candidates: Sequence[dict], location: str) -> Optional[LatLon]:
+    """Coordinates of the candidate best matching ``location``.
+
+    Only candidates whose city is the city of ``location`` qualify (a prefix
+    match such as "Augsburg" or "Austintown" for "Austin, TX" does not); among
+    those an exact display-name match wins."""
+    wanted = normalize_query(location)
+    city = normalize_query(location.split(",")[0])
+    matches = [
+        c
+        for c in candidates
+        if "lat" in c and "lon" in c and normalize_query(c.get("city") or "") == city
+    ]
+    for candidate in matches:
+        if normalize_query(candidate["display_name"]) == wanted:
+            return candidate["lat"], candidate["lon"]
+    return (matches[0]["lat"], matches[0]["lon"]) if matches else None
+
+
+class Geocoder:
+    """Free-text location -> (lat, lon), resolved once and persisted."""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        gazetteer: Optional[Gazetteer] = None,
+        autocomplete_cache: Optional[AutocompleteCache] = None,
+        fetch: Optional[Callable[[str], Optional[LatLon]]] = photon_geocode,
+    ):
+        self.gazetteer = gazetteer
+        self.autocomplete_cache = autocomplete_cache
+        self.fetch = fetch
+        self.hits = 0
+        self.misses = 0
+        self._memory: Dict[str, Optional[LatLon]] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path is not None:
+            db_path = Path(db_path)
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                "query TEXT PRIMARY KEY, lat REAL NOT NULL, lon REAL NOT NULL)"
+            )
+
+    def _lookup_local(self, location: str) -> Optional[LatLon]:
+        if self.gazetteer is not None:
+            found = _pick_candidate(self.gazetteer.candidates(location), location)
+            if found is not None:
+                return found
+            # "Austin, TX": the gazetteer indexes the city name only
+            city = location.split(",")[0]
+            found = _pick_candidate(self.gazetteer.candidates(city), location)
+            if found is not None:
+                return found
+        if self.autocomplete_cache is not None:
+            for query in (location, location.split(",")[0]):
+                cached = self.autocomplete_cache.get(query)
+                if cached is not None:
+                    found = _pick_candidate(cached[0], location)
+                    if found is not None:
+                        return found
+        return None
+
+    def geocode(self, location: str) -> Optional[LatLon]:
+        """Coordinates of ``location``, or None if it cannot be resolved."""
+        key = normalize_query(location)
+        if not key:
+            return None
+        with self._lock:
+            if key in self._memory:
+                self.hits += 1
+                return self._memory[key]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT lat, lon FROM geocode WHERE query = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self.hits += 1
+                    self._memory[key] = row
+                    return row
+            self.misses += 1
+
+        found = self._lookup_local(location)
+        if found is None and self.fetch is not None:
+            try:
+                found = self.fetch(location)
+            except (httpx.HTTPError, KeyError, IndexError, TypeError, ValueError) as e:
+                # Network errors and malformed responses alike
+                LOGGER.warning("Geocoding %r failed: %s", location, e)
+                return None  # Not cached, so it is retried next time
+
+        with self._lock:
+            self._memory[key] = found
+            if found is not None and self._db is not None:
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO geocode (query, lat, lon) "
+                        "VALUES (?, ?, ?)",
+                        (key, found[0], found[1]),
+                    )
+        return found
+
+    def geocode_many(self, locations: Sequence[str]) -> np.ndarray:
+        """(n, 2) array of lat/lon in degrees; NaN rows for unresolved places."""
+        coords = np.full((len(locations), 2), np.nan)
+        resolved: Dict[str, Optional[LatLon]] = {}
+        for idx, location in enumerate(locations):
+            if location not in resolved:
+                resolved[location] = self.geocode(location)
+            if resolved[location] is not None:
+                coords[idx] = resolved[location]
+        return coords
+
+
+def haversine_matrix(origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+    """Great-circle distances in km between (n, 2) origins and (m, 2)
+    destinations given as lat/lon degrees; returns an (n, m) matrix."""
+    lat1, lon1 = np.radians(origins[:, 0:1]), np.radians(origins[:, 1:2])
+    lat2, lon2 = np.radians(destinations[:, 0]), np.radians(destinations[:, 1])
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def travel_burden(
+    origins: Sequence[str], destinations: Sequence[str], geocoder: Geocoder
+) -> List[dict]:
+    """Per-destination distance fairness for a group of travelers.
+
+    Returns one dict per resolvable destination with the max, mean and
+    variance of traveler distance in km, sorted by mean then max distance.
+    Travelers whose origin cannot be geocoded are left out and counted.
+    """
+    origin_coords = geocoder.geocode_many(origins)
+    destination_coords = geocoder.geocode_many(destinations)
+    known_origins = ~np.isnan(origin_coords).any(axis=1)
+    known_destinations = ~np.isnan(destination_coords).any(axis=1)
+    if not known_origins.any() or not known_destinations.any():
+        return []
+
+    distances = haversine_matrix(
+        origin_coords[known_origins], destination_coords[known_destinations]
+    )
+    maxima, means, variances = (
+        distances.max(axis=0),
+        distances.mean(axis=0),
+        distances.var(axis=0),
+    )
+    names = [d for d, ok in zip(destinations, known_destinations) if ok]
+    unresolved = int((~known_origins).sum())
+    burden = [
+        {
+            "destination": name,
+            "max_km": round(float(maxima[j]), 1),
+            "mean_km": round(float(means[j]), 1),
+            "var_km2": round(float(variances[j]), 1),
+            "unresolved_origins": unresolved,
+        }
+        for j, name in enumerate(names)
+    ]
+    burden.sort(key=lambda row: (row["mean_km"], row["max_km"]))
+    return burden
+
+
+@lru_cache(maxsize=1)
+def default_geocoder() -> Geocoder:
+    """Process-wide geocoder built from the PACKVOTE_* settings.
+
+    It reuses the offline gazetteer and the autocomplete cache's disk tier
+    when those are configured."""
+    return Geocoder(
+        db_path=Path(GEOCODE_CACHE_PATH),
+        gazetteer=Gazetteer.from_tsv(Path(GAZETTEER_PATH)) if GAZETTEER_PATH else None,
+        autocomplete_cache=(
+            AutocompleteCache(db_path=Path(AUTOCOMPLETE_CACHE_PATH))
+            if AUTOCOMPLETE_CACHE_PATH
+            else None
+        ),
+    )
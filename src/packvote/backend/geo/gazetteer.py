@@ -0,0 +1,235 @@
+"""Offline gazetteer used as the local location-autocomplete engine.
+
+Places are loaded from a GeoNames-style TSV with the columns::
+
+    name <TAB> admin1 code <TAB> country code <TAB> population [<TAB> lat <TAB> lon]
+
+Lines starting with ``#`` are ignored. The index is two sorted arrays of
+lower-cased keys: one over full names (prefix matches) and one over the start
+of every later word in a name (so "york" finds "New York", the local
+equivalent of the handler's contains match). A query is two binary searches;
+matches are ranked prefix-over-contains, then by population. A narrow matching
+range is ranked directly; a wide one (short prefixes) is answered by walking
+the places in population order until enough fall inside the range, which
+takes about ``limit * N / range`` steps.
+
+Run ``python -m src.packvote.backend.geo.gazetteer [places.tsv]`` for a
+lookup benchmark (a synthetic 300k-place table is used without a file).
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+import string
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .photon import MAX_SUGGESTIONS, normalize_query
+
+# Matching ranges wider than this are ranked by walking the population order
+WIDE_RANGE = 2048
+
+
+class Gazetteer:
+    """In-memory place index with prefix and word-start lookups."""
+
+    def __init__(
+        self,
+        places: Iterable[Tuple[str, str, str, int, Optional[float], Optional[float]]],
+    ):
+        self.names: List[str] = []
+        self.admin1: List[str] = []
+        self.countries: List[str] = []
+        self.populations = array("q")
+        self.coords: Dict[int, Tuple[float, float]] = {}
+
+        name_keys: List[Tuple[str, int]] = []
+        word_keys: List[Tuple[str, int]] = []
+        for idx, (name, admin1, country, population, lat, lon) in enumerate(places):
+            self.names.append(name)
+            self.admin1.append(admin1)
+            self.countries.append(country)
+            self.populations.append(population)
+            if lat is not None and lon is not None:
+                self.coords[idx] = (lat, lon)
+            key = normalize_query(name)
+            name_keys.append((key, idx))
+            # Start of every later word, e.g. "york" for "new york"
+            for pos, char in enumerate(key):
+                if char == " " and pos + 1 < len(key):
+                    word_keys.append((key[pos + 1 :], idx))
+
+        self._name_keys, self._name_ids, self._name_by_pop = self._build(name_keys)
+        self._word_keys, self._word_ids, self._word_by_pop = self._build(word_keys)
+
+    def _build(self, entries: List[Tuple[str, int]]) -> Tuple[List[str], array, array]:
+        """Sorted keys, their place ids, and key positions by descending population."""
+        entries.sort()
+        keys = [key for key, _ in entries]
+        ids = array("i", (idx for _, idx in entries))
+        # Shuffle before the stable sort so places with equal population (often
+        # 0 in GeoNames) are spread out rather than grouped by key order
+        positions = list(range(len(ids)))
+        random.Random(0).shuffle(positions)
+        positions.sort(key=lambda pos: self.populations[ids[pos]], reverse=True)
+        by_population = array("i", positions)
+        return keys, ids, by_population
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_tsv(cls, path: Path) -> "Gazetteer":
+        """Load places from a GeoNames-style TSV file."""
+        return cls(_read_tsv(Path(path)))
+
+    # ---------- Lookup ----------
+    def _range(self, keys: List[str], prefix: str) -> Tuple[int, int]:
+        lo = bisect_left(keys, prefix)
+        hi = bisect_left(keys, prefix + "\U0010ffff", lo)
+        return lo, hi
+
+    def _top(
+        self, keys: List[str], ids: array, by_population: array, prefix: str, limit: int
+    ) -> List[int]:
+        lo, hi = self._range(keys, prefix)
+        if hi - lo <= WIDE_RANGE:
+            return heapq.nlargest(limit, ids[lo:hi], key=self.populations.__getitem__)
+        top = []
+        for pos in by_population:
+            if lo <= pos < hi:
+                top.append(ids[pos])
+                if len(top) == limit:
+                    break
+        return top
+
+    def search(self, query: str, limit: int = MAX_SUGGESTIONS) -> List[int]:
+        """Indices of the best places for ``query``: prefix matches first,
+        then word-start matches, each by descending population."""
+        prefix = normalize_query(query)
+        if not prefix:
+            return []
+        result = self._top(
+            self._name_keys, self._name_ids, self._name_by_pop, prefix, limit
+        )
+        # Contains matches need at least 3 characters, as in the Photon path
+        if len(result) < limit and len(prefix) >= 3:
+            seen = set(result)
+            for idx in self._top(
+                self._word_keys, self._word_ids, self._word_by_pop, prefix, limit * 2
+            ):
+                if idx not in seen:
+                    seen.add(idx)
+                    result.append(idx)
+                    if len(result) == limit:
+                        break
+        return result
+
+    def candidate(self, idx: int) -> dict:
+        """Place ``idx`` in the candidate format of :func:`candidates_from_features`."""
+        name = self.names[idx]
+        admin1 = self.admin1[idx]
+        country = self.countries[idx]
+        # Prioritize US format (City, State)
+        if country == "US" and admin1:
+            display_name = f"{name}, {admin1}"
+        elif country:
+            display_name = f"{name}, {country}"
+        else:
+            display_name = name
+        candidate = {"display_name": display_name, "full_name": name, "city": name}
+        if idx in self.coords:
+            candidate["lat"], candidate["lon"] = self.coords[idx]
+        return candidate
+
+    def candidates(self, query: str, limit: int = MAX_SUGGESTIONS) -> List[dict]:
+        """Ranked place candidates for ``query``, de-duplicated by display name."""
+        candidates = []
+        seen = set()
+        for idx in self.search(query, limit * 2):
+            candidate = self.candidate(idx)
+            key = candidate["display_name"].lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            candidates.append(candidate)
+            if len(candidates) == limit:
+                break
+        return candidates
+
+
+def _read_tsv(
+    path: Path,
+) -> Iterable[Tuple[str, str, str, int, Optional[float], Optional[float]]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 4:
+                continue
+            name, admin1, country, population = fields[:4]
+            try:
+                population = int(population or 0)
+            except ValueError:
+                continue  # Header row or malformed line
+            lat = lon = None
+            if len(fields) >= 6 and fields[4] and fields[5]:
+                lat, lon = float(fields[4]), float(fields[5])
+            yield name, admin1, country.upper(), population, lat, lon
+
+
+def _synthetic_places(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    syllables = ["an", "ber", "ca", "do", "el", "fa", "gro", "ha", "is", "ju",
+                 "ka", "lo", "ma", "no", "or", "pa", "qui", "ro", "sa", "ton",
+                 "u", "vil", "wa", "xe", "york", "za"]  # fmt: skip
+    for _ in range(count):
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        if rng.random() < 0.2:
+            name = f"{rng.choice(['new', 'san', 'port', 'lake'])} {name}"
+        yield (
+            name.title(),
+            rng.choice(string.ascii_uppercase) * 2,
+            rng.choice(["US", "CA", "GB", "DE", "FR", "IN"]),
+            int(rng.paretovariate(1.2) * 1000),
+            None,
+            None,
+        )
+
+
+def _benchmark(path: Optional[str] = None, lookups: int = 20000) -> None:
+    start = time.perf_counter()
+    if path:
+        gazetteer = Gazetteer.from_tsv(Path(path))
+    else:
+        gazetteer = Gazetteer(_synthetic_places(300_000))
+    print(f"indexed {len(gazetteer):,} places in {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(11)
+    queries = []
+    for _ in range(lookups):
+        name = normalize_query(gazetteer.names[rng.randrange(len(gazetteer))])
+        queries.append(name[: rng.randint(2, max(2, min(len(name), 8)))])
+
+    timings = []
+    for query in queries:
+        t0 = time.perf_counter()
+        gazetteer.candidates(query)
+        timings.append(time.perf_counter() - t0)
+    timings.sort()
+    p50 = timings[len(timings) // 2] * 1e6
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+    print(
+        f"{lookups:,} lookups: p50 {p50:.1f} us, p99 {p99:.1f} us, "
+        f"max {timings[-1] * 1e6:.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    _benchmark(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,128 @@
+"""Parsing and ranking of Photon geocoder results for location autocomplete."""
+
+from __future__ import annotations
+
+from typing import Iterable, List
+
+PHOTON_URL = "https://photon.komoot.io/api"
+# Features requested per query; fewer means Photon returned every match it has
+PHOTON_LIMIT = 8
+MAX_SUGGESTIONS = 5
+
+VALID_TYPES = ("city", "town", "village", "municipality", "administrative")
+
+
+def normalize_query(query: str) -> str:
+    """Cache key for a query: lower-cased with collapsed whitespace."""
+    return " ".join(query.lower().split())
+
+
+def candidates_from_features(features: Iterable[dict]) -> List[dict]:
+    """Turn Photon features into de-duplicated place candidates.
+
+    The result does not depend on the query, so it can be cached and filtered
+    again for longer queries. Each candidate has ``display_name``,
+    ``full_name``, ``city`` and, when Photon provides them, ``lat``/``lon``.
+    """
+    candidates = []
+    seen_locations = set()  # Avoid duplicates
+
+    for feature in features:
+        properties = feature.get("properties", {})
+
+        # Get location type - prioritize cities, towns, villages
+        location_type = properties.get("type", "").lower()
+        osm_value = properties.get("osm_value", "").lower()
+
+        # Filter to only include populated places
+        if location_type not in VALID_TYPES and osm_value not in VALID_TYPES:
+            # Check if it's a place with a name (might be a city)
+            if not properties.get("name"):
+                continue
+            # Allow if it has city/town-like properties
+            if location_type not in (
+                "place",
+                "administrative",
+            ) and osm_value not in ("place", "administrative"):
+                continue
+
+        # Get city/town name
+        city = (
+            properties.get("city")
+            or properties.get("name")
+            or properties.get("town")
+            or properties.get("village")
+        )
+
+        if not city:
+            continue
+
+        # Get state and country
+        state = (
+            properties.get("state")
+            or properties.get("state_code")
+            or properties.get("region")
+        )
+        country = properties.get("country", "")
+        country_code = properties.get("countrycode", "").upper()
+
+        # Format display name - prioritize US format (City, State)
+        if state and (country == "United States" or country_code == "US"):
+            # For US, prefer state code if available
+            state_code = properties.get("state_code", "")
+            if state_code and len(state_code) == 2:
+                display_name = f"{city}, {state_code}"
+            elif state and len(state) <= 2:
+                display_name = f"{city}, {state.upper()}"
+            else:
+                display_name = f"{city}, {state}"
+        elif state:
+            display_name = f"{city}, {state}"
+        elif country:
+            display_name = f"{city}, {country}"
+        else:
+            display_name = city
+
+        # Create a unique key to avoid duplicates
+        location_key = display_name.lower()
+        if location_key in seen_locations:
+            continue
+        seen_locations.add(location_key)
+
+        candidate = {
+            "display_name": display_name,
+            "full_name": properties.get("name", ""),
+            "city": city,
+        }
+        coordinates = (feature.get("geometry") or {}).get("coordinates")
+        if coordinates and len(coordinates) >= 2:
+            candidate["lon"], candidate["lat"] = coordinates[0], coordinates[1]
+        candidates.append(candidate)
+
+    return candidates
+
+
+def rank_suggestions(candidates: Iterable[dict], query: str) -> List[dict]:
+    """Filter candidates by ``query`` and return the top suggestions."""
+    query_lower = query.lower().strip()
+    suggestions = []
+    for candidate in candidates:
+        city_lower = candidate["city"].lower().strip()
+
+        # Only include results where the city name starts with the query
+        # This ensures "austi" matches "Austin" but not "Haparanda kommun"
+        if city_lower.startswith(query_lower):
+            priority = 2  # Highest priority for prefix matches
+        elif len(query_lower) >= 3 and query_lower in city_lower:
+            priority = 1  # Lower priority for contains matches
+        else:
+            continue  # Skip if it doesn't match at all
+
+        suggestions.append((priority, candidate))
+
+    # Sort by priority (prefix matches first), then limit
+    suggestions.sort(key=lambda x: -x[0])
+    return [
+        {"display_name": c["display_name"], "full_name": c["full_name"]}
+        for _, c in suggestions[:MAX_SUGGESTIONS]
+    ]
@@ -0,0 +1,118 @@
+"""Shared, rate-capped Photon client with single-flight request coalescing.
+
+One ``httpx.AsyncClient`` (keep-alive, HTTP/2 when ``h2`` is installed) is
+reused for every lookup. Concurrent lookups of the same normalized query share
+one upstream request, and a semaphore caps the number of requests in flight
+so bursts stay within Photon's fair-use policy.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from .autocomplete_cache import AutocompleteCache
+from .photon import PHOTON_LIMIT, PHOTON_URL, candidates_from_features, normalize_query
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class PhotonClient:
+    """Photon lookups through one pooled client, coalesced per query."""
+
+    def __init__(
+        self,
+        cache: Optional[AutocompleteCache] = None,
+        max_concurrency: int = 4,
+        timeout: float = 5.0,
+    ):
+        self.cache = cache
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.requests = 0
+        self.coalesced = 0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def start(self) -> None:
+        """Open the pooled client (called from the app lifespan)."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                headers={"User-Agent": "PackVote/1.0"},
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def aclose(self) -> None:
+        """Close the pooled client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def lookup(self, query: str) -> List[dict]:
+        """Return place candidates for ``query``, sharing concurrent requests.
+
+        The coalesced result is stored in the cache (when one is configured)
+        once, by the request that went upstream.
+
+        Raises:
+            httpx.HTTPError: If the upstream request fails.
+        """
+        key = normalize_query(query)
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            candidates, raw_count = await self._fetch(query)
+            if self.cache is not None:
+                self.cache.set(query, candidates, raw_count)
+            future.set_result(candidates)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Followers receive the exception; retrieve it so it is not logged
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+        return candidates
+
+    async def _fetch(self, query: str) -> Tuple[List[dict], int]:
+        await self.start()
+        params = {
+            "q": query,
+            "limit": PHOTON_LIMIT,  # Get more results to filter better
+            "lang": "en",
+        }
+        async with self._semaphore:
+            self.requests += 1
+            response = await self._client.get(PHOTON_URL, params=params)
+            response.raise_for_status()
+            data = response.json()
+        features = data.get("features", [])
+        return candidates_from_features(features), len(features)
+
+    def stats(self) -> dict:
+        """Upstream request and coalescing counters."""
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "max_concurrency": self.max_concurrency,
+            "http2": HTTP2_AVAILABLE,
+        }
@@ -4,12 +4,24 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from langgraph.types import Command
 
+from src.packvote.backend.storage.llm_cache import default_llm_cache
 from src.packvote.backend.utils.langgraph_elements import BinaryEvaluation, State
-from src.packvote.backend.utils.prompt_formatters import format_user_surveys
+from src.packvote.backend.utils.prompt_formatters import (
+    format_group_consensus,
+    format_travel_windows,
+    format_trip_dates,
+    format_user_surveys,
+)
+from src.packvote.backend.utils.rate_limit import default_rate_limiter
 from src.packvote.backend.utils.state_helpers import get_latest_itinerary
 
 GRADER_MODEL = "gpt-4o-mini"
-grader_llm = ChatOpenAI(model=GRADER_MODEL, temperature=0)
+grader_llm = ChatOpenAI(
+    model=GRADER_MODEL,
+    temperature=0,
+    cache=default_llm_cache(),
+    rate_limiter=default_rate_limiter(),
+)
 binary_grader = grader_llm.with_structured_output(BinaryEvaluation)
 
 
@@ -31,10 +43,24 @@ def evaluator_node(state: State) -> Command[Literal["supervisor"]]:
             goto="supervisor",
         )
 
-    user_surveys = state.get("user_surveys") or []
     travel_date = state.get("travel_date") or ""
     travel_duration = state.get("travel_duration") or 0
-    survey_summary = format_user_surveys(user_surveys, travel_date, travel_duration)
+    consensus = state.get("group_consensus")
+    if consensus is not None:
+        # The consensus has no dates; keep the trip window for the grader
+        sections = [format_group_consensus(consensus)]
+        trip_dates = format_trip_dates(travel_date, travel_duration)
+        if trip_dates:
+            sections.append(trip_dates)
+        travel_windows = state.get("travel_windows")
+        if travel_windows:
+            sections.append(
+                "Best travel windows:\n" + format_travel_windows(travel_windows[:3])
+            )
+        survey_summary = "\n".join(sections)
+    else:
+        user_surveys = state.get("user_surveys") or []
+        survey_summary = format_user_surveys(user_surveys, travel_date, travel_duration)
 
     structured_evaluation = binary_grader.invoke(
         [
@@ -0,0 +1,246 @@
+"""Map-reduce research over destinations and preference clusters.
+
+``plan_research_node`` fans out one ``research_branch`` per (destination,
+preference cluster) pair with LangGraph's ``Send``; the branches run in the
+same super-step, so their LLM and search calls overlap (bounded by the
+``max_concurrency`` of the run config). ``merge_research_node`` runs once all
+branches finished and hands the combined findings to the supervisor.
+"""
+
+import calendar
+import os
+import re
+from typing import List, Literal, Sequence, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.types import Command, Send
+
+from src.packvote.backend import (
+    DESTINATION_CATALOG_PATH,
+    RESEARCH_CLUSTER_SIZE,
+    RESEARCH_MAX_BRANCHES,
+)
+from src.packvote.backend.nodes.researcher import search_agent
+from src.packvote.backend.tools.result_filter import focus_on
+from src.packvote.backend.utils.destination_ranking import load_catalog
+from src.packvote.backend.utils.langgraph_elements import State
+from src.packvote.backend.utils.prompt_formatters import (
+    format_group_consensus,
+    format_research_findings,
+)
+
+# Trailing words a request often leaves off ("New York City" -> "New York")
+GENERIC_SUFFIXES = frozenset({"city", "town", "island", "islands"})
+
+# Capitalized words after "to", "in", ... that are dates rather than places
+NOT_PLACES = frozenset(
+    name.lower() for name in [*calendar.month_name[1:], *calendar.day_name]
+) | {"spring", "summer", "fall", "autumn", "winter"}
+
+_PLACE_PHRASE = re.compile(
+    r"\b(?i:to|in|visit|visiting|around|near)\s+([A-Z][\w'-]*(?:\s+[A-Z][\w'-]*)*)"
+)
+
+
+def preference_clusters(
+    preference_votes: dict, cluster_size: int = RESEARCH_CLUSTER_SIZE
+) -> List[List[str]]:
+    """Group the voted preferences, most popular first, into clusters."""
+    ranked = list(preference_votes)
+    return [
+        ranked[idx : idx + cluster_size] for idx in range(0, len(ranked), cluster_size)
+    ]
+
+
+def _primary_name(destination: str) -> str:
+    """ "Tokyo, Japan" -> "tokyo"; "Costa Rica (Guanacaste)" -> "costa rica"."""
+    primary = re.sub(r"\s*\([^)]*\)", "", destination.split(",")[0])
+    return " ".join(primary.lower().split())
+
+
+def _aliases(destination: str) -> List[str]:
+    """ "New York City, NY" -> ["new york city", "new york"];
+    "Costa Rica (Guanacaste)" -> ["costa rica", "guanacaste"]."""
+    primary = _primary_name(destination)
+    aliases = [primary] if primary else []
+    words = primary.split()
+    if len(words) > 1 and words[-1] in GENERIC_SUFFIXES:
+        aliases.append(" ".join(words[:-1]))
+    aliases += [
+        " ".join(inner.lower().split())
+        for inner in re.findall(r"\(([^)]*)\)", destination)
+        if inner.strip()
+    ]
+    return aliases
+
+
+def named_destinations(request: str, names: Sequence[str]) -> List[str]:
+    """The ``names`` mentioned in ``request`` by name or alias, matched on
+    word boundaries."""
+    return [
+        name
+        for name in names
+        if any(
+            re.search(rf"\b{re.escape(alias)}\b", request, flags=re.IGNORECASE)
+            for alias in _aliases(name)
+        )
+    ]
+
+
+def unknown_places(request: str, names: Sequence[str]) -> List[str]:
+    """Places the request points at ("a trip to Kyoto") that match none of
+    ``names``."""
+    return [
+        phrase
+        for phrase in _PLACE_PHRASE.findall(request)
+        if phrase.lower() not in NOT_PLACES and not named_destinations(phrase, names)
+    ]
+
+
+def _catalog_names() -> List[str]:
+    if not DESTINATION_CATALOG_PATH or not os.path.exists(DESTINATION_CATALOG_PATH):
+        return []
+    return [entry["name"] for entry in load_catalog(DESTINATION_CATALOG_PATH)]
+
+
+def _unique(names: Sequence[str]) -> List[str]:
+    seen, unique = set(), []
+    for name in names:
+        key = _primary_name(name)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(name)
+    return unique
+
+
+def _destinations(state: State, request: str) -> Tuple[List[str], int]:
+    """Destinations to research, required ones first, and how many are
+    required.
+
+    Destinations the user names in the request, looked up against the whole
+    catalog and not just the shortlist, replace the shortlist. A place the
+    request names that is not known at all leaves nothing to fan out over,
+    so the request goes to the single research agent as written.
+    Destinations from the surveys are always researched, ahead of the
+    shortlist."""
+    shortlist = [
+        row["destination"] for row in state.get("destination_candidates") or []
+    ]
+    shortlist += [row["destination"] for row in state.get("travel_burden") or []]
+    surveyed = list(state.get("requested_destinations") or [])
+    known = _unique(shortlist + surveyed + _catalog_names())
+    if unknown_places(request, known):
+        return [], 0
+    named = named_destinations(request, known)
+    if named:
+        return named, len(named)
+    required = _unique(surveyed)
+    return _unique(required + shortlist), len(required)
+
+
+def _latest_request(state: State) -> str:
+    for message in reversed(state["messages"]):
+        if getattr(message, "type", None) == "human" and not message.name:
+            return message.content
+    return ""
+
+
+def research_branches(state: State) -> List[dict]:
+    """Branch payloads, interleaved so every destination gets its most
+    popular cluster before any destination gets a second one."""
+    request = _latest_request(state)
+    destinations, required = _destinations(state, request)
+    consensus = state.get("group_consensus")
+    if not destinations or consensus is None or not consensus.preference_votes:
+        return []
+    context = format_group_consensus(consensus)
+    clusters = preference_clusters(consensus.preference_votes)
+    branches = [
+        {
+            "destination": destination,
+            "preferences": cluster,
+            "request": request,
+            "context": context,
+            "travel_duration": state.get("travel_duration"),
+        }
+        for cluster in clusters
+        for destination in destinations
+    ]
+    # Every required destination gets at least its most popular cluster
+    return branches[: max(RESEARCH_MAX_BRANCHES, required)]
+
+
+def plan_research_node(
+    state: State,
+) -> Command[Literal["research_branch", "search_activity"]]:
+    """Fan out research branches, or fall back to the single research agent
+    when there are no destinations or interests to split the work by."""
+    branches = research_branches(state)
+    if not branches:
+        return Command(goto="search_activity")
+    return Command(
+        update={"research_findings": None},  # Start this round from scratch
+        goto=[Send("research_branch", branch) for branch in branches],
+    )
+
+
+def _branch_messages(branch: dict) -> dict:
+    duration = branch.get("travel_duration")
+    trip = f"a {duration} day trip" if duration else "a group trip"
+    return {
+        "messages": [
+            SystemMessage(content="Group consensus:\n" + branch["context"]),
+            HumanMessage(
+                content=(
+                    f"User request: {branch['request']}\n\n"
+                    f"Research {trip} to {branch['destination']} focused on: "
+                    f"{', '.join(branch['preferences'])}. List concrete "
+                    "activities, areas and typical costs per person that fit "
+                    "the shared budget."
+                )
+            ),
+        ]
+    }
+
+
+def _branch_update(branch: dict, response: dict) -> dict:
+    return {
+        "research_findings": [
+            {
+                "destination": branch["destination"],
+                "preferences": list(branch["preferences"]),
+                "summary": response["messages"][-1].content,
+            }
+        ]
+    }
+
+
+def research_branch_node(branch: dict) -> dict:
+    """Research one destination for one cluster of the group's interests."""
+    with focus_on(branch["preferences"]):
+        response = search_agent.invoke(_branch_messages(branch))
+    return _branch_update(branch, response)
+
+
+async def aresearch_branch_node(branch: dict) -> dict:
+    """Research one destination for one cluster of the group's interests (async)."""
+    with focus_on(branch["preferences"]):
+        response = await search_agent.ainvoke(_branch_messages(branch))
+    return _branch_update(branch, response)
+
+
+def merge_research_node(state: State) -> Command[Literal["supervisor"]]:
+    """Combine the branch findings into one message for the supervisor."""
+    return Command(
+        update={
+            "messages": [
+                HumanMessage(
+                    content=format_research_findings(
+                        state.get("research_findings") or []
+                    ),
+                    name="search_activity",
+                )
+            ],
+        },
+        goto="supervisor",
+    )
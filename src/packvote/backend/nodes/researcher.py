@@ -5,23 +5,39 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from langgraph.types import Command
 
-from src.packvote.backend import ITINERARY_PLANNER_MODEL
+from src.packvote.backend import AGENT_TOKEN_BUDGET, ITINERARY_PLANNER_MODEL
+from src.packvote.backend.storage.llm_cache import default_llm_cache
+from src.packvote.backend.tools.result_filter import focus_on
 from src.packvote.backend.tools.search import search_tavily
+from src.packvote.backend.utils.compaction import (
+    CompactionMiddleware,
+    compact_messages,
+    record,
+)
 from src.packvote.backend.utils.langgraph_elements import State
+from src.packvote.backend.utils.prompt_formatters import (
+    format_destination_candidates,
+    format_group_consensus,
+)
+from src.packvote.backend.utils.rate_limit import default_rate_limiter
 
 planner_llm = ChatOpenAI(
     model=ITINERARY_PLANNER_MODEL,
     temperature=0.1,
     max_tokens=500,
+    cache=default_llm_cache(),
+    rate_limiter=default_rate_limiter(),
 )
 
 search_agent = create_agent(
     model=planner_llm,
     tools=[search_tavily],
+    # Raw search payloads grow the agent's own loop; compact each model call
+    middleware=[CompactionMiddleware(AGENT_TOKEN_BUDGET, node="search_agent")],
 )
 
 
-def search_activity_node(state: State) -> Command[Literal["supervisor"]]:
+def _agent_messages(state: State) -> list:
     # travel_date = state.get("travel_date")
     # travel_duration = state.get("travel_duration")
     # user_surveys = state.get("user_surveys") or []
@@ -34,8 +50,41 @@ def search_activity_node(state: State) -> Command[Literal["supervisor"]]:
     #     travel_duration,
     # )
 
-    response = search_agent.invoke(state)
+    # Give the agent the precomputed group summary instead of raw surveys
+    messages, report = compact_messages(
+        state["messages"],
+        AGENT_TOKEN_BUDGET,
+        latest_itinerary=state.get("latest_itinerary"),
+    )
+    record("search_activity", report)
+    consensus = state.get("group_consensus")
+    if consensus is not None:
+        messages.insert(
+            0,
+            SystemMessage(
+                content="Group consensus:\n" + format_group_consensus(consensus)
+            ),
+        )
+    # Research only the pre-ranked shortlist instead of open-ended exploration
+    candidates = state.get("destination_candidates")
+    if candidates:
+        messages.insert(
+            0,
+            SystemMessage(
+                content="Candidate destinations, best first. Unless the user named "
+                "a destination, research only these:\n"
+                + format_destination_candidates(candidates)
+            ),
+        )
+    return messages
+
+
+def _focus(state: State) -> list:
+    consensus = state.get("group_consensus")
+    return list(consensus.preference_votes) if consensus is not None else []
 
+
+def _activity_command(response: dict) -> Command[Literal["supervisor"]]:
     return Command(
         update={
             "messages": [
@@ -49,6 +98,12 @@ def search_activity_node(state: State) -> Command[Literal["supervisor"]]:
         goto="supervisor",
     )
 
+
+def search_activity_node(state: State) -> Command[Literal["supervisor"]]:
+    with focus_on(_focus(state)):
+        response = search_agent.invoke({"messages": _agent_messages(state)})
+    return _activity_command(response)
+
     response = search_agent.invoke(
         [
             SystemMessage(
@@ -90,5 +145,11 @@ def search_activity_node(state: State) -> Command[Literal["supervisor"]]:
     )
 
 
+async def asearch_activity_node(state: State) -> Command[Literal["supervisor"]]:
+    with focus_on(_focus(state)):
+        response = await search_agent.ainvoke({"messages": _agent_messages(state)})
+    return _activity_command(response)
+
+
 # Backwards compatibility with earlier graph wiring
 search_node = search_activity_node
@@ -1,20 +1,80 @@
+import asyncio
+import os
 from typing import Literal
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.types import Command
 
-from src.packvote.backend.pipelines.get_user_prefs import get_user_prefs
+from src.packvote.backend import DESTINATION_CATALOG_PATH, DESTINATION_TOP_K
+from src.packvote.backend.geo import default_geocoder, travel_burden
+from src.packvote.backend.pipelines.get_user_prefs import (
+    get_user_prefs,
+    parse_user_prefs,
+)
+from src.packvote.backend.utils.consensus import compute_group_consensus
+from src.packvote.backend.utils.destination_ranking import (
+    load_catalog,
+    rank_destinations,
+)
 from src.packvote.backend.utils.langgraph_elements import State
+from src.packvote.backend.utils.overlapping_dates import best_windows
 
+USER_SURVEY_FILE_PATH = (
+    "src/packvote/backend/artifacts/model_inputs/user_surveys/final_submissions.json"
+)
 
-def retrieve_node(state: State) -> Command[Literal["supervisor"]]:
-    user_surveys = get_user_prefs(
-        user_survey_file_path="src/packvote/backend/artifacts/model_inputs/user_surveys/final_submissions.json"
-    )
+
+def retrieve_node(
+    state: State, config: RunnableConfig
+) -> Command[Literal["supervisor"]]:
+    # Batch runs pass each project's surveys in the run config
+    survey_input = config.get("configurable", {}).get("user_survey_input")
+    if survey_input is not None:
+        user_surveys = parse_user_prefs(survey_input)
+    else:
+        user_surveys = get_user_prefs(user_survey_file_path=USER_SURVEY_FILE_PATH)
+    # Rank the trip-length windows by attendance when travelers gave their own
+    travel_windows = None
+    if user_surveys["availability"] and user_surveys["travel_duration"]:
+        travel_windows = best_windows(
+            user_surveys["availability"], int(user_surveys["travel_duration"])
+        )
+    # Travel distance fairness for candidate destinations, when provided
+    travel_burden_rows = None
+    if user_surveys["destinations"]:
+        travel_burden_rows = travel_burden(
+            [survey.current_location for survey in user_surveys["user_surveys"]],
+            user_surveys["destinations"],
+            default_geocoder(),
+        )
+    # Pre-rank the local destination catalog so research starts from a shortlist
+    destination_candidates = None
+    if DESTINATION_CATALOG_PATH and os.path.exists(DESTINATION_CATALOG_PATH):
+        destination_candidates = rank_destinations(
+            user_surveys["user_surveys"],
+            load_catalog(DESTINATION_CATALOG_PATH),
+            default_geocoder(),
+            top_k=DESTINATION_TOP_K,
+        )
     return Command(
         update={
             "user_surveys": user_surveys["user_surveys"],
+            "group_consensus": compute_group_consensus(user_surveys["user_surveys"]),
             "travel_date": user_surveys["travel_date"],
             "travel_duration": user_surveys["travel_duration"],
+            "travel_windows": travel_windows,
+            "travel_burden": travel_burden_rows,
+            "destination_candidates": destination_candidates,
+            "requested_destinations": user_surveys["destinations"] or None,
         },
         goto="supervisor",
     )
+
+
+async def aretrieve_node(
+    state: State, config: RunnableConfig
+) -> Command[Literal["supervisor"]]:
+    """``retrieve_node`` on a worker thread: survey file reads, geocoding
+    (Photon requests on a cold cache) and ranking would otherwise block the
+    event loop every concurrent project shares."""
+    return await asyncio.to_thread(retrieve_node, state, config)
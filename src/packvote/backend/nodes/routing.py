@@ -0,0 +1,89 @@
+"""Deterministic routing rules evaluated before the supervisor's LLM router.
+
+A rule is a named predicate over ``State`` plus a target: a worker name, the
+placeholder ``WORKER`` (the supervisor's first member) or ``"FINISH"``. Rules
+are checked in order and the first match decides the next hop without a model
+call; only when none matches does the supervisor ask the LLM.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+from src.packvote.backend import LOGGER, SUPERVISOR_MAX_RESEARCH_ROUNDS
+from src.packvote.backend.utils.langgraph_elements import State
+
+# Target meaning "the supervisor's default worker"
+WORKER = "<worker>"
+# Message names written by research workers
+WORKER_MESSAGE_NAMES = frozenset({"search_activity", "itinerary_researcher"})
+
+
+@dataclass(frozen=True)
+class RoutingRule:
+    name: str
+    predicate: Callable[[State], bool]
+    target: str
+
+
+def _current_turn(state: State) -> list:
+    """Messages after the latest user message (the one that started the turn)."""
+    messages = state.get("messages") or []
+    for idx in range(len(messages) - 1, -1, -1):
+        message = messages[idx]
+        if getattr(message, "type", None) == "human" and not message.name:
+            return messages[idx + 1 :]
+    return list(messages)
+
+
+def research_rounds(state: State) -> int:
+    """Worker results received since the latest user message."""
+    return sum(
+        1
+        for message in _current_turn(state)
+        if getattr(message, "name", None) in WORKER_MESSAGE_NAMES
+    )
+
+
+DEFAULT_RULES = (
+    RoutingRule(
+        "step_budget_exhausted",
+        lambda state: research_rounds(state) >= SUPERVISOR_MAX_RESEARCH_ROUNDS,
+        "FINISH",
+    ),
+    RoutingRule("research_missing", lambda state: research_rounds(state) == 0, WORKER),
+)
+
+
+class RuleRouter:
+    """First matching rule wins; counts how often each path is taken."""
+
+    def __init__(self, members: Sequence[str], rules: Sequence[RoutingRule]):
+        self.members = list(members)
+        self.rules = list(rules)
+        self.counts: Counter = Counter()
+
+    def route(self, state: State) -> Optional[str]:
+        """Next hop ("FINISH" or a member) from the rules, or None."""
+        for rule in self.rules:
+            if rule.predicate(state):
+                self.counts[rule.name] += 1
+                LOGGER.debug("Supervisor rule %s -> %s", rule.name, rule.target)
+                return self.members[0] if rule.target == WORKER else rule.target
+        return None
+
+    def record_llm(self) -> None:
+        self.counts["llm"] += 1
+
+    def stats(self) -> dict:
+        """Hops per rule and via the LLM, plus the share decided by rules."""
+        total = sum(self.counts.values())
+        return {
+            "hops": total,
+            "by_path": dict(self.counts),
+            "rule_share": (
+                round((total - self.counts["llm"]) / total, 3) if total else 0.0
+            ),
+        }
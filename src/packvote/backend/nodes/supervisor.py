@@ -1,18 +1,36 @@
-from typing import Callable, Literal, TypedDict
+from typing import Callable, Literal, Optional, Sequence, TypedDict
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from langgraph.graph import END
 from langgraph.types import Command
 
+from src.packvote.backend import SUPERVISOR_TOKEN_BUDGET
+from src.packvote.backend.nodes.routing import DEFAULT_RULES, RoutingRule, RuleRouter
+from src.packvote.backend.utils.compaction import compact_messages, record
 from src.packvote.backend.utils.langgraph_elements import State
+from src.packvote.backend.utils.prompt_formatters import (
+    format_destination_candidates,
+    format_group_consensus,
+    format_travel_burden,
+    format_travel_windows,
+)
 
 
 def make_supervisor_node(
     llm: BaseChatModel,
     members: list[str],
+    asynchronous: bool = False,
+    rules: Optional[Sequence[RoutingRule]] = DEFAULT_RULES,
     # ) -> Callable[[State], Command[Literal[*members, "__end__"]]]:
 ) -> Callable[[State], Command[str]]:
-    """A deterministic research supervisor orchestrating workers."""
+    """A deterministic research supervisor orchestrating workers.
+
+    ``rules`` are checked first and decide the hop without a model call when
+    one matches; the LLM router is the fallback. The node's ``routing_stats``
+    reports how often each path was taken.
+
+    With ``asynchronous=True`` the node is a coroutine that calls the model
+    with ``ainvoke``, for graphs run with ``ainvoke``/``astream``."""
 
     options = ["FINISH"] + members
 
@@ -28,16 +46,83 @@ def make_supervisor_node(
 
         next: Literal[*options]
 
-    def supervisor_node(state: State) -> Command[Literal[*members, "__end__"]]:
-        """An LLM-based router."""
+    def router_messages(state: State) -> list:
         messages = [
             {"role": "system", "content": system_prompt},
-        ] + state["messages"]
-        response = llm.with_structured_output(Router).invoke(messages)
+        ]
+        consensus = state.get("group_consensus")
+        if consensus is not None:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": "Group consensus:\n" + format_group_consensus(consensus),
+                }
+            )
+        travel_windows = state.get("travel_windows")
+        if travel_windows:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": "Best travel windows:\n"
+                    + format_travel_windows(travel_windows),
+                }
+            )
+        burden = state.get("travel_burden")
+        if burden:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": "Travel distance per destination:\n"
+                    + format_travel_burden(burden),
+                }
+            )
+        candidates = state.get("destination_candidates")
+        if candidates:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": "Pre-ranked candidate destinations:\n"
+                    + format_destination_candidates(candidates),
+                }
+            )
+        messages += state["messages"]
+        # Keep the prompt within budget as drafts and results accumulate
+        messages, report = compact_messages(
+            messages,
+            SUPERVISOR_TOKEN_BUDGET,
+            latest_itinerary=state.get("latest_itinerary"),
+        )
+        record("supervisor", report)
+        return messages
+
+    def route(response: Router) -> Command:
         goto = response["next"]
         if goto == "FINISH":
             goto = END
 
         return Command(goto=goto, update={"next": goto})
 
-    return supervisor_node
+    router = llm.with_structured_output(Router)
+    rule_router = RuleRouter(members, rules or ())
+
+    def supervisor_node(state: State) -> Command[Literal[*members, "__end__"]]:
+        """A rule-first, LLM-fallback router."""
+        goto = rule_router.route(state)
+        if goto is not None:
+            return route({"next": goto})
+        rule_router.record_llm()
+        return route(router.invoke(router_messages(state)))
+
+    async def asupervisor_node(
+        state: State,
+    ) -> Command[Literal[*members, "__end__"]]:
+        """A rule-first, LLM-fallback router (async)."""
+        goto = rule_router.route(state)
+        if goto is not None:
+            return route({"next": goto})
+        rule_router.record_llm()
+        return route(await router.ainvoke(router_messages(state)))
+
+    node = asupervisor_node if asynchronous else supervisor_node
+    node.routing_stats = rule_router.stats
+    return node
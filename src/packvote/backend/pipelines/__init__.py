@@ -1,3 +1,3 @@
-from .get_user_prefs import get_user_prefs
+from .get_user_prefs import get_user_prefs, parse_user_prefs
 
-__all__ = ["get_user_prefs"]
+__all__ = ["get_user_prefs", "parse_user_prefs"]
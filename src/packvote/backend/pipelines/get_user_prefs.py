@@ -11,18 +11,45 @@ def get_user_prefs(user_survey_file_path: str) -> Dict[str, Any]:
         user_survey_file_path: The path to the user survey file.
 
     Returns:
-        A dictionary containing the user surveys, travel date, and travel duration.
+        A dictionary containing the user surveys, travel date, travel duration,
+        per-traveler availability windows ("availability" in the file, or
+        submissions that carry their own travel_date/travel_duration), and
+        optional candidate "destinations".
     """
     with open(user_survey_file_path, "r", encoding="utf-8") as f:
         user_survey_responses = json.load(f)
+    return parse_user_prefs(user_survey_responses)
 
+
+def parse_user_prefs(user_survey_responses: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse a survey payload with the same shape as the survey file.
+
+    Args:
+        user_survey_responses: Mapping with "travel_date", "travel_duration",
+            "submissions" and optionally "availability" and "destinations".
+
+    Returns:
+        The same dictionary as :func:`get_user_prefs`.
+    """
+    user_survey_responses = dict(user_survey_responses)
     travel_date = user_survey_responses.pop("travel_date")
     travel_duration = user_survey_responses.pop("travel_duration")
     submissions = user_survey_responses.pop("submissions", [])
+    availability = user_survey_responses.pop("availability", None) or [
+        {
+            "name": response.get("name"),
+            "travel_date": response["travel_date"],
+            "travel_duration": response["travel_duration"],
+        }
+        for response in submissions
+        if "travel_date" in response and "travel_duration" in response
+    ]
 
     user_surveys = [UserSurvey.model_validate(response) for response in submissions]
     return {
         "user_surveys": user_surveys,
         "travel_date": travel_date,
         "travel_duration": travel_duration,
+        "availability": availability,
+        "destinations": user_survey_responses.pop("destinations", []),
     }
@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+
+from src.packvote.backend import LOGGER
+
+from .base import (
+    STORAGE_ERRORS,
+    StorageBackend,
+    new_participant_id,
+    participant_id,
+    participant_key,
+)
+from .cache import (
+    METADATA_KEYS,
+    SubmissionCache,
+    ValidatedSubmissions,
+    validate_submission,
+    validate_submissions,
+)
+from .json_storage import JsonFileStorage, JsonlStorage
+from .registry import ProjectRegistry
+from .sqlite_storage import SqliteStorage
+from .submission_log import SubmissionLog
+from .write_behind import WriteBehindBuffer
+
+
+def _import_flat_files(
+    storage: SqliteStorage, projects_file: Path, submissions_dir: Path
+) -> None:
+    """Copy existing flat-file projects and submissions into an empty database."""
+    json_storage = JsonFileStorage(projects_file, submissions_dir)
+    jsonl_storage = JsonlStorage(projects_file, submissions_dir)
+    projects = json_storage.list_projects()
+    if projects:
+        storage.replace_projects(projects)
+
+    safe_names = {p["safe_name"] for p in projects}
+    for path in submissions_dir.glob("*_submissions.json*"):
+        safe_names.add(path.name.split("_submissions.json")[0])
+    for safe_name in sorted(safe_names):
+        source = (
+            jsonl_storage
+            if jsonl_storage.submission_log(safe_name).path.exists()
+            else json_storage
+        )
+        if not source.has_submissions(safe_name):
+            continue
+        try:
+            records = source.read_submissions(safe_name)
+        except json.JSONDecodeError as e:
+            LOGGER.warning("Skipping unreadable submissions for %s: %s", safe_name, e)
+            continue
+        storage.append_submissions(safe_name, records)
+        LOGGER.info("Imported %d submissions for %s", len(records), safe_name)
+
+
+def create_storage(
+    backend: str, projects_file: Path, submissions_dir: Path, sqlite_path: Path
+) -> StorageBackend:
+    """Build the configured storage backend ("json", "jsonl" or "sqlite")."""
+    if backend == "json":
+        return JsonFileStorage(projects_file, submissions_dir)
+    if backend == "jsonl":
+        return JsonlStorage(projects_file, submissions_dir)
+    if backend == "sqlite":
+        storage = SqliteStorage(sqlite_path)
+        # Once per database, even when several workers open it at the same time
+        storage.run_once(
+            "flat_files_imported",
+            lambda s: _import_flat_files(s, Path(projects_file), Path(submissions_dir)),
+        )
+        return storage
+    raise ValueError(f"Unknown storage backend: {backend!r}")
+
+
+__all__ = [
+    "METADATA_KEYS",
+    "STORAGE_ERRORS",
+    "JsonFileStorage",
+    "JsonlStorage",
+    "ProjectRegistry",
+    "SqliteStorage",
+    "StorageBackend",
+    "SubmissionCache",
+    "SubmissionLog",
+    "ValidatedSubmissions",
+    "WriteBehindBuffer",
+    "create_storage",
+    "new_participant_id",
+    "participant_id",
+    "participant_key",
+    "validate_submission",
+    "validate_submissions",
+]
@@ -0,0 +1,178 @@
+"""Storage interface shared by the flat-file and SQLite backends."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+from typing import Hashable, Iterator, List, Optional, Tuple
+
+# What a backend raises when its files or database cannot be read or written
+# (invalid JSON on disk is a ValueError)
+STORAGE_ERRORS = (OSError, sqlite3.Error, ValueError)
+
+
+def participant_key(record: dict) -> Tuple[str, str, str]:
+    """Identity triple used by ``delete_participant`` to match a submission."""
+    return (
+        record.get("name"),
+        str(record.get("phone")),
+        record.get("added_at"),
+    )
+
+
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def new_participant_id() -> str:
+    """New time-ordered participant id (a 26-character ULID)."""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    chars = []
+    for _ in range(26):
+        value, digit = divmod(value, 32)
+        chars.append(_CROCKFORD[digit])
+    return "".join(reversed(chars))
+
+
+def participant_id(record: dict) -> str:
+    """Stable participant id of a submission.
+
+    Records carry an ``id`` assigned at submit time; for records written before
+    that, the id is derived from the identity triple so it stays the same
+    across reads and backfills."""
+    if record.get("id"):
+        return record["id"]
+    digest = hashlib.sha1(
+        json.dumps(participant_key(record), ensure_ascii=False).encode("utf-8")
+    )
+    return digest.hexdigest()[:20]
+
+
+def with_id(record: dict) -> dict:
+    """Return ``record`` with its participant id filled in."""
+    if record.get("id"):
+        return record
+    return {**record, "id": participant_id(record)}
+
+
+def file_fingerprint(path: Path) -> Optional[Tuple]:
+    """(path, inode, mtime, size) of a file, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (str(path), stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def read_submissions_file(path: Path) -> List[dict]:
+    """Read a JSON submissions file (bare array or ``{"submissions": [...]}``).
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    # Handle backward compatibility: old format (object with travel_date, travel_duration, submissions)
+    if isinstance(data, dict) and "submissions" in data:
+        return data.get("submissions", [])
+    # Current format (array of submissions)
+    return data if isinstance(data, list) else []
+
+
+class StorageBackend(ABC):
+    """Persistence for projects and their submissions.
+
+    Projects are plain dicts keyed by ``safe_name``; submissions are the
+    ``UserSurvey.model_dump()`` dicts plus metadata such as ``added_at``.
+    """
+
+    # ---------- Projects ----------
+    @abstractmethod
+    def projects_fingerprint(self) -> Optional[Hashable]:
+        """Cheap token that changes whenever the project list changes."""
+
+    def projects_lock(self) -> AbstractContextManager:
+        """Lock held by :class:`ProjectRegistry` around its write-throughs.
+
+        Backends shared between processes return a cross-process lock so that a
+        refresh-then-write sequence cannot lose another worker's update."""
+        return nullcontext()
+
+    @abstractmethod
+    def list_projects(self) -> List[dict]:
+        """Return all projects in creation order."""
+
+    @abstractmethod
+    def get_project(self, safe_name: str) -> Optional[dict]:
+        """Return the project with ``safe_name`` or None."""
+
+    @abstractmethod
+    def save_project(self, project: dict) -> None:
+        """Insert or update a project, keyed by its ``safe_name``."""
+
+    @abstractmethod
+    def replace_projects(self, projects: List[dict]) -> None:
+        """Replace the whole project list."""
+
+    @abstractmethod
+    def delete_project(self, safe_name: str) -> bool:
+        """Remove a project; return False if it did not exist."""
+
+    # ---------- Submissions ----------
+    @abstractmethod
+    def submissions_fingerprint(self, safe_name: str) -> Optional[Hashable]:
+        """Cheap token that changes whenever the project's submissions change.
+
+        Returns None if no submission storage exists for the project."""
+
+    @abstractmethod
+    def has_submissions(self, safe_name: str) -> bool:
+        """Whether submission storage exists for the project."""
+
+    @abstractmethod
+    def init_submissions(self, safe_name: str) -> None:
+        """Create empty submission storage for the project if missing."""
+
+    @abstractmethod
+    def read_submissions(self, safe_name: str) -> List[dict]:
+        """Return the project's submissions in insertion order."""
+
+    def iter_submissions(self, safe_name: str) -> Iterator[dict]:
+        """Yield the project's submissions in insertion order.
+
+        Backends override this to read rows lazily so exports do not hold a
+        whole project in memory."""
+        yield from self.read_submissions(safe_name)
+
+    @abstractmethod
+    def append_submission(self, safe_name: str, record: dict) -> None:
+        """Persist one submission record."""
+
+    def append_submissions(self, safe_name: str, records: List[dict]) -> None:
+        """Persist a batch of submission records, syncing them to disk once."""
+        for record in records:
+            self.append_submission(safe_name, record)
+
+    def get_submission(self, safe_name: str, pid: str) -> Optional[dict]:
+        """Return the submission with participant id ``pid`` or None."""
+        for record in self.iter_submissions(safe_name):
+            if participant_id(record) == pid:
+                return record
+        return None
+
+    @abstractmethod
+    def delete_submission(self, safe_name: str, match: dict) -> bool:
+        """Delete submissions matching ``participant_key(match)``."""
+
+    @abstractmethod
+    def delete_submission_by_id(self, safe_name: str, pid: str) -> bool:
+        """Delete the submission with participant id ``pid``."""
+
+    @abstractmethod
+    def drop_submissions(self, safe_name: str) -> None:
+        """Delete all submission storage for the project."""
@@ -0,0 +1,271 @@
+"""Parse-once cache of validated project submissions.
+
+Entries are keyed on the storage fingerprint of a project (for flat files the
+path, inode, mtime and size), so an unchanged project is served without any
+JSON parsing or pydantic validation. The cache is bounded both by project
+count and by an approximate memory budget; cold projects are evicted
+least-recently-used and are reloaded from storage on their next access.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from src.packvote.backend.utils.langgraph_elements import UserSurvey
+
+from .base import StorageBackend, participant_id
+
+
+@dataclass(frozen=True)
+class ValidatedSubmissions:
+    """Submissions of one project, validated once.
+
+    ``records`` are ``UserSurvey.model_dump()`` dicts merged with metadata such
+    as ``added_at``. Both lists are shared between requests; do not mutate them.
+    """
+
+    surveys: List[UserSurvey] = field(default_factory=list)
+    records: List[dict] = field(default_factory=list)
+    # (added_at, participant id) -> index map for cursor paging, built once
+    # here since instances are shared across request threads
+    _positions: Dict[Tuple, int] = field(
+        init=False, default_factory=dict, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._positions.update(
+            (page_key(record), idx) for idx, record in enumerate(self.records)
+        )
+
+    def position_of(self, key: Tuple) -> Optional[int]:
+        """Index of the record with pagination key ``key``, if present."""
+        return self._positions.get(key)
+
+
+# Keys stored alongside a survey that are not part of ``UserSurvey``
+METADATA_KEYS = ("id", "added_at")
+
+
+def page_key(record: dict) -> Tuple[str, str]:
+    """Cursor key of a record: its ``added_at`` plus stable participant id."""
+    return (record.get("added_at") or "", participant_id(record))
+
+
+EMPTY_SUBMISSIONS = ValidatedSubmissions()
+
+
+def validate_submission(item: dict) -> Optional[Tuple[UserSurvey, dict]]:
+    """Validate one raw submission dict.
+
+    Returns the ``UserSurvey`` and its dump merged with metadata, or None for
+    legacy rows with an unusable phone number.
+
+    Raises:
+        ValidationError: If the record does not match ``UserSurvey``.
+    """
+    # Validate the submission (excluding metadata)
+    item_copy = {k: v for k, v in item.items() if k not in METADATA_KEYS}
+    # Handle backward compatibility: convert phone to int if string
+    if "phone" in item_copy and isinstance(item_copy["phone"], str):
+        phone_clean = "".join(filter(str.isdigit, item_copy["phone"]))
+        if len(phone_clean) == 10:
+            item_copy["phone"] = int(phone_clean)
+        else:
+            return None  # Skip invalid phone numbers
+    # Add default country_code if missing (backward compatibility)
+    if "country_code" not in item_copy:
+        item_copy["country_code"] = "+1"  # Default to US
+    survey = UserSurvey(**item_copy)
+    # Keep validated data merged with metadata
+    result = survey.model_dump()
+    for key in METADATA_KEYS:
+        if key in item:
+            result[key] = item[key]
+    return survey, result
+
+
+def validate_submissions(submissions_list: Iterable[dict]) -> ValidatedSubmissions:
+    """Validate raw submission dicts into ``UserSurvey`` objects.
+
+    Raises:
+        ValidationError: If a record does not match ``UserSurvey``.
+    """
+    surveys = []
+    records = []
+    for item in submissions_list:
+        validated = validate_submission(item)
+        if validated is None:
+            continue
+        surveys.append(validated[0])
+        records.append(validated[1])
+    return ValidatedSubmissions(surveys=surveys, records=records)
+
+
+def _deep_sizeof(value) -> int:
+    """Approximate heap size of a JSON-like value (dicts, lists, scalars)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + _deep_sizeof(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += _deep_sizeof(item)
+    return size
+
+
+def estimate_bytes(submissions: ValidatedSubmissions) -> int:
+    """Approximate memory held by one cached project.
+
+    Each survey holds the same field values as its record, so the records are
+    measured and counted twice rather than walking the pydantic models."""
+    records = sum(_deep_sizeof(record) for record in submissions.records)
+    return 2 * records + sys.getsizeof(submissions.surveys)
+
+
+# (storage fingerprint, validated submissions, estimated bytes)
+_CacheEntry = Tuple[Hashable, ValidatedSubmissions, int]
+
+
+class SubmissionCache:
+    """LRU cache of :class:`ValidatedSubmissions` across projects.
+
+    ``max_bytes`` bounds the estimated memory of all cached projects; a
+    project larger than the whole budget is served but not cached.
+    """
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        max_projects: int = 64,
+        max_bytes: Optional[int] = None,
+    ):
+        self.storage = storage
+        self.max_projects = max_projects
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _over_budget(self) -> bool:
+        if len(self._entries) > self.max_projects:
+            return True
+        return self.max_bytes is not None and self.total_bytes > self.max_bytes
+
+    def _store(
+        self, safe_name: str, fingerprint: Hashable, submissions: ValidatedSubmissions
+    ) -> None:
+        """Insert an entry and evict cold projects. Call with the lock held."""
+        size = estimate_bytes(submissions)
+        self._discard(safe_name)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._entries[safe_name] = (fingerprint, submissions, size)
+        self.total_bytes += size
+        while self._over_budget():
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted
+            self.evictions += 1
+
+    def _discard(self, safe_name: str) -> None:
+        entry = self._entries.pop(safe_name, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+    def get(self, safe_name: str) -> ValidatedSubmissions:
+        """Return the project's validated submissions, loading them on a miss.
+
+        Raises:
+            json.JSONDecodeError, ValidationError: If storage holds invalid data.
+        """
+        fingerprint = self.storage.submissions_fingerprint(safe_name)
+        if fingerprint is None:
+            self.invalidate(safe_name)
+            return EMPTY_SUBMISSIONS
+
+        with self._lock:
+            entry = self._entries.get(safe_name)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(safe_name)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Parse outside the lock so one slow project does not block the others
+        submissions = validate_submissions(self.storage.read_submissions(safe_name))
+        with self._lock:
+            self._store(safe_name, fingerprint, submissions)
+        return submissions
+
+    def version(self, safe_name: str) -> Optional[str]:
+        """Opaque per-project version derived from the storage fingerprint.
+
+        Costs a ``stat`` (flat files) or one indexed lookup (SQLite); the
+        submissions themselves are not read. None if the project has no
+        submission storage."""
+        fingerprint = self.storage.submissions_fingerprint(safe_name)
+        if fingerprint is None:
+            return None
+        return hashlib.sha1(repr(fingerprint).encode("utf-8")).hexdigest()[:16]
+
+    def iter_records(self, safe_name: str) -> Iterator[dict]:
+        """Yield validated records without materializing the whole project.
+
+        Served from the cache when it is current; otherwise rows are read and
+        validated lazily from storage and the cache is left untouched.
+
+        Raises:
+            json.JSONDecodeError, ValidationError: If storage holds invalid data.
+        """
+        fingerprint = self.storage.submissions_fingerprint(safe_name)
+        if fingerprint is None:
+            return
+        with self._lock:
+            entry = self._entries.get(safe_name)
+            cached = entry[1] if entry is not None and entry[0] == fingerprint else None
+            if cached is not None:
+                self._entries.move_to_end(safe_name)
+                self.hits += 1
+        if cached is not None:
+            yield from cached.records
+            return
+        for item in self.storage.iter_submissions(safe_name):
+            validated = validate_submission(item)
+            if validated is not None:
+                yield validated[1]
+
+    def invalidate(self, safe_name: Optional[str] = None) -> None:
+        """Drop one project (or every project) from the cache."""
+        with self._lock:
+            if safe_name is None:
+                self._entries.clear()
+                self.total_bytes = 0
+            else:
+                self._discard(safe_name)
+
+    def stats(self) -> dict:
+        """Hit/miss counters, memory usage and per-project sizes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "projects": len(self._entries),
+                "max_projects": self.max_projects,
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                # Most recently used last
+                "entries": {
+                    name: {"records": len(entry[1].records), "bytes": entry[2]}
+                    for name, entry in self._entries.items()
+                },
+            }
@@ -0,0 +1,63 @@
+"""SQLite checkpointer for the itinerary workflow.
+
+Every completed node is checkpointed under a thread id derived from the
+project, so a run that crashes or hits the recursion limit resumes from the
+last completed node instead of repeating its LLM and search calls, and past
+runs can be inspected with ``get_state_history``.
+
+State is stored with LangGraph's msgpack serializer. The PackVote models kept
+in the state (traveler surveys, group consensus) are allow-listed so they are
+encoded as compact field dumps and restored as models rather than pickled.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+import aiosqlite
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+# Models stored in the workflow state
+STATE_MODELS = [
+    ("src.packvote.backend.utils.langgraph_elements", "UserSurvey"),
+    ("src.packvote.backend.utils.langgraph_elements", "GroupConsensus"),
+    ("src.packvote.backend.utils.langgraph_elements", "TravelerConflict"),
+]
+
+
+def project_thread_id(safe_name: str, run_id: Optional[str] = None) -> str:
+    """Checkpoint thread id for the project with ``safe_name``, scoped to
+    ``run_id`` when runs must not share state (e.g. nightly batches)."""
+    thread_id = f"project:{safe_name}"
+    return f"{thread_id}:{run_id}" if run_id else thread_id
+
+
+def open_checkpointer(db_path: Path) -> SqliteSaver:
+    """SQLite checkpointer at ``db_path`` (WAL mode, usable across threads)."""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return SqliteSaver(
+        conn, serde=JsonPlusSerializer(allowed_msgpack_modules=STATE_MODELS)
+    )
+
+
+@asynccontextmanager
+async def open_async_checkpointer(db_path: Path) -> AsyncIterator[AsyncSqliteSaver]:
+    """Async variant of :func:`open_checkpointer` for graphs run with
+    ``ainvoke``; the connection is closed when the block exits."""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    async with aiosqlite.connect(db_path) as conn:
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        yield AsyncSqliteSaver(
+            conn, serde=JsonPlusSerializer(allowed_msgpack_modules=STATE_MODELS)
+        )
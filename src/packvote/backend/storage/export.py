@@ -0,0 +1,121 @@
+"""Generator-based CSV, NDJSON and zip exports of project submissions.
+
+Every function consumes an iterable of validated submission records and
+yields small chunks, so a ``StreamingResponse`` can serve a project of any
+size with flat memory.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zipfile
+from typing import Iterable, Iterator, Tuple
+
+CSV_HEADER = [
+    "name",
+    "phone",
+    "country_code",
+    "budget_category",
+    "budget_range",
+    "current_location",
+    "preferences",
+]
+
+# Rows buffered before a chunk is yielded
+CHUNK_ROWS = 64
+
+
+def csv_row(s_dict: dict) -> list:
+    """Format a submission record as a CSV row."""
+    # Format phone with country code if available
+    phone_display = str(s_dict.get("phone", ""))
+    country_code = s_dict.get("country_code", "")
+    if country_code:
+        phone_display = f"{country_code} {phone_display}"
+    return [
+        s_dict.get("name", "").capitalize(),
+        phone_display,
+        country_code,
+        s_dict.get("budget_category", ""),
+        json.dumps(s_dict.get("budget_range", [])),
+        s_dict.get("current_location", "").capitalize(),
+        "; ".join(s_dict.get("preferences", [])).capitalize(),
+    ]
+
+
+def iter_csv(records: Iterable[dict]) -> Iterator[str]:
+    """Yield a CSV document (header first) in chunks of rows."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(CSV_HEADER)
+    for idx, record in enumerate(records, start=1):
+        writer.writerow(csv_row(record))
+        if idx % CHUNK_ROWS == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def iter_ndjson(records: Iterable[dict]) -> Iterator[str]:
+    """Yield one JSON document per line."""
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+        if len(lines) == CHUNK_ROWS:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def iter_json_array(records: Iterable[dict]) -> Iterator[str]:
+    """Yield a JSON array incrementally."""
+    parts = ["["]
+    for idx, record in enumerate(records):
+        parts.append(("," if idx else "") + json.dumps(record, ensure_ascii=False))
+        if len(parts) >= CHUNK_ROWS:
+            yield "".join(parts)
+            parts = []
+    parts.append("]")
+    yield "".join(parts)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable sink that hands written bytes back in chunks."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(entries: Iterable[Tuple[str, Iterable[str]]]) -> Iterator[bytes]:
+    """Yield a zip archive built from ``(filename, text chunks)`` entries.
+
+    The sink is not seekable, so ``zipfile`` writes data descriptors after each
+    member instead of seeking back, and nothing is buffered beyond one chunk.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for filename, chunks in entries:
+            with archive.open(filename, mode="w", force_zip64=True) as member:
+                for chunk in chunks:
+                    member.write(chunk.encode("utf-8"))
+                    data = sink.drain()
+                    if data:
+                        yield data
+            yield sink.drain()
+    yield sink.drain()
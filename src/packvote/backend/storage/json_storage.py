@@ -0,0 +1,196 @@
+"""Flat-file storage backends (``projects.json`` plus one file per project)."""
+
+from __future__ import annotations
+
+import json
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Hashable, Iterator, List, Optional
+
+from .base import (
+    StorageBackend,
+    file_fingerprint,
+    participant_id,
+    participant_key,
+    read_submissions_file,
+    with_id,
+)
+from .locking import atomic_write_json, file_lock
+from .submission_log import SubmissionLog
+
+
+class JsonFileStorage(StorageBackend):
+    """Projects in ``projects.json`` and submissions as one JSON array per project.
+
+    Every read-modify-write holds a cross-process file lock and every rewrite
+    is an atomic temp-file-plus-rename, so several workers can share the files.
+    """
+
+    def __init__(self, projects_file: Path, submissions_dir: Path):
+        self.projects_file = Path(projects_file)
+        self.submissions_dir = Path(submissions_dir)
+
+    def submissions_path(self, safe_name: str) -> Path:
+        return self.submissions_dir / f"{safe_name}_submissions.json"
+
+    # ---------- Projects ----------
+    def projects_fingerprint(self) -> Optional[Hashable]:
+        return file_fingerprint(self.projects_file)
+
+    def projects_lock(self) -> AbstractContextManager:
+        return file_lock(self.projects_file)
+
+    def list_projects(self) -> List[dict]:
+        if self.projects_file.exists():
+            try:
+                with open(self.projects_file, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except json.JSONDecodeError:
+                return []
+        return []
+
+    def get_project(self, safe_name: str) -> Optional[dict]:
+        for project in self.list_projects():
+            if project.get("safe_name") == safe_name:
+                return project
+        return None
+
+    def save_project(self, project: dict) -> None:
+        with self.projects_lock():
+            projects = self.list_projects()
+            for idx, existing in enumerate(projects):
+                if existing.get("safe_name") == project["safe_name"]:
+                    projects[idx] = project
+                    break
+            else:
+                projects.append(project)
+            self.replace_projects(projects)
+
+    def replace_projects(self, projects: List[dict]) -> None:
+        with self.projects_lock():
+            atomic_write_json(self.projects_file, projects)
+
+    def delete_project(self, safe_name: str) -> bool:
+        with self.projects_lock():
+            projects = self.list_projects()
+            remaining = [p for p in projects if p.get("safe_name") != safe_name]
+            self.replace_projects(remaining)
+        return len(remaining) != len(projects)
+
+    # ---------- Submissions ----------
+    def submissions_fingerprint(self, safe_name: str) -> Optional[Hashable]:
+        return file_fingerprint(self.submissions_path(safe_name))
+
+    def has_submissions(self, safe_name: str) -> bool:
+        return self.submissions_path(safe_name).exists()
+
+    def init_submissions(self, safe_name: str) -> None:
+        path = self.submissions_path(safe_name)
+        with file_lock(path):
+            if not path.exists():
+                self._write_submissions(safe_name, [])
+
+    def read_submissions(self, safe_name: str) -> List[dict]:
+        path = self.submissions_path(safe_name)
+        records = read_submissions_file(path)
+        if all(record.get("id") for record in records):
+            return records
+        # Records written before participant ids existed: persist their ids
+        with file_lock(path):
+            records = [with_id(record) for record in read_submissions_file(path)]
+            self._write_submissions(safe_name, records)
+        return records
+
+    def _write_submissions(
+        self, safe_name: str, records: List[dict], fsync: bool = False
+    ) -> None:
+        atomic_write_json(self.submissions_path(safe_name), records, fsync=fsync)
+
+    def append_submission(self, safe_name: str, record: dict) -> None:
+        self._extend_submissions(safe_name, [record], fsync=False)
+
+    def append_submissions(self, safe_name: str, records: List[dict]) -> None:
+        self._extend_submissions(safe_name, records, fsync=True)
+
+    def _extend_submissions(
+        self, safe_name: str, records: List[dict], fsync: bool
+    ) -> None:
+        with file_lock(self.submissions_path(safe_name)):
+            existing = []
+            if self.has_submissions(safe_name):
+                try:
+                    existing = self.read_submissions(safe_name)
+                except json.JSONDecodeError:
+                    existing = []
+            existing.extend(with_id(record) for record in records)
+            self._write_submissions(safe_name, existing, fsync=fsync)
+
+    def delete_submission(self, safe_name: str, match: dict) -> bool:
+        with file_lock(self.submissions_path(safe_name)):
+            records = self.read_submissions(safe_name)
+            key = participant_key(match)
+            remaining = [r for r in records if participant_key(r) != key]
+            if len(remaining) == len(records):
+                return False
+            self._write_submissions(safe_name, remaining)
+        return True
+
+    def delete_submission_by_id(self, safe_name: str, pid: str) -> bool:
+        # A JSON array has no cheaper delete than a rewrite
+        with file_lock(self.submissions_path(safe_name)):
+            records = self.read_submissions(safe_name)
+            remaining = [r for r in records if participant_id(r) != pid]
+            if len(remaining) == len(records):
+                return False
+            self._write_submissions(safe_name, remaining)
+        return True
+
+    def drop_submissions(self, safe_name: str) -> None:
+        path = self.submissions_path(safe_name)
+        with file_lock(path):
+            if path.exists():
+                path.unlink()
+
+
+class JsonlStorage(JsonFileStorage):
+    """Projects in ``projects.json`` and submissions in append-only JSON-lines logs."""
+
+    def submission_log(self, safe_name: str) -> SubmissionLog:
+        legacy_path = self.submissions_path(safe_name)
+        return SubmissionLog(legacy_path.with_suffix(".jsonl"), legacy_path=legacy_path)
+
+    def submissions_fingerprint(self, safe_name: str) -> Optional[Hashable]:
+        log = self.submission_log(safe_name)
+        return file_fingerprint(log.path) or file_fingerprint(log.legacy_path)
+
+    def has_submissions(self, safe_name: str) -> bool:
+        log = self.submission_log(safe_name)
+        return log.path.exists() or log.legacy_path.exists()
+
+    def init_submissions(self, safe_name: str) -> None:
+        self.submission_log(safe_name).init()
+
+    def read_submissions(self, safe_name: str) -> List[dict]:
+        return self.submission_log(safe_name).read()
+
+    def iter_submissions(self, safe_name: str) -> Iterator[dict]:
+        return self.submission_log(safe_name).iter_live()
+
+    def get_submission(self, safe_name: str, pid: str) -> Optional[dict]:
+        return self.submission_log(safe_name).get(pid)
+
+    def append_submission(self, safe_name: str, record: dict) -> None:
+        self.submission_log(safe_name).append(with_id(record))
+
+    def append_submissions(self, safe_name: str, records: List[dict]) -> None:
+        self.submission_log(safe_name).append_many([with_id(r) for r in records])
+
+    def delete_submission(self, safe_name: str, match: dict) -> bool:
+        return self.submission_log(safe_name).delete(match)
+
+    def delete_submission_by_id(self, safe_name: str, pid: str) -> bool:
+        return self.submission_log(safe_name).delete_id(pid)
+
+    def drop_submissions(self, safe_name: str) -> None:
+        self.submission_log(safe_name).remove()
+        super().drop_submissions(safe_name)
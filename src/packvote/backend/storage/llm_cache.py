@@ -0,0 +1,185 @@
+"""Opt-in, disk-backed exact-match cache for chat model responses.
+
+LangChain keys cached generations on the serialized prompt (the messages)
+and the model's ``llm_string``, which covers the model name, its parameters
+and any bound tools or structured-output schema. Both are hashed into one
+SQLite key, so a repeated supervisor, grader or research-agent call with the
+same inputs is answered from disk instead of OpenAI.
+
+Entries expire after ``ttl_seconds`` and the least recently used ones are
+evicted beyond ``max_entries``. Hits, misses and the tokens a hit avoided
+spending are counted for ``stats()``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+import warnings
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from src.packvote.backend import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_S,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    generations TEXT NOT NULL,
+    tokens INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed);
+"""
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """SHA-256 over the model configuration and the serialized messages."""
+    digest = hashlib.sha256(llm_string.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _total_tokens(generations: Sequence[Any]) -> int:
+    tokens = 0
+    for generation in generations:
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+        if usage:
+            tokens += usage.get("total_tokens", 0)
+    return tokens
+
+
+class SqliteLLMCache(BaseCache):
+    """SQLite LLM response cache with LRU eviction and a TTL."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_entries: int = 10_000,
+        ttl_seconds: Optional[float] = 7 * 86400,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._entries = self._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created > self.ttl_seconds
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Cached generations for the call, or None."""
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT generations, tokens, created FROM llm_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None or self._expired(row[2], now):
+                if row is not None:
+                    with self._db:
+                        self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._entries -= 1
+                self.misses += 1
+                return None
+            with self._db:
+                self._db.execute(
+                    "UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key)
+                )
+            self.hits += 1
+            self.saved_tokens += row[1]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", LangChainBetaWarning)
+            return loads(row[0], allowed_objects="core")
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store the generations for the call, evicting the least recently used."""
+        key = cache_key(prompt, llm_string)
+        payload = dumps(list(return_val))
+        now = time.time()
+        with self._lock, self._db:
+            replaced = self._db.execute(
+                "SELECT 1 FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, generations, tokens, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, _total_tokens(return_val), now, now),
+            )
+            if replaced is None:
+                self._entries += 1
+            overflow = self._entries - self.max_entries
+            if overflow > 0:
+                self._db.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    "SELECT key FROM llm_cache ORDER BY accessed LIMIT ?)",
+                    (overflow,),
+                )
+                self._entries -= overflow
+                self.evictions += overflow
+
+    def clear(self, **kwargs: Any) -> None:
+        """Drop every cached response."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM llm_cache")
+            self._entries = 0
+
+    def purge_expired(self) -> int:
+        """Delete expired entries; returns how many were removed."""
+        if self.ttl_seconds is None:
+            return 0
+        with self._lock, self._db:
+            removed = self._db.execute(
+                "DELETE FROM llm_cache WHERE created < ?",
+                (time.time() - self.ttl_seconds,),
+            ).rowcount
+            self._entries -= removed
+        return removed
+
+    def stats(self) -> dict:
+        """Hit rate, tokens saved by hits, and size counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "saved_tokens": self.saved_tokens,
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+@lru_cache(maxsize=1)
+def default_llm_cache() -> Optional[SqliteLLMCache]:
+    """Process-wide LLM cache when PACKVOTE_LLM_CACHE is enabled, else None."""
+    if not LLM_CACHE_ENABLED:
+        return None
+    return SqliteLLMCache(
+        Path(LLM_CACHE_PATH),
+        max_entries=LLM_CACHE_MAX_ENTRIES,
+        ttl_seconds=LLM_CACHE_TTL_S or None,
+    )
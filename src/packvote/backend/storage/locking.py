@@ -0,0 +1,131 @@
+"""Cross-process file locking and atomic file replacement.
+
+Several uvicorn workers share the same storage files, so every
+read-modify-write holds an advisory ``flock`` on a sidecar ``.lock`` file and
+every rewrite goes through a temp file plus ``os.replace`` so readers never see
+a half-written file.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+# The process umask, read once: os.umask can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+_THREAD_LOCKS: Dict[Path, threading.Lock] = {}
+_THREAD_LOCKS_GUARD = threading.Lock()
+# Lock files currently held by this thread, for re-entrancy
+_HELD = threading.local()
+
+
+def _thread_lock(path: Path) -> threading.Lock:
+    with _THREAD_LOCKS_GUARD:
+        lock = _THREAD_LOCKS.get(path)
+        if lock is None:
+            lock = _THREAD_LOCKS[path] = threading.Lock()
+        return lock
+
+
+def lock_path_for(path: Path) -> Path:
+    """Sidecar lock file for ``path``."""
+    path = Path(path)
+    return path.with_name(path.name + ".lock")
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock for ``path`` across threads and processes.
+
+    The lock is taken on a separate ``<path>.lock`` file so that ``path`` itself
+    can be atomically replaced while the lock is held. Re-entrant within a
+    thread.
+    """
+    lock_file = lock_path_for(path).resolve()
+    held = getattr(_HELD, "paths", None)
+    if held is None:
+        held = _HELD.paths = set()
+    if lock_file in held:
+        yield
+        return
+
+    with _thread_lock(lock_file):
+        held.add(lock_file)
+        try:
+            if fcntl is None:
+                yield
+                return
+            lock_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(lock_file, "a") as handle:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            held.discard(lock_file)
+
+
+def _new_file_mode(path: Path) -> int:
+    """Permission bits for a rewrite of ``path``: its current ones, or those
+    ``open`` would give a new file (mkstemp always creates 0600)."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist the directory entry of a file just renamed into ``directory``."""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path: Path, text: str, fsync: bool = False) -> None:
+    """Write ``text`` to a temp file next to ``path`` and rename it into place.
+
+    The file keeps its permissions. With ``fsync`` the data and the rename are
+    both on disk when this returns."""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        os.chmod(tmp_name, _new_file_mode(path))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    if fsync:
+        _fsync_directory(path.parent)
+
+
+def atomic_write_json(path: Path, data: Any, fsync: bool = False) -> None:
+    """Atomically replace ``path`` with ``data`` serialized as indented JSON."""
+    atomic_write_text(path, json.dumps(data, indent=2, ensure_ascii=False), fsync)
@@ -0,0 +1,63 @@
+"""Cursor pagination over validated submissions.
+
+A cursor is the URL-safe base64 of ``[added_at, participant_id]`` for the last
+record of the previous page. Pages follow storage (insertion) order.
+"""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import json
+from typing import List, Optional, Tuple
+
+from .cache import ValidatedSubmissions, page_key
+
+
+def encode_cursor(record: dict) -> str:
+    raw = json.dumps(list(page_key(record)), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        added_at, pid = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    return str(added_at), str(pid)
+
+
+def paginate(
+    submissions: ValidatedSubmissions,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """Return one page of records and the cursor of the next page (or None).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    records = submissions.records
+    start = 0
+    if cursor:
+        key = decode_cursor(cursor)
+        position = submissions.position_of(key)
+        if position is not None:
+            start = position + 1
+        else:
+            # The cursor record was deleted; resume after its timestamp
+            # (added_at is non-decreasing in insertion order)
+            start = bisect.bisect_right(
+                records, key[0], key=lambda r: r.get("added_at") or ""
+            )
+    if limit is None:
+        return records[start:], None
+    page = records[start : start + limit]
+    has_more = start + limit < len(records)
+    return page, encode_cursor(page[-1]) if has_more and page else None
@@ -0,0 +1,110 @@
+"""In-memory project registry with a ``safe_name`` index.
+
+The registry mirrors the backend's project list and reloads it only when the
+backend's projects fingerprint changes (e.g. another process edited
+``projects.json``). Writes go through to the backend only when a project
+actually changed, under the backend's cross-process projects lock so that
+workers never overwrite each other's changes.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Hashable, List, Optional
+
+from .base import StorageBackend
+
+_UNLOADED = object()
+
+
+class ProjectRegistry:
+    """Cached, indexed view of the stored projects.
+
+    Returned project dicts are shared with the cache; treat them as read-only
+    and use :meth:`update` to change them.
+    """
+
+    def __init__(self, storage: StorageBackend):
+        self.storage = storage
+        self._projects: List[dict] = []
+        self._index: Dict[str, dict] = {}
+        self._fingerprint: Optional[Hashable] = _UNLOADED
+        self._lock = threading.RLock()
+
+    def _refresh(self) -> None:
+        fingerprint = self.storage.projects_fingerprint()
+        if fingerprint == self._fingerprint:
+            return
+        projects = self.storage.list_projects()
+        self._projects = projects
+        self._index = {p.get("safe_name"): p for p in projects}
+        self._fingerprint = fingerprint
+
+    def _mark_written(self) -> None:
+        self._fingerprint = self.storage.projects_fingerprint()
+
+    def all(self) -> List[dict]:
+        """Return all projects in creation order."""
+        with self._lock:
+            self._refresh()
+            return self._projects
+
+    def get(self, safe_name: str) -> Optional[dict]:
+        """O(1) lookup by ``safe_name``."""
+        with self._lock:
+            self._refresh()
+            return self._index.get(safe_name)
+
+    def add(self, project: dict) -> dict:
+        """Store a new project (replacing one with the same ``safe_name``)."""
+        with self._lock, self.storage.projects_lock():
+            self._refresh()
+            existing = self._index.get(project["safe_name"])
+            if existing == project:
+                return existing
+            self.storage.save_project(project)
+            if existing is None:
+                self._projects = self._projects + [project]
+            else:
+                self._projects = [
+                    project if p is existing else p for p in self._projects
+                ]
+            self._index[project["safe_name"]] = project
+            self._mark_written()
+            return project
+
+    def update(self, safe_name: str, changes: dict) -> Optional[dict]:
+        """Apply ``changes`` to a project; skip the write if nothing differs."""
+        with self._lock:
+            self._refresh()
+            existing = self._index.get(safe_name)
+            if existing is None:
+                return None
+            if all(existing.get(k) == v for k, v in changes.items()):
+                return existing
+        with self._lock, self.storage.projects_lock():
+            self._refresh()
+            existing = self._index.get(safe_name)
+            if existing is None:
+                return None
+            return self.add({**existing, **changes})
+
+    def replace(self, projects: List[dict]) -> None:
+        """Replace the whole project list."""
+        with self._lock, self.storage.projects_lock():
+            self.storage.replace_projects(projects)
+            self._projects = list(projects)
+            self._index = {p.get("safe_name"): p for p in self._projects}
+            self._mark_written()
+
+    def remove(self, safe_name: str) -> bool:
+        """Delete a project; return False if it did not exist."""
+        with self._lock, self.storage.projects_lock():
+            self._refresh()
+            if safe_name not in self._index:
+                return False
+            self.storage.delete_project(safe_name)
+            removed = self._index.pop(safe_name)
+            self._projects = [p for p in self._projects if p is not removed]
+            self._mark_written()
+            return True
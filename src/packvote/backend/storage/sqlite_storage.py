@@ -0,0 +1,311 @@
+"""SQLite (WAL mode) storage backend with indexed project and participant lookups."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Callable, Hashable, Iterator, List, Optional
+
+from .base import StorageBackend, participant_id, participant_key, with_id
+from .locking import file_lock
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    safe_name TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS submissions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    safe_name TEXT NOT NULL,
+    participant_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_submissions_project
+    ON submissions (safe_name, seq);
+CREATE INDEX IF NOT EXISTS idx_submissions_participant
+    ON submissions (safe_name, participant_id);
+CREATE TABLE IF NOT EXISTS projects_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO projects_version (id, version) VALUES (1, 0);
+CREATE TRIGGER IF NOT EXISTS trg_projects_insert AFTER INSERT ON projects
+BEGIN
+    UPDATE projects_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_projects_update AFTER UPDATE ON projects
+BEGIN
+    UPDATE projects_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_projects_delete AFTER DELETE ON projects
+BEGIN
+    UPDATE projects_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TABLE IF NOT EXISTS storage_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS submission_versions (
+    safe_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS trg_submissions_insert AFTER INSERT ON submissions
+BEGIN
+    INSERT INTO submission_versions (safe_name, version) VALUES (NEW.safe_name, 1)
+    ON CONFLICT (safe_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_submissions_delete AFTER DELETE ON submissions
+BEGIN
+    INSERT INTO submission_versions (safe_name, version) VALUES (OLD.safe_name, 1)
+    ON CONFLICT (safe_name) DO UPDATE SET version = version + 1;
+END;
+"""
+
+# Bumped whenever existing rows need a data migration on open
+SCHEMA_VERSION = 1
+
+MIGRATIONS = {
+    # Give rows written before participant ids existed their derived id
+    1: """
+    UPDATE submissions SET data = json_set(data, '$.id', participant_id)
+    WHERE json_extract(data, '$.id') IS NULL;
+    """,
+}
+
+
+def _dumps(value: dict) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class SqliteStorage(StorageBackend):
+    """Projects and submissions in a single SQLite database.
+
+    Each thread gets its own connection; WAL mode lets readers proceed while a
+    writer commits. Commits use ``synchronous=NORMAL`` (safe against a crashed
+    process, not a power loss) except batch appends, which fsync with FULL.
+    """
+
+    def __init__(self, db_path: Path, timeout: float = 5.0):
+        self.db_path = Path(db_path)
+        self.timeout = timeout
+        self._local = threading.local()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        self._migrate(conn)
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        (version,) = conn.execute("PRAGMA user_version").fetchone()
+        for target in range(version + 1, SCHEMA_VERSION + 1):
+            with conn:
+                conn.execute(MIGRATIONS[target])
+                conn.execute(f"PRAGMA user_version = {target}")
+
+    def run_once(self, key: str, action: Callable[["SqliteStorage"], None]) -> bool:
+        """Run ``action`` once per database, even with several workers starting.
+
+        The check and the marker row are made under a lock on the database
+        file, so concurrent callers wait and then see the marker. ``action``
+        only runs while the database holds no projects or submissions; a
+        database that already has data just gets the marker. Returns whether
+        ``action`` ran.
+        """
+        with file_lock(self.db_path):
+            conn = self._connection()
+            if conn.execute(
+                "SELECT 1 FROM storage_meta WHERE key = ?", (key,)
+            ).fetchone():
+                return False
+            (has_data,) = conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM projects) "
+                "OR EXISTS (SELECT 1 FROM submissions)"
+            ).fetchone()
+            if not has_data:
+                action(self)
+            with conn:
+                conn.execute(
+                    "INSERT INTO storage_meta (key, value) VALUES (?, '1')", (key,)
+                )
+            return not has_data
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---------- Projects ----------
+    def projects_fingerprint(self) -> Optional[Hashable]:
+        row = (
+            self._connection()
+            .execute("SELECT version FROM projects_version WHERE id = 1")
+            .fetchone()
+        )
+        return (str(self.db_path), row[0])
+
+    def projects_lock(self) -> AbstractContextManager:
+        return file_lock(self.db_path.with_name(self.db_path.name + ".projects"))
+
+    def list_projects(self) -> List[dict]:
+        rows = self._connection().execute("SELECT data FROM projects ORDER BY id")
+        return [json.loads(data) for (data,) in rows]
+
+    def get_project(self, safe_name: str) -> Optional[dict]:
+        row = (
+            self._connection()
+            .execute("SELECT data FROM projects WHERE safe_name = ?", (safe_name,))
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    def save_project(self, project: dict) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO projects (safe_name, data) VALUES (?, ?) "
+                "ON CONFLICT (safe_name) DO UPDATE SET data = excluded.data",
+                (project["safe_name"], _dumps(project)),
+            )
+
+    def replace_projects(self, projects: List[dict]) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM projects")
+            conn.executemany(
+                "INSERT OR REPLACE INTO projects (safe_name, data) VALUES (?, ?)",
+                [(p["safe_name"], _dumps(p)) for p in projects],
+            )
+
+    def delete_project(self, safe_name: str) -> bool:
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM projects WHERE safe_name = ?", (safe_name,)
+            )
+        return cursor.rowcount > 0
+
+    # ---------- Submissions ----------
+    def submissions_fingerprint(self, safe_name: str) -> Optional[Hashable]:
+        if not self.has_submissions(safe_name):
+            return None
+        row = (
+            self._connection()
+            .execute(
+                "SELECT version FROM submission_versions WHERE safe_name = ?",
+                (safe_name,),
+            )
+            .fetchone()
+        )
+        return (str(self.db_path), safe_name, row[0] if row else 0)
+
+    def has_submissions(self, safe_name: str) -> bool:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT EXISTS (SELECT 1 FROM projects WHERE safe_name = ?) "
+                "OR EXISTS (SELECT 1 FROM submissions WHERE safe_name = ?)",
+                (safe_name, safe_name),
+            )
+            .fetchone()
+        )
+        return bool(row[0])
+
+    def init_submissions(self, safe_name: str) -> None:
+        # Submissions live in a shared table; nothing to create per project
+        return None
+
+    def read_submissions(self, safe_name: str) -> List[dict]:
+        rows = self._connection().execute(
+            "SELECT data FROM submissions WHERE safe_name = ? ORDER BY seq",
+            (safe_name,),
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def iter_submissions(self, safe_name: str) -> Iterator[dict]:
+        # Streaming responses may resume the generator on different threads,
+        # so use a dedicated connection rather than the thread-local one
+        conn = sqlite3.connect(
+            self.db_path, timeout=self.timeout, check_same_thread=False
+        )
+        try:
+            cursor = conn.execute(
+                "SELECT data FROM submissions WHERE safe_name = ? ORDER BY seq",
+                (safe_name,),
+            )
+            while True:
+                rows = cursor.fetchmany(256)
+                if not rows:
+                    break
+                for (data,) in rows:
+                    yield json.loads(data)
+        finally:
+            conn.close()
+
+    def append_submission(self, safe_name: str, record: dict) -> None:
+        self._insert_submissions(safe_name, [record], durable=False)
+
+    def append_submissions(self, safe_name: str, records: List[dict]) -> None:
+        # Batches (write-behind group commits) are acknowledged once written,
+        # so they must survive power loss: one fsync per batch
+        self._insert_submissions(safe_name, records, durable=True)
+
+    def _insert_submissions(
+        self, safe_name: str, records: List[dict], durable: bool
+    ) -> None:
+        conn = self._connection()
+        if durable:
+            # In WAL mode NORMAL does not fsync on commit; FULL does
+            conn.execute("PRAGMA synchronous=FULL")
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO submissions (safe_name, participant_id, data) "
+                    "VALUES (?, ?, ?)",
+                    [
+                        (safe_name, participant_id(r), _dumps(with_id(r)))
+                        for r in records
+                    ],
+                )
+        finally:
+            if durable:
+                conn.execute("PRAGMA synchronous=NORMAL")
+
+    def get_submission(self, safe_name: str, pid: str) -> Optional[dict]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT data FROM submissions "
+                "WHERE safe_name = ? AND participant_id = ? ORDER BY seq LIMIT 1",
+                (safe_name, pid),
+            )
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    def delete_submission(self, safe_name: str, match: dict) -> bool:
+        name, phone, added_at = participant_key(match)
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM submissions WHERE safe_name = ? "
+                "AND json_extract(data, '$.name') IS ? "
+                "AND CAST(json_extract(data, '$.phone') AS TEXT) IS ? "
+                "AND json_extract(data, '$.added_at') IS ?",
+                (safe_name, name, phone, added_at),
+            )
+        return cursor.rowcount > 0
+
+    def delete_submission_by_id(self, safe_name: str, pid: str) -> bool:
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM submissions WHERE safe_name = ? AND participant_id = ?",
+                (safe_name, pid),
+            )
+        return cursor.rowcount > 0
+
+    def drop_submissions(self, safe_name: str) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM submissions WHERE safe_name = ?", (safe_name,))
@@ -0,0 +1,381 @@
+"""Append-only JSON-lines log for project submissions.
+
+Each line of ``<project>_submissions.jsonl`` is either a submission record or a
+tombstone (``{"_deleted": {"id": ...}}``) that retracts the earlier record with
+that participant id. Tombstones written before ids existed carry the
+``(name, phone, added_at)`` triple instead and are still honoured. Appends are
+O(1); reads fold tombstones into the live view, and a background compaction
+rewrites the log once dead lines outweigh live ones.
+
+Each process keeps an id -> byte offset index per log, extended incrementally
+from the last indexed offset, so deletes and single-participant reads by id do
+not scan the file.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.packvote.backend import LOGGER
+
+from .base import participant_id, participant_key, read_submissions_file, with_id
+from .locking import atomic_write_text, file_lock
+
+TOMBSTONE_KEY = "_deleted"
+
+# Compact once at least this many dead lines exist and they outnumber live ones
+COMPACTION_MIN_DEAD_LINES = 32
+
+
+def _dumps(record: dict) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _record_keys(record: dict) -> Tuple[tuple, tuple]:
+    """Keys a tombstone can match a record by: its id and its legacy triple."""
+    return ("id", participant_id(record)), ("key",) + participant_key(record)
+
+
+def _tombstone_key(tombstone: dict) -> tuple:
+    if "id" in tombstone:
+        return ("id", tombstone["id"])
+    return ("key",) + participant_key(tombstone)
+
+
+@dataclass
+class _LogIndex:
+    """Per-process index of one log file, valid for a single inode."""
+
+    inode: Optional[int] = None
+    indexed_bytes: int = 0
+    line_count: int = 0
+    offsets: Dict[str, int] = field(default_factory=dict)
+    triples: Dict[tuple, List[str]] = field(default_factory=dict)
+    dead: int = 0
+    missing_ids: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def reset(self, inode: Optional[int]) -> None:
+        self.inode = inode
+        self.indexed_bytes = 0
+        self.line_count = 0
+        self.offsets = {}
+        self.triples = {}
+        self.dead = 0
+        self.missing_ids = 0
+
+    def apply(self, entry: dict, offset: int) -> None:
+        self.line_count += 1
+        if TOMBSTONE_KEY not in entry:
+            pid = participant_id(entry)
+            self.offsets[pid] = offset
+            self.triples.setdefault(participant_key(entry), []).append(pid)
+            if "id" not in entry:
+                self.missing_ids += 1
+            return
+        self.dead += 1
+        tombstone = entry[TOMBSTONE_KEY]
+        if "id" in tombstone:
+            ids = [tombstone["id"]]
+        else:
+            ids = self.triples.get(participant_key(tombstone), [])
+        for pid in ids:
+            if self.offsets.pop(pid, None) is not None:
+                self.dead += 1
+
+    def live_ids(self, match: dict) -> List[str]:
+        return [
+            pid
+            for pid in self.triples.get(participant_key(match), [])
+            if pid in self.offsets
+        ]
+
+
+_INDEXES: Dict[Path, _LogIndex] = {}
+_INDEXES_GUARD = threading.Lock()
+
+
+def _index_for(path: Path) -> _LogIndex:
+    with _INDEXES_GUARD:
+        index = _INDEXES.get(path)
+        if index is None:
+            index = _INDEXES[path] = _LogIndex()
+        return index
+
+
+class SubmissionLog:
+    """JSON-lines submission log for a single project."""
+
+    def __init__(self, path: Path, legacy_path: Optional[Path] = None):
+        self.path = Path(path)
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self._index = _index_for(self.path.resolve())
+
+    def _locked(self):
+        """Exclusive lock on the log, shared with other threads and workers."""
+        return file_lock(self.path)
+
+    # ---------- Migration ----------
+    def _needs_migration(self) -> bool:
+        return (
+            not self.path.exists()
+            and self.legacy_path is not None
+            and self.legacy_path.exists()
+        )
+
+    def _migrate_legacy(self) -> None:
+        """One-time conversion of a legacy JSON file into the log format.
+
+        Must be called with the log lock held."""
+        if not self._needs_migration():
+            return
+        try:
+            records = read_submissions_file(self.legacy_path)
+        except json.JSONDecodeError:
+            records = []
+        self._write_records([with_id(record) for record in records])
+        self.legacy_path.rename(self.legacy_path.with_suffix(".json.migrated"))
+        LOGGER.info(
+            "Migrated %d submissions from %s to %s",
+            len(records),
+            self.legacy_path,
+            self.path,
+        )
+
+    def _ensure_migrated(self) -> None:
+        if self._needs_migration():
+            with self._locked():
+                self._migrate_legacy()
+
+    def _write_records(self, records: List[dict]) -> None:
+        text = "".join(_dumps(record) for record in records)
+        atomic_write_text(self.path, text, fsync=True)
+
+    # ---------- Index ----------
+    def _refresh_index(self) -> _LogIndex:
+        """Bring the id index up to date, scanning only newly appended bytes.
+
+        Must be called with ``self._index.lock`` held."""
+        index = self._index
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            index.reset(None)
+            return index
+        if stat.st_ino != index.inode or stat.st_size < index.indexed_bytes:
+            # Compacted, replaced or truncated: rebuild from scratch
+            index.reset(stat.st_ino)
+        if stat.st_size == index.indexed_bytes:
+            return index
+        with open(self.path, "rb") as f:
+            f.seek(index.indexed_bytes)
+            offset = index.indexed_bytes
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # A write in progress; index it next time
+                line = raw.strip()
+                if line:
+                    try:
+                        index.apply(json.loads(line), offset)
+                    except json.JSONDecodeError:
+                        index.dead += 1
+                offset += len(raw)
+            index.indexed_bytes = offset
+        return index
+
+    def _read_at(self, offset: int) -> Optional[dict]:
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            line = f.readline()
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            return None
+
+    # ---------- Reads ----------
+    @staticmethod
+    def _entries(f) -> Iterator[Tuple[int, dict]]:
+        """Yield (line number, parsed entry) for every readable line of ``f``."""
+        for line_no, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError:
+                # A torn trailing write; ignore it like an absent line
+                continue
+
+    def _fold(self) -> List[dict]:
+        """Return the live records in insertion order."""
+        try:
+            f = open(self.path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return []
+        records: List[Optional[dict]] = []
+        positions: Dict[tuple, List[int]] = {}
+        with f:
+            for _, entry in self._entries(f):
+                if TOMBSTONE_KEY in entry:
+                    key = _tombstone_key(entry[TOMBSTONE_KEY])
+                    for idx in positions.pop(key, []):
+                        records[idx] = None
+                    continue
+                for key in _record_keys(entry):
+                    positions.setdefault(key, []).append(len(records))
+                records.append(entry)
+        return [r for r in records if r is not None]
+
+    def read(self) -> List[dict]:
+        """Return the live submissions in insertion order.
+
+        Reads take no lock: compaction replaces the file atomically and a torn
+        trailing append is skipped. Records written before ids existed are
+        backfilled with ids on first read."""
+        self._ensure_migrated()
+        live = self._fold()
+        if any("id" not in record for record in live):
+            self.backfill_ids()
+            live = self._fold()
+        return live
+
+    def iter_live(self) -> Iterator[dict]:
+        """Yield live submissions lazily, in insertion order.
+
+        A first pass collects only the tombstones, so memory stays proportional
+        to the number of deletions rather than the size of the log."""
+        self._ensure_migrated()
+        try:
+            f = open(self.path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        # Both passes use one handle so a concurrent compaction (which swaps in
+        # a new file) cannot shift line numbers between them
+        with f:
+            # Last tombstone line for each deleted key
+            deleted: Dict[tuple, int] = {}
+            last_line = -1
+            for line_no, entry in self._entries(f):
+                last_line = line_no
+                if TOMBSTONE_KEY in entry:
+                    deleted[_tombstone_key(entry[TOMBSTONE_KEY])] = line_no
+            f.seek(0)
+            for line_no, entry in self._entries(f):
+                if line_no > last_line:
+                    # Appended after the first pass; its tombstones were not seen
+                    break
+                if TOMBSTONE_KEY in entry:
+                    continue
+                if any(deleted.get(k, -1) > line_no for k in _record_keys(entry)):
+                    continue
+                yield with_id(entry)
+
+    def get(self, pid: str) -> Optional[dict]:
+        """Return the live record with participant id ``pid`` via the index."""
+        self._ensure_migrated()
+        for _ in range(2):
+            with self._index.lock:
+                offset = self._refresh_index().offsets.get(pid)
+            if offset is None:
+                return None
+            try:
+                record = self._read_at(offset)
+            except FileNotFoundError:
+                return None
+            if record is not None and participant_id(record) == pid:
+                return with_id(record)
+            # The file was compacted between the lookup and the read; retry
+        return None
+
+    # ---------- Writes ----------
+    def init(self) -> None:
+        """Create an empty log (migrating a legacy file if present)."""
+        with self._locked():
+            self._migrate_legacy()
+            if not self.path.exists():
+                self.path.touch()
+
+    def append(self, record: dict) -> None:
+        """Append a single submission record."""
+        line = _dumps(record)
+        with self._locked():
+            self._migrate_legacy()
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def append_many(self, records: List[dict], fsync: bool = True) -> None:
+        """Append a batch of records with a single write (and fsync)."""
+        lines = "".join(_dumps(record) for record in records)
+        with self._locked():
+            self._migrate_legacy()
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def _append_tombstone(self, tombstone: dict) -> None:
+        """Append a tombstone and compact if dead lines now dominate.
+
+        Must be called with the log lock and the index lock held."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(_dumps({TOMBSTONE_KEY: tombstone}))
+        index = self._refresh_index()
+        if index.dead >= COMPACTION_MIN_DEAD_LINES and index.dead > len(index.offsets):
+            self.compact_in_background()
+
+    def delete_id(self, pid: str) -> bool:
+        """Tombstone the record with participant id ``pid`` in O(1)."""
+        with self._locked():
+            self._migrate_legacy()
+            with self._index.lock:
+                if pid not in self._refresh_index().offsets:
+                    return False
+                self._append_tombstone({"id": pid})
+        return True
+
+    def delete(self, match: dict) -> bool:
+        """Tombstone records matching the legacy ``(name, phone, added_at)`` triple."""
+        key = participant_key(match)
+        with self._locked():
+            self._migrate_legacy()
+            with self._index.lock:
+                if not self._refresh_index().live_ids(match):
+                    return False
+                self._append_tombstone(dict(zip(("name", "phone", "added_at"), key)))
+        return True
+
+    def remove(self) -> None:
+        """Delete the log file."""
+        with self._locked():
+            if self.path.exists():
+                self.path.unlink()
+
+    # ---------- Compaction ----------
+    def compact(self) -> None:
+        """Rewrite the log with only live records, each carrying an id."""
+        with self._locked():
+            if not self.path.exists():
+                return
+            with self._index.lock:
+                index = self._refresh_index()
+                if not index.dead and not index.missing_ids:
+                    return
+            self._write_records([with_id(record) for record in self._fold()])
+
+    def backfill_ids(self) -> None:
+        """Persist ids for records written before ids were assigned."""
+        self.compact()
+
+    def compact_in_background(self) -> threading.Thread:
+        """Run :meth:`compact` on a daemon thread."""
+        thread = threading.Thread(
+            target=self.compact, name=f"compact-{self.path.name}", daemon=True
+        )
+        thread.start()
+        return thread
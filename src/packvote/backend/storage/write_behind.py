@@ -0,0 +1,142 @@
+"""Group-commit write-behind buffer for submission bursts.
+
+``/submit`` requests enqueue validated records; a single flusher task drains
+the queue in batches (up to ``batch_size`` records or ``max_delay_ms`` after
+the first queued record) and writes each project's batch with one
+``append_submissions`` call, i.e. one fsync per batch, on a worker thread so
+the event loop is never blocked by disk I/O.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from src.packvote.backend import LOGGER
+
+from .base import StorageBackend
+
+_STOP = object()
+
+
+class WriteBehindBuffer:
+    """Queue submissions and flush them to storage in batches."""
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        batch_size: int = 64,
+        max_delay_ms: int = 50,
+        durable: bool = True,
+    ):
+        self.storage = storage
+        self.batch_size = max(1, batch_size)
+        self.max_delay = max(0, max_delay_ms) / 1000
+        self.durable = durable
+        self.batches_flushed = 0
+        self.records_flushed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the flusher task on the running event loop."""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(), name="write-behind-flusher")
+
+    async def submit(self, safe_name: str, record: dict) -> None:
+        """Queue a record; in durable mode, return only once it is on disk.
+
+        Raises:
+            RuntimeError: If the buffer has not been started.
+            Exception: Whatever the storage backend raised while flushing.
+        """
+        if self._queue is None:
+            raise RuntimeError("WriteBehindBuffer.start() has not been called")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((safe_name, record, future))
+        if self.durable:
+            await future
+
+    async def stop(self) -> None:
+        """Drain everything queued so far, then stop the flusher."""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize() if self._queue else 0,
+            "batches_flushed": self.batches_flushed,
+            "records_flushed": self.records_flushed,
+        }
+
+    async def _collect(self, first) -> Tuple[List[tuple], bool]:
+        """Gather a batch starting with ``first``; report whether to stop."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        batch = [first]
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            try:
+                if timeout <= 0:
+                    item = self._queue.get_nowait()
+                else:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _flush(self, batch: List[tuple]) -> None:
+        by_project: Dict[str, List[tuple]] = defaultdict(list)
+        for item in batch:
+            by_project[item[0]].append(item)
+        for safe_name, items in by_project.items():
+            records = [record for _, record, _ in items]
+            try:
+                await asyncio.to_thread(
+                    self.storage.append_submissions, safe_name, records
+                )
+            except Exception as e:
+                # Whatever went wrong, the flusher must keep running and every
+                # waiting /submit must get an answer
+                LOGGER.exception(
+                    "Failed to flush %d submissions for %s", len(records), safe_name
+                )
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                    if not self.durable:
+                        # Nobody awaits the future; mark the exception retrieved
+                        future.exception()
+                continue
+            self.batches_flushed += 1
+            self.records_flushed += len(records)
+            for _, _, future in items:
+                if not future.done():
+                    future.set_result(None)
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+            batch, stopping = await self._collect(first)
+            await self._flush(batch)
+        # Drain anything that raced in behind the stop marker
+        leftover = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                leftover.append(item)
+        if leftover:
+            await self._flush(leftover)
@@ -0,0 +1,195 @@
+"""Trim Tavily responses to the passages worth sending to the model.
+
+Every result's content is split into sentence-aligned chunks. The chunks are
+scored with Okapi BM25 against the search query plus the research focus (the
+group's preferences for the research step in progress), near-identical
+chunks are dropped, and the best ones are kept up to a character budget. The
+kept passages are regrouped under their source result in rank order, so the
+agent sees a few focused snippets instead of the whole payload.
+
+The research focus travels in the ``search_focus`` context variable. Nodes
+set it with ``focus_on`` around the agent call, and the search tool reads it
+without it having to be an argument the model fills in.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from src.packvote.backend import (
+    SEARCH_CHUNK_CHARS,
+    SEARCH_DEDUP_THRESHOLD,
+    SEARCH_RESULT_CHAR_BUDGET,
+)
+
+# Preferences (or other terms) the current research step is about
+search_focus: ContextVar[Tuple[str, ...]] = ContextVar("search_focus", default=())
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that "
+    "the their this to was were will with you your".split()
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+_STATS: Counter = Counter()
+_STATS_LOCK = threading.Lock()
+
+
+@contextmanager
+def focus_on(terms: Iterable[str]) -> Iterator[None]:
+    """Score searches made inside the block against ``terms`` as well."""
+    token = search_focus.set(tuple(terms))
+    try:
+        yield
+    finally:
+        search_focus.reset(token)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def chunk_text(text: str, chunk_chars: int = SEARCH_CHUNK_CHARS) -> List[str]:
+    """Split ``text`` into chunks of whole sentences of about ``chunk_chars``."""
+    chunks: List[str] = []
+    current = ""
+    for sentence in _SENTENCE.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if current and len(current) + len(sentence) + 1 > chunk_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+        # A single sentence longer than the chunk size is cut hard
+        while len(current) > chunk_chars:
+            chunks.append(current[:chunk_chars])
+            current = current[chunk_chars:]
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def bm25_scores(query: Sequence[str], documents: Sequence[Sequence[str]]) -> np.ndarray:
+    """Okapi BM25 score of every tokenized document for the query tokens."""
+    if not documents:
+        return np.zeros(0)
+    terms = sorted(set(query))
+    if not terms:
+        return np.zeros(len(documents))
+    index = {term: col for col, term in enumerate(terms)}
+    freqs = np.zeros((len(documents), len(terms)))
+    for row, document in enumerate(documents):
+        for token in document:
+            col = index.get(token)
+            if col is not None:
+                freqs[row, col] += 1
+    lengths = np.array([len(document) for document in documents], dtype=float)
+    avg_length = lengths.mean() or 1.0
+    doc_freq = (freqs > 0).sum(axis=0)
+    idf = np.log1p((len(documents) - doc_freq + 0.5) / (doc_freq + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / avg_length)
+    tf = freqs * (BM25_K1 + 1) / (freqs + norm[:, None])
+    # Query terms that repeat (e.g. in both the query and the focus) count more
+    weights = np.array([query.count(term) for term in terms], dtype=float)
+    return (tf * idf) @ weights
+
+
+def _near_duplicate(tokens: set, kept: List[set], threshold: float) -> bool:
+    for other in kept:
+        union = len(tokens | other)
+        if union and len(tokens & other) / union >= threshold:
+            return True
+    return False
+
+
+def filter_results(
+    results: dict,
+    query: str,
+    focus: Sequence[str] = (),
+    char_budget: int = SEARCH_RESULT_CHAR_BUDGET,
+    chunk_chars: int = SEARCH_CHUNK_CHARS,
+    dedup_threshold: float = SEARCH_DEDUP_THRESHOLD,
+) -> dict:
+    """The top-scoring, deduplicated passages of a Tavily response."""
+    entries = results.get("results") or []
+    chunks: List[Tuple[int, str]] = [
+        (position, chunk)
+        for position, entry in enumerate(entries)
+        for chunk in chunk_text(
+            entry.get("raw_content") or entry.get("content") or "", chunk_chars
+        )
+    ]
+    tokens = [tokenize(chunk) for _, chunk in chunks]
+    scores = bm25_scores(tokenize(" ".join([query, *focus])), tokens)
+
+    kept: List[int] = []
+    kept_tokens: List[set] = []
+    used = duplicates = 0
+    # Chunks sharing no term with the query are only kept if none do
+    matched = bool(scores.any())
+    # Stable sort keeps Tavily's own ranking between equal scores
+    for idx in np.argsort(-scores, kind="stable"):
+        text = chunks[idx][1]
+        if matched and scores[idx] <= 0:
+            break
+        if used + len(text) > char_budget:
+            continue
+        token_set = set(tokens[idx])
+        if _near_duplicate(token_set, kept_tokens, dedup_threshold):
+            duplicates += 1
+            continue
+        kept.append(idx)
+        kept_tokens.append(token_set)
+        used += len(text)
+
+    passages: dict = {}
+    for idx in kept:
+        position, text = chunks[idx]
+        passages.setdefault(position, []).append(text)
+    filtered = {
+        "query": results.get("query", query),
+        "results": [
+            {
+                "title": entries[position].get("title"),
+                "url": entries[position].get("url"),
+                "content": " ... ".join(texts),
+            }
+            for position, texts in passages.items()
+        ],
+    }
+    if results.get("answer"):
+        filtered["answer"] = results["answer"]
+
+    chars_in = sum(len(text) for _, text in chunks)
+    with _STATS_LOCK:
+        _STATS["calls"] += 1
+        _STATS["chunks_in"] += len(chunks)
+        _STATS["chunks_kept"] += len(kept)
+        _STATS["duplicates"] += duplicates
+        _STATS["chars_in"] += chars_in
+        _STATS["chars_out"] += used
+    return filtered
+
+
+def filter_stats() -> dict:
+    """Chunks and characters seen versus kept across all filtered searches."""
+    with _STATS_LOCK:
+        stats = dict(_STATS)
+    chars_in = stats.get("chars_in", 0)
+    stats["reduction"] = (
+        round(1 - stats.get("chars_out", 0) / chars_in, 3) if chars_in else 0.0
+    )
+    return stats
@@ -1,7 +1,41 @@
+from functools import lru_cache
+from pathlib import Path
+
+import requests
 from langchain.tools import tool
+from requests.adapters import HTTPAdapter
 from tavily import TavilyClient
 
-from src.packvote.backend import TAVILY_API_KEY
+from src.packvote.backend import (
+    TAVILY_API_KEY,
+    TAVILY_CACHE_PATH,
+    TAVILY_CACHE_STALE_S,
+    TAVILY_CACHE_TTL_S,
+    TAVILY_MAX_CONNECTIONS,
+)
+from src.packvote.backend.tools.result_filter import filter_results, search_focus
+from src.packvote.backend.tools.search_cache import CachedSearch, SearchCache
+
+
+def _tavily_client() -> TavilyClient:
+    """One Tavily client whose session pools keep-alive connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=TAVILY_MAX_CONNECTIONS)
+    session.mount("https://", adapter)
+    return TavilyClient(api_key=TAVILY_API_KEY, session=session)
+
+
+@lru_cache(maxsize=1)
+def cached_search() -> CachedSearch:
+    """Process-wide cached Tavily search built from the PACKVOTE_* settings."""
+    return CachedSearch(
+        _tavily_client,
+        SearchCache(
+            db_path=Path(TAVILY_CACHE_PATH) if TAVILY_CACHE_PATH else None,
+            ttl_seconds=TAVILY_CACHE_TTL_S,
+            stale_seconds=TAVILY_CACHE_STALE_S,
+        ),
+    )
 
 
 @tool
@@ -15,7 +49,6 @@ def search_tavily(query: str, max_results: int) -> str:
         str: The results of the search.
     """
 
-    client = TavilyClient(api_key=TAVILY_API_KEY)
-
-    results = client.search(query=query, max_results=max_results)
-    return results
+    results = cached_search().search(query, max_results)
+    # Only the passages relevant to the query and the group's focus reach the LLM
+    return filter_results(results, query, search_focus.get())
@@ -0,0 +1,214 @@
+"""Cached, coalesced Tavily search shared by every agent tool call.
+
+Results are stored in SQLite keyed by the normalized query. An entry fetched
+with ``max_results=n`` answers any later call asking for ``n`` or fewer
+results by slicing. Fresh entries are served directly. Entries past their TTL
+but inside the stale window are served immediately while one background
+request refreshes them (stale-while-revalidate). Identical calls made while a
+request is in flight wait for that request instead of sending their own, and
+all requests go through one ``TavilyClient`` whose HTTP session keeps its
+connections alive.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from src.packvote.backend import LOGGER
+
+# Tavily accepts between 1 and 20 results per search
+MAX_RESULTS_LIMIT = 20
+
+
+def normalize_search(query: str, max_results: int) -> Tuple[str, int]:
+    """Cache key and clamped result count for a search."""
+    return " ".join(query.lower().split()), min(
+        max(int(max_results), 1), MAX_RESULTS_LIMIT
+    )
+
+
+def _slice(results: dict, max_results: int) -> dict:
+    if len(results.get("results", [])) <= max_results:
+        return results
+    return {**results, "results": results["results"][:max_results]}
+
+
+class SearchCache:
+    """SQLite table of search results with a TTL and a stale window."""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        ttl_seconds: float = 86400,
+        stale_seconds: float = 7 * 86400,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._lock = threading.Lock()
+        db_path = Path(db_path) if db_path is not None else None
+        if db_path is not None:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            db_path if db_path is not None else ":memory:", check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS search ("
+            "query TEXT PRIMARY KEY, max_results INTEGER NOT NULL, "
+            "fetched_at REAL NOT NULL, data TEXT NOT NULL)"
+        )
+
+    def get(self, key: str, max_results: int) -> Optional[Tuple[dict, bool, int]]:
+        """``(results, stale, fetched_max_results)`` for ``key`` if an entry
+        with enough results is inside its TTL plus stale window, else None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT max_results, fetched_at, data FROM search WHERE query = ?",
+                (key,),
+            ).fetchone()
+        if row is None or row[0] < max_results:
+            return None
+        age = time.time() - row[1]
+        if age > self.ttl_seconds + self.stale_seconds:
+            return None
+        return (
+            _slice(json.loads(row[2]), max_results),
+            age > self.ttl_seconds,
+            row[0],
+        )
+
+    def set(self, key: str, max_results: int, results: dict) -> None:
+        """Store ``results`` for ``key``, fetched with ``max_results``."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO search (query, max_results, fetched_at, data) "
+                "VALUES (?, ?, ?, ?)",
+                (key, max_results, time.time(), json.dumps(results)),
+            )
+
+    def purge_expired(self) -> int:
+        """Delete entries past their stale window; returns how many."""
+        cutoff = time.time() - self.ttl_seconds - self.stale_seconds
+        with self._lock, self._db:
+            return self._db.execute(
+                "DELETE FROM search WHERE fetched_at < ?", (cutoff,)
+            ).rowcount
+
+
+class CachedSearch:
+    """Tavily searches through a :class:`SearchCache`, coalesced per query."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], object],
+        cache: Optional[SearchCache] = None,
+        max_refresh_workers: int = 2,
+    ):
+        self.client_factory = client_factory
+        self.cache = cache or SearchCache()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.requests = 0
+        self.refresh_errors = 0
+        self._client = None
+        self._lock = threading.Lock()
+        # key -> (future, max_results) of the upstream request in flight
+        self._in_flight: Dict[str, Tuple[Future, int]] = {}
+        self._refreshing: Set[str] = set()
+        self._refresher = ThreadPoolExecutor(
+            max_workers=max(1, max_refresh_workers), thread_name_prefix="search-swr"
+        )
+
+    @property
+    def client(self):
+        """The shared Tavily client, created on first use."""
+        with self._lock:
+            if self._client is None:
+                self._client = self.client_factory()
+            return self._client
+
+    def search(self, query: str, max_results: int) -> dict:
+        """Tavily results for ``query``, from the cache when possible."""
+        key, max_results = normalize_search(query, max_results)
+        cached = self.cache.get(key, max_results)
+        if cached is not None:
+            results, stale, fetched_max_results = cached
+            if stale:
+                self.stale_hits += 1
+                with self._lock:
+                    refresh = key not in self._refreshing
+                    self._refreshing.add(key)
+                if refresh:
+                    # Refresh the whole entry, not just the slice asked for
+                    self._refresher.submit(
+                        self._refresh, query, key, fetched_max_results
+                    )
+            else:
+                self.hits += 1
+            return results
+        self.misses += 1
+        return _slice(self._fetch(query, key, max_results).result(), max_results)
+
+    def _refresh(self, query: str, key: str, max_results: int) -> None:
+        try:
+            self._fetch(query, key, max_results).result()
+        except Exception:
+            # Tavily raises plain Exception subclasses; keep serving the stale
+            # entry whatever the refresh failed with
+            self.refresh_errors += 1
+            LOGGER.exception("Background refresh of search %r failed", query)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _fetch(self, query: str, key: str, max_results: int) -> Future:
+        """Future for the upstream search of ``key``, shared while in flight.
+
+        A request already in flight for at least ``max_results`` results is
+        reused; otherwise this thread sends the request itself and re-raises
+        its error after handing it to the other waiters."""
+        with self._lock:
+            pending = self._in_flight.get(key)
+            if pending is not None and pending[1] >= max_results:
+                self.coalesced += 1
+                return pending[0]
+            future: Future = Future()
+            self._in_flight[key] = (future, max_results)
+        try:
+            self.requests += 1
+            results = self.client.search(query=query, max_results=max_results)
+            self.cache.set(key, max_results, results)
+            future.set_result(results)
+        except Exception as e:
+            # Callers waiting on the same request get the error too
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                if self._in_flight.get(key, (None,))[0] is future:
+                    del self._in_flight[key]
+        return future
+
+    def stats(self) -> dict:
+        """Cache, coalescing and upstream request counters."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": (
+                round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0
+            ),
+            "coalesced": self.coalesced,
+            "requests": self.requests,
+            "refresh_errors": self.refresh_errors,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,195 @@
+"""Token-budgeted compaction of the message history sent to a model.
+
+Raw Tavily payloads and itinerary drafts pile up in the history with every
+research loop. When a history is over budget it is compacted in passes, each
+only as far as needed:
+
+1. older tool outputs are cut to a short excerpt;
+2. superseded research drafts (every worker result but the latest) are cut
+   to an excerpt;
+3. the oldest remaining messages are dropped, an assistant tool call
+   together with its tool results so the sequence stays valid.
+
+System messages, the latest user request, the latest draft (and the text of
+``latest_itinerary``), evaluator verdicts and the current tool-calling step
+are never touched. Token counts use ``count_tokens_approximately``.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.messages.utils import (
+    convert_to_messages,
+    count_tokens_approximately,
+)
+
+from src.packvote.backend import LOGGER
+
+DRAFT_NAMES = frozenset({"search_activity", "itinerary_researcher"})
+VERDICT_NAMES = frozenset({"binary_grader"})
+TOOL_EXCERPT_CHARS = 400
+DRAFT_EXCERPT_CHARS = 800
+
+_STATS: Dict[str, Counter] = defaultdict(Counter)
+
+
+@dataclass(frozen=True)
+class CompactionReport:
+    tokens_before: int
+    tokens_after: int
+    truncated: int = 0
+    dropped: int = 0
+
+    @property
+    def compacted(self) -> bool:
+        return self.tokens_after < self.tokens_before
+
+
+def _tokens(message: BaseMessage) -> int:
+    return count_tokens_approximately([message])
+
+
+def _excerpt(message: BaseMessage, chars: int, note: str) -> BaseMessage:
+    text = message.content if isinstance(message.content, str) else str(message.content)
+    if len(text) <= chars:
+        return message
+    return message.model_copy(
+        update={"content": f"{text[:chars]}... [{note}, {len(text):,} chars]"}
+    )
+
+
+def _protected(messages: Sequence[BaseMessage], latest_itinerary: Optional[str]) -> set:
+    protected = set()
+    last_request = last_draft = last_tool_call = None
+    for idx, message in enumerate(messages):
+        name = getattr(message, "name", None)
+        if message.type == "system" or name in VERDICT_NAMES:
+            protected.add(idx)
+        elif message.type == "human" and not name:
+            last_request = idx
+        elif name in DRAFT_NAMES:
+            last_draft = idx
+        if latest_itinerary and message.content == latest_itinerary:
+            protected.add(idx)
+        if isinstance(message, AIMessage) and message.tool_calls:
+            last_tool_call = idx
+    protected.update(i for i in (last_request, last_draft) if i is not None)
+    # A step in progress: the last tool call whose results the model has not
+    # answered yet
+    if last_tool_call is not None and all(
+        isinstance(message, ToolMessage) for message in messages[last_tool_call + 1 :]
+    ):
+        protected.update(range(last_tool_call, len(messages)))
+    return protected
+
+
+def _units(messages: Sequence[BaseMessage]) -> List[List[int]]:
+    """Indices grouped so a tool-calling assistant message and its tool
+    results are dropped together."""
+    units: List[List[int]] = []
+    for idx, message in enumerate(messages):
+        if isinstance(message, ToolMessage) and units:
+            units[-1].append(idx)
+        else:
+            units.append([idx])
+    return units
+
+
+def compact_messages(
+    messages: Sequence,
+    max_tokens: int,
+    latest_itinerary: Optional[str] = None,
+) -> Tuple[List[BaseMessage], CompactionReport]:
+    """Fit ``messages`` into ``max_tokens`` (approximate) where possible."""
+    messages = convert_to_messages(messages)
+    sizes = [_tokens(message) for message in messages]
+    before = sum(sizes)
+    if before <= max_tokens:
+        return messages, CompactionReport(before, before)
+
+    protected = _protected(messages, latest_itinerary)
+    total, truncated = before, 0
+    for kinds, chars, note in (
+        ("tool", TOOL_EXCERPT_CHARS, "tool output truncated"),
+        ("draft", DRAFT_EXCERPT_CHARS, "superseded draft truncated"),
+    ):
+        for idx, message in enumerate(messages):
+            if total <= max_tokens:
+                break
+            if idx in protected:
+                continue
+            is_tool = isinstance(message, ToolMessage)
+            is_draft = getattr(message, "name", None) in DRAFT_NAMES
+            if (kinds == "tool" and is_tool) or (kinds == "draft" and is_draft):
+                shortened = _excerpt(message, chars, note)
+                if shortened is not message:
+                    messages[idx] = shortened
+                    new_size = _tokens(shortened)
+                    total += new_size - sizes[idx]
+                    sizes[idx] = new_size
+                    truncated += 1
+
+    dropped = set()
+    for unit in _units(messages):
+        if total <= max_tokens:
+            break
+        if any(idx in protected for idx in unit):
+            continue
+        dropped.update(unit)
+        total -= sum(sizes[idx] for idx in unit)
+
+    kept = [message for idx, message in enumerate(messages) if idx not in dropped]
+    return kept, CompactionReport(before, total, truncated, len(dropped))
+
+
+def record(node: str, report: CompactionReport) -> None:
+    """Add a compaction to the per-node counters and log it."""
+    stats = _STATS[node]
+    stats["calls"] += 1
+    stats["tokens_before"] += report.tokens_before
+    stats["tokens_after"] += report.tokens_after
+    if report.compacted:
+        stats["compactions"] += 1
+        stats["truncated"] += report.truncated
+        stats["dropped"] += report.dropped
+        LOGGER.info(
+            "Compacted %s context: %d -> %d tokens (%d truncated, %d dropped)",
+            node,
+            report.tokens_before,
+            report.tokens_after,
+            report.truncated,
+            report.dropped,
+        )
+
+
+def compaction_stats() -> Dict[str, dict]:
+    """Per-node totals of tokens before and after compaction."""
+    return {node: dict(stats) for node, stats in _STATS.items()}
+
+
+class CompactionMiddleware(AgentMiddleware):
+    """Compacts the messages of every model call inside an agent loop.
+
+    Only the request sent to the model is compacted; the agent's own message
+    state keeps the full history."""
+
+    def __init__(self, max_tokens: int, node: str = "agent"):
+        super().__init__()
+        self.max_tokens = max_tokens
+        self.node = node
+
+    def _compact(self, request):
+        messages, report = compact_messages(request.messages, self.max_tokens)
+        record(self.node, report)
+        return request.override(messages=messages) if report.compacted else request
+
+    def wrap_model_call(self, request, handler):
+        return handler(self._compact(request))
+
+    async def awrap_model_call(self, request, handler):
+        return await handler(self._compact(request))
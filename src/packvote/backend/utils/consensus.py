@@ -0,0 +1,118 @@
+"""Vectorized group consensus over traveler surveys.
+
+Budgets become two arrays of range endpoints and interests a boolean
+traveler x preference matrix, so the summary for a group of thousands is a
+handful of NumPy reductions instead of prompt text the LLM has to reason over.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.packvote.backend import PREFERENCES
+from src.packvote.backend.utils.langgraph_elements import (
+    GroupConsensus,
+    TravelerConflict,
+    UserSurvey,
+)
+
+# Travelers reported in ``GroupConsensus.conflicts``
+MAX_CONFLICTS = 5
+
+
+def budget_interval(lows: np.ndarray, highs: np.ndarray) -> tuple[float, float, int]:
+    """Shared budget interval and how many travelers it satisfies.
+
+    Returns the intersection of all ranges when it exists. Otherwise returns the
+    intersection of the largest group of ranges that share a common point (the
+    maximum depth of the interval overlap), found by evaluating the overlap
+    depth at every range start.
+    """
+    lows_sorted = np.sort(lows)
+    highs_sorted = np.sort(highs)
+    # Ranges containing each candidate point: started at or before it, not yet ended
+    depth = np.searchsorted(lows_sorted, lows, side="right") - np.searchsorted(
+        highs_sorted, lows, side="left"
+    )
+    point = lows[np.argmax(depth)]
+    covering = (lows <= point) & (highs >= point)
+    return (
+        float(lows[covering].max()),
+        float(highs[covering].min()),
+        int(covering.sum()),
+    )
+
+
+def preference_matrix(
+    user_surveys: Sequence[UserSurvey], preferences: Sequence[str]
+) -> tuple[np.ndarray, List[str]]:
+    """Boolean traveler x preference matrix.
+
+    Columns follow ``preferences``; interests outside it are appended as extra
+    columns so free-form answers still count."""
+    columns: Dict[str, int] = {pref: idx for idx, pref in enumerate(preferences)}
+    rows, cols = [], []
+    for row, survey in enumerate(user_surveys):
+        for pref in survey.preferences:
+            rows.append(row)
+            cols.append(columns.setdefault(pref, len(columns)))
+    matrix = np.zeros((len(user_surveys), len(columns)), dtype=bool)
+    matrix[rows, cols] = True
+    return matrix, list(columns)
+
+
+def compute_group_consensus(
+    user_surveys: Sequence[UserSurvey],
+    preferences: Optional[Sequence[str]] = None,
+    max_conflicts: int = MAX_CONFLICTS,
+) -> GroupConsensus:
+    """Summarize the group's shared budget, interests and outliers."""
+    travelers = len(user_surveys)
+    if not travelers:
+        return GroupConsensus(travelers=0)
+
+    ranges = np.array(
+        [[float(s.budget_range[0]), float(s.budget_range[1])] for s in user_surveys]
+    )
+    lows, highs = ranges.min(axis=1), ranges.max(axis=1)
+    low, high, covered = budget_interval(lows, highs)
+
+    matrix, columns = preference_matrix(user_surveys, preferences or PREFERENCES)
+    votes = matrix.sum(axis=0)
+    order = np.argsort(-votes, kind="stable")
+    preference_votes = {columns[i]: int(votes[i]) for i in order if votes[i]}
+
+    # Budget gap: distance outside the group interval, relative to all budgets
+    span = max(float(highs.max() - lows.min()), 1.0)
+    gaps = np.maximum(0.0, np.maximum(low - highs, lows - high)) / span
+    # Preference alignment: mean share of the group voting for each pick
+    picks = matrix.sum(axis=1)
+    shares = votes / travelers
+    alignment = np.divide(
+        matrix @ shares, picks, out=np.ones(travelers), where=picks > 0
+    )
+    scores = 0.5 * gaps + 0.5 * (1.0 - alignment)
+
+    k = min(max_conflicts, travelers)
+    worst = np.argpartition(-scores, k - 1)[:k] if k else []
+    worst = sorted(worst, key=lambda i: -scores[i])
+    conflicts = [
+        TravelerConflict(
+            name=user_surveys[i].name,
+            score=round(float(scores[i]), 3),
+            budget_gap=round(float(gaps[i] * span), 2),
+            preference_alignment=round(float(alignment[i]), 3),
+        )
+        for i in worst
+        if scores[i] > 0
+    ]
+
+    return GroupConsensus(
+        travelers=travelers,
+        budget_interval=[low, high],
+        budget_coverage=round(covered / travelers, 3),
+        preference_votes=preference_votes,
+        conflicts=conflicts,
+    )
@@ -0,0 +1,148 @@
+"""Deterministic pre-ranking of candidate destinations for a group.
+
+A local catalog of destinations (name, coordinates, estimated cost per person
+and preference tags) is scored against every traveler at once:
+
+* preference fit: traveler x preference matrix times the destination x tag
+  matrix, i.e. the share of each traveler's interests a destination covers;
+* budget fit: 1 when the estimated cost is inside a traveler's range, falling
+  off linearly with the relative distance outside it;
+* distance fit: mean haversine distance from the travelers' origins, scaled
+  against the closest and farthest destination in the catalog.
+
+Only the top-k destinations are handed to the research agent, so it searches
+a few concrete places instead of exploring the whole world.
+"""
+
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.packvote.backend import DESTINATION_TOP_K, PREFERENCES
+from src.packvote.backend.geo import Geocoder, haversine_matrix
+from src.packvote.backend.utils.consensus import preference_matrix
+from src.packvote.backend.utils.langgraph_elements import UserSurvey
+
+# Relative weight of each score component; renormalized over the ones available
+SCORE_WEIGHTS = {"preferences": 0.5, "budget": 0.3, "distance": 0.2}
+
+
+@lru_cache(maxsize=4)
+def load_catalog(path: str) -> tuple:
+    """Destinations from a JSON list of ``{name, lat, lon, est_cost, tags}``.
+
+    Entries without a name are skipped; coordinates and cost are optional."""
+    with open(Path(path), "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    return tuple(entry for entry in entries if entry.get("name"))
+
+
+def _optional_floats(catalog: Sequence[dict], *keys: str) -> np.ndarray:
+    values = np.full((len(catalog), len(keys)), np.nan)
+    for row, entry in enumerate(catalog):
+        for col, key in enumerate(keys):
+            if entry.get(key) is not None:
+                values[row, col] = float(entry[key])
+    return values
+
+
+def preference_fit(
+    user_surveys: Sequence[UserSurvey], catalog: Sequence[dict]
+) -> np.ndarray:
+    """Mean share of each traveler's interests covered by every destination."""
+    travelers, columns = preference_matrix(user_surveys, PREFERENCES)
+    index = {pref: idx for idx, pref in enumerate(columns)}
+    tags = np.zeros((len(catalog), len(columns)), dtype=bool)
+    for row, entry in enumerate(catalog):
+        for tag in entry.get("tags", []):
+            if tag in index:
+                tags[row, index[tag]] = True
+    picks = travelers.sum(axis=1, keepdims=True)
+    covered = travelers.astype(float) @ tags.T.astype(float)
+    shares = np.divide(covered, picks, out=np.zeros_like(covered), where=picks > 0)
+    return shares.mean(axis=0)
+
+
+def budget_fit(
+    user_surveys: Sequence[UserSurvey], catalog: Sequence[dict]
+) -> np.ndarray:
+    """Mean budget fit of every destination; NaN where the cost is unknown."""
+    ranges = np.array(
+        [[float(s.budget_range[0]), float(s.budget_range[1])] for s in user_surveys]
+    )
+    ranges.sort(axis=1)
+    # Groups share a few budget cards, so score each distinct range once
+    ranges, counts = np.unique(ranges, axis=0, return_counts=True)
+    lows, highs = ranges[:, 0:1], ranges[:, 1:2]
+    costs = _optional_floats(catalog, "est_cost")[:, 0]
+    gaps = np.maximum(0.0, np.maximum(costs - highs, lows - costs))
+    fit = np.clip(1.0 - gaps / np.maximum(costs, 1.0), 0.0, 1.0)
+    return counts @ fit / counts.sum()
+
+
+def rank_destinations(
+    user_surveys: Sequence[UserSurvey],
+    catalog: Sequence[dict],
+    geocoder: Optional[Geocoder] = None,
+    top_k: int = DESTINATION_TOP_K,
+    weights: Optional[Dict[str, float]] = None,
+) -> List[dict]:
+    """Best ``top_k`` catalog destinations for the group, best first.
+
+    Each row carries the weighted score and its components. Distance is only
+    scored when a geocoder is given and at least one traveler origin and the
+    destination coordinates are known; otherwise the remaining weights are
+    renormalized.
+    """
+    if not user_surveys or not catalog:
+        return []
+    weights = weights or SCORE_WEIGHTS
+    components = {
+        "preferences": preference_fit(user_surveys, catalog),
+        "budget": budget_fit(user_surveys, catalog),
+    }
+
+    mean_km = np.full(len(catalog), np.nan)
+    if geocoder is not None:
+        origins = geocoder.geocode_many([s.current_location for s in user_surveys])
+        origins = origins[~np.isnan(origins).any(axis=1)]
+        origins, counts = np.unique(origins, axis=0, return_counts=True)
+        coords = _optional_floats(catalog, "lat", "lon")
+        located = ~np.isnan(coords).any(axis=1)
+        if len(origins) and located.any():
+            distances = haversine_matrix(origins, coords[located])
+            mean_km[located] = counts @ distances / counts.sum()
+            near, far = mean_km[located].min(), mean_km[located].max()
+            components["distance"] = 1.0 - (mean_km - near) / max(far - near, 1.0)
+
+    # Unknown values (no cost, no coordinates) count as neutral
+    total = np.zeros(len(catalog))
+    weight_sum = sum(weights.get(name, 0.0) for name in components)
+    for name, values in components.items():
+        total += weights.get(name, 0.0) * np.nan_to_num(values, nan=0.5)
+    total /= max(weight_sum, 1e-9)
+
+    k = min(top_k, len(catalog))
+    best = np.argpartition(-total, k - 1)[:k]
+    best = sorted(best, key=lambda j: (-total[j], catalog[j]["name"]))
+    return [
+        {
+            "destination": catalog[j]["name"],
+            "score": round(float(total[j]), 3),
+            "preference_fit": round(float(components["preferences"][j]), 3),
+            "budget_fit": (
+                None
+                if np.isnan(components["budget"][j])
+                else round(float(components["budget"][j]), 3)
+            ),
+            "mean_km": None if np.isnan(mean_km[j]) else round(float(mean_km[j]), 1),
+            "est_cost": catalog[j].get("est_cost"),
+            "tags": list(catalog[j].get("tags", [])),
+        }
+        for j in best
+    ]
@@ -1,4 +1,4 @@
-from typing import List, Literal, Optional, TypedDict
+from typing import Annotated, Dict, List, Literal, Optional, TypedDict
 
 from langgraph.graph import MessagesState
 from pydantic import BaseModel, Field, field_validator
@@ -37,6 +37,39 @@ class UserSurvey(BaseModel):
         return v
 
 
+class TravelerConflict(BaseModel):
+    """How far one traveler is from the group consensus."""
+
+    name: str = Field(description="The name of the traveler")
+    score: float = Field(description="Overall conflict score in [0, 1]")
+    budget_gap: float = Field(
+        description="Distance from the traveler's budget to the group interval"
+    )
+    preference_alignment: float = Field(
+        description="Mean share of the group that voted for the traveler's interests"
+    )
+
+
+class GroupConsensus(BaseModel):
+    """Precomputed group-level summary of the traveler surveys."""
+
+    travelers: int = Field(description="Number of travelers in the group")
+    budget_interval: Optional[List[float]] = Field(
+        default=None,
+        description="Shared budget [low, high], or the best-coverage interval",
+    )
+    budget_coverage: float = Field(
+        default=0.0,
+        description="Fraction of travelers whose budget contains the interval",
+    )
+    preference_votes: Dict[str, int] = Field(
+        default_factory=dict, description="Votes per preference, most popular first"
+    )
+    conflicts: List[TravelerConflict] = Field(
+        default_factory=list, description="Travelers furthest from the consensus"
+    )
+
+
 class BinaryEvaluation(BaseModel):
     """Binary approval signal returned by the evaluator."""
 
@@ -52,6 +85,23 @@ class BinaryEvaluation(BaseModel):
     )
 
 
+def merge_findings(
+    existing: Optional[List[dict]], new: Optional[List[dict]]
+) -> List[dict]:
+    """Reducer for parallel research branches.
+
+    Findings are keyed by (destination, preferences); a newer finding for the
+    same branch replaces the older one, otherwise order is kept. Writing None
+    clears the findings before a new fan-out."""
+    if new is None:
+        return []
+    merged = {
+        (finding["destination"], tuple(finding["preferences"])): finding
+        for finding in (existing or []) + (new or [])
+    }
+    return list(merged.values())
+
+
 class State(MessagesState):
     """State for the supervisor node."""
 
@@ -62,7 +112,31 @@ class State(MessagesState):
     travel_duration: Optional[int] = Field(
         description="The preferred travel duration of the group of users",
     )
+    travel_windows: Optional[List[dict]] = Field(
+        default=None,
+        description="Trip windows ranked by how many travelers can attend",
+    )
     user_surveys: List[UserSurvey] = Field(description="The user surveys")
+    travel_burden: Optional[List[dict]] = Field(
+        default=None,
+        description="Per-destination traveler distance fairness (max/mean/variance)",
+    )
+    destination_candidates: Optional[List[dict]] = Field(
+        default=None,
+        description="Top catalog destinations pre-ranked against the group",
+    )
+    requested_destinations: Optional[List[str]] = Field(
+        default=None,
+        description="Destinations named in the project's surveys; always researched",
+    )
+    group_consensus: Optional[GroupConsensus] = Field(
+        default=None,
+        description="Budget, interest and conflict summary of the user surveys",
+    )
+    research_findings: Annotated[List[dict], merge_findings] = Field(
+        default_factory=list,
+        description="Per destination and preference cluster research results",
+    )
     latest_itinerary: Optional[str] = Field(
         default=None,
         description="Latest generated itinerary draft shared among nodes",
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from typing import Sequence
 
-from src.packvote.backend.utils.langgraph_elements import UserSurvey
+from src.packvote.backend.utils.langgraph_elements import GroupConsensus, UserSurvey
 
 
 def format_user_surveys(
@@ -30,3 +30,91 @@ def format_user_surveys(
             )
         )
     return "\n\n".join(sections)
+
+
+def format_group_consensus(consensus: GroupConsensus) -> str:
+    """Render the precomputed group consensus as a short prompt section."""
+    if not consensus.travelers:
+        return "No traveler surveys."
+    lines = [f"Travelers: {consensus.travelers}"]
+    if consensus.budget_interval:
+        low, high = consensus.budget_interval
+        lines.append(
+            f"- Shared budget: ${low:,.0f} - ${high:,.0f} "
+            f"(fits {consensus.budget_coverage:.0%} of travelers)"
+        )
+    if consensus.preference_votes:
+        votes = ", ".join(
+            f"{pref} ({count})" for pref, count in consensus.preference_votes.items()
+        )
+        lines.append(f"- Interests by votes: {votes}")
+    for conflict in consensus.conflicts:
+        details = [f"interest alignment {conflict.preference_alignment:.0%}"]
+        if conflict.budget_gap:
+            details.append(f"budget ${conflict.budget_gap:,.0f} outside shared range")
+        lines.append(f"- Tradeoff: {conflict.name} ({'; '.join(details)})")
+    return "\n".join(lines)
+
+
+def format_trip_dates(travel_date: str, travel_duration: int) -> str:
+    """Render the planned trip dates, or an empty string if they are unknown."""
+    if not travel_date or not travel_duration:
+        return ""
+    start_date = datetime.strptime(travel_date, "%Y-%m-%d")
+    end_date = start_date + timedelta(days=travel_duration - 1)
+    return (
+        f"Trip dates: {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d} "
+        f"({travel_duration} days)"
+    )
+
+
+def format_travel_windows(travel_windows: Sequence[dict]) -> str:
+    """Render ranked trip windows, one per line."""
+    return "\n".join(
+        f"- {window['start']} to {window['end']}: "
+        f"{window['attendees']} travelers ({', '.join(map(str, window['travelers']))})"
+        for window in travel_windows
+    )
+
+
+def format_travel_burden(travel_burden: Sequence[dict]) -> str:
+    """Render per-destination travel distances, fairest first."""
+    return "\n".join(
+        f"- {row['destination']}: mean {row['mean_km']:,.0f} km, "
+        f"max {row['max_km']:,.0f} km, std {row['var_km2'] ** 0.5:,.0f} km"
+        for row in travel_burden
+    )
+
+
+def format_destination_candidates(candidates: Sequence[dict]) -> str:
+    """Render pre-ranked destinations with their score components."""
+    lines = []
+    for rank, row in enumerate(candidates, start=1):
+        details = [f"interest fit {row['preference_fit']:.0%}"]
+        if row["budget_fit"] is not None:
+            details.append(
+                f"budget fit {row['budget_fit']:.0%} at ~${row['est_cost']:,.0f}"
+            )
+        if row["mean_km"] is not None:
+            details.append(f"mean distance {row['mean_km']:,.0f} km")
+        if row["tags"]:
+            details.append(", ".join(row["tags"]))
+        lines.append(
+            f"{rank}. {row['destination']} (score {row['score']:.2f}; "
+            f"{'; '.join(details)})"
+        )
+    return "\n".join(lines)
+
+
+def format_research_findings(findings: Sequence[dict]) -> str:
+    """Findings grouped by destination as markdown sections."""
+    by_destination: dict = {}
+    for finding in findings:
+        by_destination.setdefault(finding["destination"], []).append(finding)
+    sections = []
+    for destination, rows in by_destination.items():
+        parts = [f"## {destination}"]
+        for row in rows:
+            parts.append(f"### {', '.join(row['preferences'])}\n{row['summary']}")
+        sections.append("\n\n".join(parts))
+    return "\n\n".join(sections)
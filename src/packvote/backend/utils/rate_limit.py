@@ -0,0 +1,23 @@
+"""Process-wide request rate limit shared by every chat model."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional
+
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+from src.packvote.backend import LLM_MAX_BURST, LLM_REQUESTS_PER_SECOND
+
+
+@lru_cache(maxsize=1)
+def default_rate_limiter() -> Optional[InMemoryRateLimiter]:
+    """Token bucket shared by all models (threads and event loop alike), or
+    None when PACKVOTE_LLM_REQUESTS_PER_SECOND is 0. Cache hits skip it."""
+    if LLM_REQUESTS_PER_SECOND <= 0:
+        return None
+    return InMemoryRateLimiter(
+        requests_per_second=LLM_REQUESTS_PER_SECOND,
+        check_every_n_seconds=0.05,
+        max_bucket_size=max(1, LLM_MAX_BURST),
+    )
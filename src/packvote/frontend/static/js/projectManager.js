@@ -184,8 +184,8 @@ export const projectManager = {
       const capitalizedName = capitalizeText(participant.name);
       const capitalizedLocation = capitalizeText(participant.current_location);
       
-      // Create a unique identifier for the participant (name + phone + added_at)
-      const participantId = encodeURIComponent(JSON.stringify({
+      // Use the stable participant id; fall back to (name + phone + added_at)
+      const participantId = participant.id || encodeURIComponent(JSON.stringify({
         name: participant.name,
         phone: participant.phone,
         added_at: participant.added_at
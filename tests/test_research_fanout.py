@@ -0,0 +1,78 @@
+"""Research fan-out: which destinations get a research branch."""
+
+import os
+import unittest
+
+# The research agent builds its chat model at import time
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from langchain_core.messages import HumanMessage
+
+from src.packvote.backend.nodes.research_fanout import (
+    named_destinations,
+    plan_research_node,
+    research_branches,
+)
+from src.packvote.backend.utils.langgraph_elements import GroupConsensus
+
+SHORTLIST = ["Barcelona, Spain", "Bali, Indonesia", "Lisbon, Portugal"]
+
+
+def _state(message: str, **extra) -> dict:
+    return {
+        "messages": [HumanMessage(content=message)],
+        "group_consensus": GroupConsensus(
+            travelers=3, preference_votes={"food": 3, "culture": 2, "nightlife": 1}
+        ),
+        "destination_candidates": [{"destination": name} for name in SHORTLIST],
+        "travel_duration": 3,
+        **extra,
+    }
+
+
+def _researched(state: dict) -> set:
+    return {branch["destination"] for branch in research_branches(state)}
+
+
+class ResearchBranchesTest(unittest.TestCase):
+    def test_named_destination_off_the_shortlist_is_researched(self):
+        state = _state("Plan a 3 day trip to Tokyo, Japan")
+        self.assertEqual(_researched(state), {"Tokyo, Japan"})
+
+    def test_shortlist_without_a_named_destination(self):
+        self.assertEqual(_researched(_state("Plan our trip")), set(SHORTLIST))
+
+    def test_survey_destinations_are_always_researched(self):
+        state = _state("Plan our trip", requested_destinations=["Reykjavik"])
+        branches = research_branches(state)
+        self.assertEqual(branches[0]["destination"], "Reykjavik")
+        self.assertIn("Reykjavik", _researched(state))
+
+    def test_names_match_on_word_boundaries(self):
+        names = ["Bali, Indonesia", "Paris, France", "Costa Rica (Guanacaste)"]
+        self.assertEqual(named_destinations("Somewhere like Balinese food", names), [])
+        self.assertEqual(
+            named_destinations("paris or costa rica?", names),
+            ["Paris, France", "Costa Rica (Guanacaste)"],
+        )
+
+    def test_names_match_aliases(self):
+        names = ["New York City, NY", "Costa Rica (Guanacaste)"]
+        self.assertEqual(
+            named_destinations("A long weekend in New York", names),
+            ["New York City, NY"],
+        )
+        self.assertEqual(
+            named_destinations("Beaches in Guanacaste", names),
+            ["Costa Rica (Guanacaste)"],
+        )
+
+    def test_unknown_named_place_goes_to_the_single_agent(self):
+        state = _state("Plan a trip to Kyoto in May")
+        self.assertEqual(research_branches(state), [])
+        command = plan_research_node(state)
+        self.assertEqual(command.goto, "search_activity")
+
+
+if __name__ == "__main__":
+    unittest.main()
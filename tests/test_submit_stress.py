@@ -0,0 +1,148 @@
+"""Concurrent /submit from several app processes: nothing lost or duplicated.
+
+Each worker process imports the app against one shared storage root, as every
+``uvicorn --workers`` process does, and drives it with TestClient: it posts
+surveys to /submit (most to a shared project, some to a project of its own
+that /submit creates) and then deletes every third of its shared submissions
+through the API. Afterwards the stored rows must be exactly the ones that
+were submitted and not deleted, each exactly once.
+"""
+
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PROCESSES = 4
+SUBMISSIONS = 60
+PROJECT = "stress"
+
+# (storage backend, write-behind) pairs the app runs with
+CONFIGS = [("json", False), ("jsonl", False), ("sqlite", False), ("sqlite", True)]
+
+
+def _own_project(worker: int) -> str:
+    return f"{PROJECT}{worker}"
+
+
+def _project_of(seq: int, worker: int) -> str:
+    return _own_project(worker) if seq % 5 == 0 else PROJECT
+
+
+def _deleted(seq: int) -> bool:
+    return seq % 5 != 0 and seq % 3 == 0
+
+
+def _form(worker: int, seq: int) -> dict:
+    return {
+        "project_name": _project_of(seq, worker),
+        "name": f"w{worker}-{seq}",
+        "phone": f"55{worker:03d}{seq:05d}",
+        "country_code": "+1",
+        "budget_category": "medium",
+        "budget_range": "[1000, 2500]",
+        "current_location": "Denver, CO",
+        "preferences": ["Food exploration", "Nightlife"],
+    }
+
+
+def _expected(processes: int, submissions: int) -> dict:
+    """Names that must be stored once, by project."""
+    expected: dict = {}
+    for worker in range(processes):
+        for seq in range(submissions):
+            if not _deleted(seq):
+                names = expected.setdefault(_project_of(seq, worker), set())
+                names.add(f"w{worker}-{seq}")
+    return expected
+
+
+def _worker(root: str, env: dict, start, worker: int, submissions: int) -> None:
+    # The app resolves its storage paths against the working directory
+    os.environ.update(env)
+    os.chdir(root)
+    sys.path.insert(0, str(REPO_ROOT))
+    from fastapi.testclient import TestClient
+
+    import app
+
+    with TestClient(app.app) as client:
+        # Importing the app takes a while; post only once every worker is up
+        start.wait(timeout=120)
+        for seq in range(submissions):
+            response = client.post(
+                "/submit", data=_form(worker, seq), follow_redirects=False
+            )
+            assert response.status_code == 303, response.text
+
+        response = client.get(f"/api/projects/{PROJECT}/submissions")
+        assert response.status_code == 200, response.text
+        ids = {row["name"]: row["id"] for row in response.json()["submissions"]}
+        for seq in range(submissions):
+            if _deleted(seq):
+                response = client.request(
+                    "DELETE",
+                    f"/api/projects/{PROJECT}/submissions",
+                    json={"participant_id": ids[f"w{worker}-{seq}"]},
+                )
+                assert response.status_code == 200, response.text
+
+
+class SubmitStressTest(unittest.TestCase):
+    def _run(self, backend: str, write_behind: bool) -> None:
+        from src.packvote.backend.storage import create_storage
+
+        with tempfile.TemporaryDirectory(prefix="packvote-stress-") as root:
+            frontend = Path(root, "src/packvote/frontend")
+            frontend.parent.mkdir(parents=True)
+            frontend.symlink_to(REPO_ROOT / "src/packvote/frontend")
+            env = {
+                "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "test"),
+                "LANGSMITH_TRACING": "false",
+                "PACKVOTE_STORAGE_BACKEND": backend,
+                "PACKVOTE_WRITE_BEHIND": str(write_behind).lower(),
+            }
+            ctx = mp.get_context("spawn")
+            start = ctx.Barrier(PROCESSES)
+            workers = [
+                ctx.Process(target=_worker, args=(root, env, start, idx, SUBMISSIONS))
+                for idx in range(PROCESSES)
+            ]
+            for process in workers:
+                process.start()
+            for process in workers:
+                process.join(timeout=120)
+            self.assertEqual([p.exitcode for p in workers], [0] * PROCESSES)
+
+            artifacts = Path(root, "src/packvote/backend/artifacts")
+            storage = create_storage(
+                backend,
+                projects_file=artifacts / "model_inputs/projects.json",
+                submissions_dir=artifacts / "model_inputs/user_surveys",
+                sqlite_path=artifacts / "packvote.db",
+            )
+            expected = _expected(PROCESSES, SUBMISSIONS)
+            self.assertEqual(
+                {project["safe_name"] for project in storage.list_projects()},
+                set(expected),
+            )
+            for project, names in expected.items():
+                rows = storage.read_submissions(project)
+                counts = Counter(row["name"] for row in rows)
+                duplicated = sorted(name for name, n in counts.items() if n > 1)
+                self.assertEqual(duplicated, [], f"{project}: duplicated rows")
+                self.assertEqual(set(counts), names, f"{project}: lost or extra rows")
+                self.assertEqual(len({row["id"] for row in rows}), len(rows))
+
+    def test_concurrent_submits_are_stored_exactly_once(self):
+        for backend, write_behind in CONFIGS:
+            with self.subTest(backend=backend, write_behind=write_behind):
+                self._run(backend, write_behind)
+
+
+if __name__ == "__main__":
+    unittest.main()